@@ -0,0 +1,102 @@
+"""
+Compares the client CPU time needed to upload a large file with the previous request bodies
+(a file object for PUT, ``MultipartEncoder`` for multipart) and with the memory-mapped ones
+from :func:`nexuscli.nexus_http.mapped_file`.
+
+The uploads go to a local HTTP server that discards the request bodies. It runs in a separate
+process, so only the client's CPU time is measured.
+
+Usage: python benchmarks/upload_cpu.py [--size-mib 1024] [--rounds 3]
+"""
+import argparse
+import multiprocessing
+import os
+import socket
+import tempfile
+import time
+
+import requests
+from requests_toolbelt.multipart.encoder import MultipartEncoder
+
+from nexuscli import nexus_http
+
+
+def _sink(server_socket):
+    """Accepts requests forever, reading and discarding the body"""
+    buffer = bytearray(1024 * 1024)
+    while True:
+        connection, _ = server_socket.accept()
+        with connection, connection.makefile('rb') as fh:
+            content_length = 0
+            while (line := fh.readline()) not in (b'\r\n', b''):
+                name, _, value = line.partition(b':')
+                if name.lower() == b'content-length':
+                    content_length = int(value)
+
+            with memoryview(buffer) as view:
+                while content_length:
+                    read = fh.readinto(view[:min(content_length, len(buffer))])
+                    if not read:
+                        break
+                    content_length -= read
+
+            connection.sendall(
+                b'HTTP/1.1 200 OK\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+
+
+def put_file_object(url, path):
+    with open(path, 'rb') as fh:
+        requests.put(url, data=fh)
+
+
+def put_mapped(url, path):
+    with nexus_http.mapped_file(path) as contents:
+        requests.put(url, data=contents)
+
+
+def post_multipart_encoder(url, path):
+    with open(path, 'rb') as fh:
+        data = MultipartEncoder(fields=[('raw.asset1', (str(path), fh))])
+        requests.post(url, data=data, headers={'Content-Type': data.content_type})
+
+
+def post_multipart_mapped(url, path):
+    with nexus_http.mapped_file(path) as contents:
+        data, content_type = nexus_http.multipart_body(
+            [], 'raw.asset1', str(path), (contents,), len(contents))
+        requests.post(url, data=data, headers={'Content-Type': content_type})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size-mib', type=int, default=1024, help='size of the uploaded file')
+    parser.add_argument('--rounds', type=int, default=3, help='uploads per method; best is kept')
+    args = parser.parse_args()
+
+    server_socket = socket.create_server(('127.0.0.1', 0))
+    sink = multiprocessing.Process(target=_sink, args=(server_socket,), daemon=True)
+    sink.start()
+    url = f'http://127.0.0.1:{server_socket.getsockname()[1]}/'
+
+    with tempfile.NamedTemporaryFile() as fh:
+        for _ in range(args.size_mib):
+            fh.write(os.urandom(1024 * 1024))
+        fh.flush()
+        gib = args.size_mib / 1024
+
+        print(f'{"method":<26}{"CPU s/GiB":>10}{"wall s/GiB":>12}')
+        for method in [put_file_object, put_mapped, post_multipart_encoder,
+                       post_multipart_mapped]:
+            best_cpu, best_wall = float('inf'), float('inf')
+            for _ in range(args.rounds):
+                cpu, wall = time.process_time(), time.perf_counter()
+                method(url, fh.name)
+                best_cpu = min(best_cpu, time.process_time() - cpu)
+                best_wall = min(best_wall, time.perf_counter() - wall)
+            print(f'{method.__name__:<26}{best_cpu / gib:>10.3f}{best_wall / gib:>12.3f}')
+
+    sink.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -18,6 +18,7 @@ requires = [
 test_requires = [
     'codecov',
     'flake8',
+    'numpy',
     'pytest',
     'pytest-cov',
     'pytest-helpers-namespace',
@@ -64,5 +65,5 @@ setup(
             'nexus3=nexuscli.cli:nexus_cli',
         ],
     },
-    extras_require={'test': test_requires},
+    extras_require={'test': test_requires, 'zstd': ['zstandard'], 'numpy': ['numpy']},
 )
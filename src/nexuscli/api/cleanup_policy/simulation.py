@@ -0,0 +1,133 @@
+"""
+Evaluates the criteria of a cleanup policy against an asset listing, to find out what the policy
+would delete before it's attached to a repository.
+"""
+import datetime
+import itertools
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from nexuscli import nexus_util
+from nexuscli.api.cleanup_policy.model import CleanupPolicy
+
+SIMULATION_BATCH_SIZE = 1000
+"""Number of assets evaluated together"""
+
+SIMULATED_CRITERIA = ('lastBlobUpdated', 'lastDownloaded', 'regex')
+"""Criteria evaluated by :func:`simulate`; others, such as ``isPrerelease``, are ignored"""
+
+_ALL_FORMATS = ('all', 'ALL_FORMATS')
+_FORMAT_ALIASES = {'maven': 'maven2'}
+
+
+class SimulationResult(NamedTuple):
+    """The outcome of :func:`simulate`"""
+    asset_count: int
+    """Number of assets evaluated"""
+    match_count: int
+    """Number of assets matching the policy criteria"""
+    match_bytes: int
+    """Total size of the matching assets"""
+    samples: List[Dict]
+    """The first matching assets, as given to :func:`simulate`"""
+    ignored_criteria: List[str]
+    """Criteria of the policy that weren't evaluated, so the matches are an upper bound"""
+
+
+def _cutoff(criteria: Dict, key: str, now: datetime.datetime) -> Optional[datetime.datetime]:
+    """Nexus keeps the criteria as a number of seconds, possibly as a string"""
+    seconds = criteria.get(key)
+    if seconds is None or seconds == '':
+        return None
+    return now - datetime.timedelta(seconds=int(seconds))
+
+
+def _older(timestamps: List[Optional[datetime.datetime]],
+           cutoff: datetime.datetime) -> List[bool]:
+    return [x is not None and x < cutoff for x in timestamps]
+
+
+def _evaluate(
+        batch: List[Dict], updated_cutoff: Optional[datetime.datetime],
+        downloaded_cutoff: Optional[datetime.datetime],
+        regex: Optional[re.Pattern]) -> List[bool]:
+    """Evaluates each criterion over the whole batch, parsing only the fields it needs"""
+    matches = [True] * len(batch)
+
+    if updated_cutoff is not None or downloaded_cutoff is not None:
+        updated = [nexus_util.parse_datetime(a.get('lastModified')) for a in batch]
+
+    if updated_cutoff is not None:
+        matches = [m and x for m, x in zip(matches, _older(updated, updated_cutoff))]
+
+    if downloaded_cutoff is not None:
+        downloaded = [nexus_util.parse_datetime(a.get('lastDownloaded')) for a in batch]
+        # as Nexus does, assets never downloaded match when they're older than the cut-off
+        downloaded = [d or u for d, u in zip(downloaded, updated)]
+        matches = [m and x for m, x in zip(matches, _older(downloaded, downloaded_cutoff))]
+
+    if regex is not None:
+        matches = [
+            m and regex.fullmatch(a['path'].lstrip(nexus_util.REMOTE_PATH_SEPARATOR)) is not None
+            for m, a in zip(matches, batch)]
+
+    return matches
+
+
+def simulate(
+        policy: CleanupPolicy, assets: Iterable[Dict], now: Optional[datetime.datetime] = None,
+        sample_size: int = 10, repository_format: Optional[str] = None) -> SimulationResult:
+    """
+    Finds the assets that a cleanup policy would delete, without deleting anything.
+
+    The criteria are evaluated as Nexus does: ``lastBlobUpdated`` against the asset's
+    ``lastModified``; ``lastDownloaded`` against the asset's ``lastDownloaded`` or, for assets
+    never downloaded, ``lastModified``; ``regex`` against the whole asset path. An asset matches
+    when it matches every criterion in the policy. A policy without criteria matches nothing.
+    Other criteria, such as ``isPrerelease``, need component metadata that isn't in an asset
+    listing: they're treated as matching every asset and reported in
+    :attr:`SimulationResult.ignored_criteria`.
+
+    :param policy: the policy, as returned by
+        :meth:`~nexuscli.api.cleanup_policy.collection.CleanupPolicyCollection.get_by_name`.
+    :param assets: assets as returned by
+        :meth:`~nexuscli.api.repository.base_models.Repository.list_raw`; they're evaluated in
+        batches, as they're received.
+    :param now: the current time; defaults to now in UTC.
+    :param sample_size: maximum number of matching assets kept in the result.
+    :param repository_format: the format (recipe) of the repository the assets are from; a
+        policy for another format is rejected, as Nexus wouldn't apply it.
+    :raises ValueError: the policy is for a format other than ``repository_format``.
+    """
+    policy_format = policy.configuration.get('format')
+    if repository_format is not None and policy_format not in _ALL_FORMATS and \
+            _FORMAT_ALIASES.get(repository_format, repository_format) != policy_format:
+        raise ValueError(
+            f'Cleanup policy {policy.configuration.get("name")} is for {policy_format} '
+            f'repositories, not {repository_format}')
+
+    criteria = policy.configuration.get('criteria') or {}
+    ignored_criteria = sorted(
+        k for k, v in criteria.items() if k not in SIMULATED_CRITERIA and v not in (None, ''))
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    updated_cutoff = _cutoff(criteria, 'lastBlobUpdated', now)
+    downloaded_cutoff = _cutoff(criteria, 'lastDownloaded', now)
+    regex = re.compile(criteria['regex']) if criteria.get('regex') else None
+
+    asset_count = match_count = match_bytes = 0
+    samples: List[Dict] = []
+    if updated_cutoff is None and downloaded_cutoff is None and regex is None and \
+            not ignored_criteria:
+        return SimulationResult(sum(1 for _ in assets), 0, 0, samples, ignored_criteria)
+
+    assets = iter(assets)
+    while batch := list(itertools.islice(assets, SIMULATION_BATCH_SIZE)):
+        asset_count += len(batch)
+        matching = [
+            a for a, m in zip(batch, _evaluate(batch, updated_cutoff, downloaded_cutoff, regex))
+            if m]
+        match_count += len(matching)
+        match_bytes += sum(a.get('fileSize') or 0 for a in matching)
+        samples.extend(matching[:sample_size - len(samples)])
+
+    return SimulationResult(asset_count, match_count, match_bytes, samples, ignored_criteria)
@@ -1,4 +1,5 @@
-from nexuscli.api.repository.base_models.repository import Repository
+from nexuscli.api.repository.base_models.repository import (
+    BrowseNode, CopyResult, DeleteResult, Repository)
 from nexuscli.api.repository.base_models.group_repository import GroupRepository
 from nexuscli.api.repository.base_models.hosted_repository import HostedRepository
 from nexuscli.api.repository.base_models.proxy_repository import ProxyRepository
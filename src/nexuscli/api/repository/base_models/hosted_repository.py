@@ -1,5 +1,9 @@
+from typing import List, Tuple
+
+from nexuscli import exception, nexus_http
 from nexuscli.api import validations
 from nexuscli.api.repository.base_models import Repository
+from requests_toolbelt.multipart.encoder import MultipartEncoder
 
 from urllib.parse import urljoin
 
@@ -50,3 +54,53 @@ class HostedRepository(Repository):
         })
 
         return repo_config
+
+    def _post_component(self, fields: List[Tuple]) -> None:
+        """
+        Upload a component using the Nexus components API. The request body is streamed, so
+        file contents given in ``fields`` aren't read into memory.
+
+        :param fields: multipart form fields for the recipe, as accepted by
+            :py:class:`requests_toolbelt.multipart.encoder.MultipartEncoder`.
+        :raises exception.NexusClientAPIError: unknown response from Nexus API.
+        """
+        data = MultipartEncoder(fields=fields)
+        self._post_component_body(data, data.content_type)
+
+    def _post_component_file(
+            self, fields: List[Tuple[str, str]], file_field: str, file_name: str,
+            source) -> None:
+        """
+        Upload a component made of a single local file using the Nexus components API. The
+        file is mapped into memory and sent without being copied chunk by chunk; see
+        :func:`nexus_http.mapped_file`.
+
+        :param fields: ``(name, value)`` for each multipart form field, other than the file.
+        :param file_field: name of the form field for the file.
+        :param file_name: file name sent for the file.
+        :param source: path to the local file.
+        :raises exception.NexusClientAPIError: unknown response from Nexus API.
+        """
+        with nexus_http.mapped_file(source) as contents:
+            data, content_type = nexus_http.multipart_body(
+                fields, file_field, file_name, (contents,), len(contents))
+            self._post_component_body(data, content_type)
+
+    def _post_component_body(self, data, content_type: str) -> None:
+        """
+        As per :meth:`_post_component` but taking an already encoded ``multipart/form-data``
+        request body.
+
+        :param data: the request body.
+        :param content_type: the request ``Content-Type``, including the multipart boundary.
+        :raises exception.NexusClientAPIError: unknown response from Nexus API.
+        """
+        params = {'repository': self.name}
+        headers = {'Content-Type': content_type}
+        response = self._client.post(
+            'components', data=data, params=params, headers=headers, stream=True)
+
+        if response.status_code != 204:
+            raise exception.NexusClientAPIError(
+                f'Uploading to {self.name}. Reason: {response.reason} '
+                f'Status code: {response.status_code} Text: {response.text}')
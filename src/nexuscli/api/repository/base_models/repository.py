@@ -1,24 +1,83 @@
+import datetime
+import itertools
 import json
 import logging
 import os
 import pathlib
+import posixpath
+import tempfile
 import warnings
-from typing import Dict, Iterator, Optional
+from contextlib import closing, contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 import semver
 from click import progressbar
 
+from nexuscli.api import util as api_util
+from nexuscli.api.repository import batches, prune, usage
+from nexuscli.api.repository.index import AssetIndex
 from nexuscli.api.repository.base_models import base_repository, util
+from nexuscli.api.script import ScriptCollection
 from nexuscli import exception, nexus_util
 
 # https://issues.sonatype.org/browse/NEXUS-19525
 # https://github.com/thiagofigueiro/nexus3-cli/issues/77
 CLEANUP_SET_MIN_VERSION = semver.VersionInfo(3, 19, 0)
 
+SCRIPT_NAME_ASSET_DELETE = 'nexus3-cli-asset-delete'
+SCRIPT_ASSET_DELETE_VERSIONS: List[semver.VersionInfo] = []
+SERVER_DELETE_BATCH_SIZE = 1000
+"""Number of assets deleted by each run of the asset delete groovy script"""
+
+SEARCH_FILTERS = (
+    'format', 'group', 'name', 'version', 'sha1', 'sha256', 'sha512', 'md5',
+    'maven.groupId', 'maven.artifactId', 'maven.baseVersion', 'maven.extension',
+    'maven.classifier', 'npm.scope', 'docker.imageName', 'docker.imageTag',
+)
+"""Parameters of the Nexus search API that can be given as ``filters`` to :meth:`list_raw`"""
+
+ASSET_SEARCH_FILTERS = (
+    'sha1', 'sha256', 'sha512', 'md5', 'maven.extension', 'maven.classifier',
+)
+"""Search parameters that select assets rather than whole components"""
+
+BROWSE_WORKERS = 4
+"""Number of directories listed concurrently by :meth:`Repository.browse`"""
+
+SCRIPT_NAME_ASSET_COPY = 'nexus3-cli-asset-copy'
+SCRIPT_ASSET_COPY_VERSIONS: List[semver.VersionInfo] = []
+SERVER_COPY_BATCH_SIZE = 1000
+"""Number of assets copied by each run of the asset copy groovy script"""
+
 
 LOG = logging.getLogger(__name__)
 
 
+class DeleteResult(NamedTuple):
+    """The outcome of :meth:`Repository.bulk_delete`"""
+    deleted: int
+    not_found: int
+    errors: int
+
+
+class CopyResult(NamedTuple):
+    """The outcome of :meth:`Repository.copy_to`"""
+    copied: int
+    skipped: int
+    """Files already at the destination with the same checksum"""
+    errors: Dict[str, BaseException]
+    """The error for each source path that couldn't be copied"""
+
+
+class BrowseNode(NamedTuple):
+    """An entry in a directory listing, as returned by :meth:`Repository.browse`"""
+    path: str
+    """Path in the repository; directories end with ``/``"""
+    leaf: bool
+    """False for directories, including components (e.g. a Maven version) with assets"""
+    asset_id: Optional[str]
+
+
 class Repository(base_repository.BaseRepository):
     """
     Representation of the simplest Nexus repositories.
@@ -146,22 +205,158 @@ class Repository(base_repository.BaseRepository):
 
         return repo_config
 
-    def list(self, repository_path: str) -> Iterator[Optional[str]]:
+    def list(
+            self, repository_path: str, index: Optional[AssetIndex] = None,
+            filters: Optional[Dict[str, str]] = None,
+            match: Optional[Callable[[str], bool]] = None) -> Iterator[Optional[str]]:
         """
         List all the artefacts, recursively, in a given ``repository_path``.
 
         :param repository_path: location on the repository service.
+        :param index: answer from this local index instead of the Nexus
+            service. ``repository_path`` may then be a glob; see
+            :meth:`AssetIndex.query`.
+        :param filters: as per :meth:`list_raw`.
+        :param match: as per :meth:`list_raw`.
         :return: artefacts under ``repository_path``.
         """
-        for artefact in self.list_raw(repository_path):
+        for artefact in self.list_raw(repository_path, index, filters, match):
             yield artefact.get('path')
 
-    def list_raw(self, repository_path: str) -> Iterator[Dict]:
+    def list_raw(
+            self, repository_path: str, index: Optional[AssetIndex] = None,
+            filters: Optional[Dict[str, str]] = None,
+            match: Optional[Callable[[str], bool]] = None) -> Iterator[Dict]:
         """
         As per :meth:`list` but yields raw Nexus artefacts as dicts.
 
         :param repository_path: location on the repository service.
+        :param index: answer from this local index instead of the Nexus
+            service.
+        :param filters: only list the artefacts matching these Nexus search
+            parameters, such as ``{'maven.groupId': 'org.example'}``; see
+            :data:`SEARCH_FILTERS`. The server matches them exactly, which is
+            cheaper than searching for a path.
+        :param match: only list the artefacts with a path, without a leading
+            separator, for which this returns True; e.g. a
+            :func:`~nexuscli.nexus_util.path_matcher`. Applied on the client,
+            as the listing is received.
+        :raises ValueError: an unknown search parameter was given.
+        :raises exception.FeatureNotImplemented: both ``index`` and
+            ``filters`` were given.
+        """
+        self._check_filters(filters)
+
+        if index is not None:
+            if filters:
+                raise exception.FeatureNotImplemented('Search filters with a local index')
+            list_gen = index.query(self, self._path_filter(repository_path))
+        else:
+            list_gen = self._list_raw_search(self._path_filter(repository_path), filters)
+
+        for artefact in list_gen:
+            if match is None or match(artefact['path'].lstrip(nexus_util.REMOTE_PATH_SEPARATOR)):
+                yield artefact
+
+    def _browse_children(self, directory: str) -> List[BrowseNode]:
+        """One level of the browse tree shown by the Nexus UI, sorted by path"""
+        separator = nexus_util.REMOTE_PATH_SEPARATOR
+        node = directory.strip(separator) or separator
+        response = self._client.post(
+            'service/extdirect', service_url=self._client.config.url, json={
+                'action': 'coreui_Browse', 'method': 'read', 'type': 'rpc', 'tid': 1,
+                'data': [{'repositoryName': self.name, 'node': node}]})
+        if response.status_code != 200:
+            raise exception.NexusClientAPIError(
+                f'Browsing {self.name}/{directory}. Reason: {response.reason}')
+
+        result = response.json().get('result') or {}
+        if not result.get('success'):
+            raise exception.NexusClientAPIError(
+                f'Browsing {self.name}/{directory}: {result.get("message")}')
+
+        children = []
+        for child in result.get('data') or []:
+            path = child['id'].lstrip(separator)
+            if not child['leaf']:
+                path += separator
+            children.append(BrowseNode(path, child['leaf'], child.get('assetId')))
+
+        return sorted(children)
+
+    def browse(self, repository_path: str = '', depth: int = 1,
+               workers: int = BROWSE_WORKERS) -> Iterator[BrowseNode]:
+        """
+        List a directory without walking its whole subtree, using the browse
+        tree of the Nexus UI, which returns one directory level per request.
+
+        :param repository_path: directory on the repository service.
+        :param depth: number of directory levels to list; 1 for the immediate
+            children only.
+        :param workers: number of directories listed concurrently, when
+            ``depth`` is more than 1.
+        :return: the files and directories, one level at a time, each level
+            sorted by path.
+        :raises exception.NexusClientAPIError: the directory can't be listed,
+            e.g. because the repository doesn't exist.
+        """
+        level = [self._path_filter(repository_path)]
+        for _ in range(depth):
+            next_level = []
+            with self._client.pooled_session(workers):
+                for children in nexus_util.concurrent_map(
+                        self._browse_children, level, workers):
+                    next_level.extend(children)
+
+            for node in sorted(next_level):
+                yield node
+            level = [node.path for node in next_level if not node.leaf]
+            if not level:
+                break
+
+    def disk_usage(
+            self, repository_path: str = '', depth: int = 1,
+            index: Optional[AssetIndex] = None) -> List[usage.DirectoryUsage]:
+        """
+        The storage used by the artefacts under a directory and under each
+        of its subdirectories, up to ``depth`` levels.
+
+        :param repository_path: directory on the repository service.
+        :param depth: number of subdirectory levels to report.
+        :param index: list the artefacts from this local index instead of the
+            Nexus service.
+        :return: as per :func:`~nexuscli.api.repository.usage.directory_usage`.
+        """
+        base = self._path_filter(repository_path)
+        if base and not base.endswith(nexus_util.REMOTE_PATH_SEPARATOR):
+            base += nexus_util.REMOTE_PATH_SEPARATOR
+
+        return usage.directory_usage(self.list_raw(base, index), base, depth)
+
+    def iter_asset_batches(
+            self, batch_size: int = batches.ASSET_BATCH_SIZE, repository_path: str = '',
+            index: Optional[AssetIndex] = None,
+            filters: Optional[Dict[str, str]] = None) -> Iterator['batches.numpy.ndarray']:
+        """
+        The artefacts under ``repository_path`` as columnar batches, for
+        vectorised analysis with NumPy. Requires the ``numpy`` package.
+
+        :param batch_size: number of artefacts in each batch.
+        :param repository_path: location on the repository service.
+        :param index: list the artefacts from this local index instead of the
+            Nexus service.
+        :param filters: as per :meth:`list_raw`.
+        :return: structured arrays, as per
+            :func:`~nexuscli.api.repository.batches.asset_batch`.
+        :raises exception.FeatureNotImplemented: the ``numpy`` package isn't
+            installed.
         """
+        batches._require_numpy()
+        return batches.asset_batches(
+            self.list_raw(repository_path, index, filters), batch_size)
+
+    def _path_filter(self, repository_path: str) -> str:
+        """The artefact path prefix matching a repository_path, as given to :meth:`list`"""
         # FIXME: path handling :(
         repository_path = f'{self.name}{nexus_util.REMOTE_PATH_SEPARATOR}{repository_path}'
         repo, directory, filename = nexus_util.split_component_path(repository_path)
@@ -178,12 +373,10 @@ class Repository(base_repository.BaseRepository):
             # The artefact path is always relative to the given repo.
             path_filter += filename
 
-        list_gen = self._list_raw_search(path_filter)
+        return path_filter
 
-        for artefact in list_gen:
-            yield artefact
-
-    def _list_raw_search(self, path_filter: str) -> Iterator[Dict]:
+    def _search_query(
+            self, path_filter: str, filters: Optional[Dict[str, str]] = None) -> Dict:
         # TODO: use `group` attribute in raw repositories to speed-up queries
         query = {
             'repository': self.name,
@@ -192,81 +385,390 @@ class Repository(base_repository.BaseRepository):
         if path_filter:
             query['keyword'] = f'"{path_filter}"'  # hacky as fuck :(
 
-        return self._get_paginated('search/assets', params=query)
+        query.update(filters or {})
+        return query
+
+    @staticmethod
+    def _check_filters(filters: Optional[Dict[str, str]]) -> None:
+        unknown = sorted(set(filters or {}).difference(SEARCH_FILTERS))
+        if unknown:
+            raise ValueError(f'Unknown search filters: {", ".join(unknown)}')
+
+    def _path_search_filters(self, path_filter: str) -> Optional[Dict[str, str]]:
+        """
+        Search parameters matching the artefact at ``path_filter`` exactly, for
+        recipes whose paths encode them (e.g. Maven coordinates), or None when
+        the path can't be translated and a keyword search is needed.
+        """
+        return None
+
+    def _list_raw_search(
+            self, path_filter: str,
+            filters: Optional[Dict[str, str]] = None) -> Iterator[Dict]:
+        precise_filters = self._path_search_filters(path_filter) if path_filter else None
+
+        if precise_filters is not None:
+            query = {'repository': self.name, **precise_filters, **(filters or {})}
+            key = path_filter.lstrip(nexus_util.REMOTE_PATH_SEPARATOR)
+            found = False
+            for artefact in self._get_paginated('search/assets', params=query):
+                # e.g. a Maven search without a classifier also matches the classified files
+                if artefact['path'].lstrip(nexus_util.REMOTE_PATH_SEPARATOR) == key:
+                    found = True
+                    yield artefact
+            if found:
+                return
+            # not a file after all, e.g. a directory given without a trailing separator
+
+        yield from self._get_paginated(
+            'search/assets', params=self._search_query(path_filter, filters))
 
     def _get_paginated(self, endpoint: str, **request_kwargs) -> Iterator[Dict]:
         """
-        Performs a GET request using the given args and kwargs. If the response
-        is paginated, the method will repeat the request, manipulating the
-        `params` keyword argument each time in order to receive all pages of
-        the response.
+        Performs a GET request on this repository's service, following the
+        pagination of the response; see :func:`nexuscli.api.util.get_paginated`.
+        """
+        yield from api_util.get_paginated(self._client, endpoint, **request_kwargs)
 
-        Items in the responses are sent in "batches": when all elements of a
-        response have been yielded, a new request is made and the process
-        repeated.
+    def delete(self, repository_path, workers=1, filters=None, match=None, server_side=False,
+               components=False):
+        """
+        Delete artefacts, recursively if ``repository_path`` is a directory.
+
+        The artefacts are deleted with one request each (see
+        :meth:`bulk_delete`), by component (see :meth:`delete_components`)
+        or, with ``server_side``, by the Nexus service in batches (see
+        :meth:`server_delete`).
+
+        :param repository_path: location on the repository service.
+        :type repository_path: str
+        :param workers: number of concurrent delete requests, when deleting
+            with one request per artefact or component.
+        :type workers: int
+        :param filters: only delete the artefacts matching these search
+            parameters, as per :meth:`list_raw`.
+        :type filters: dict
+        :param match: only delete the artefacts with a path selected by this,
+            as per :meth:`list_raw`.
+        :type match: callable
+        :param server_side: delete with the groovy script of
+            :meth:`server_delete`; requires groovy scripts to be enabled.
+        :type server_side: bool
+        :param components: delete whole components, as per
+            :meth:`delete_components`.
+        :type components: bool
+        :return: number of deleted files, including the ones that disappeared
+            while deleting. Negative number when any file couldn't be deleted.
+        :rtype: int
+        :raises ValueError: ``components`` was given with ``server_side``,
+            ``match`` or filters selecting assets.
+        """
+        result = self._delete(repository_path, workers, filters, match, server_side, components)
+        if result.errors:
+            return -1
+
+        return result.deleted + result.not_found
+
+    def _delete(self, repository_path, workers, filters, match, server_side,
+                components) -> DeleteResult:
+        """As per :meth:`delete`, returning each count"""
+        if components and server_side:
+            raise ValueError('Server-side deletes remove files; they can\'t delete components')
+        if components and match:
+            raise ValueError('Components can\'t be selected by path; use search filters')
+
+        if components:
+            return self.delete_components(repository_path, workers=workers, filters=filters)
+        if server_side and (filters or match):
+            return self.server_delete(asset_ids=(
+                a['id'] for a in self.list_raw(repository_path, filters=filters, match=match)))
+        if server_side:
+            return self.server_delete(repository_path)
+        return self.bulk_delete(repository_path, workers=workers, filters=filters, match=match)
+
+    def locate(self, sha1: str) -> Iterator[Dict]:
+        """
+        Finds the assets with the given SHA-1 checksum. The checksum is
+        matched by the Nexus service, so this takes a single request however
+        large the repository is.
 
-        :param request_kwargs: passed verbatim to the _request() method, except
-            for the argument needed to paginate requests.
-        :return: a generator that yields on response item at a time.
+        :param sha1: the SHA-1 checksum to look for.
+        :return: the matching assets, as per :meth:`list_raw`.
         """
-        response = self._client.request('get', endpoint, **request_kwargs)
-        if response.status_code == 404:
-            raise exception.NexusClientAPIError(response.reason)
+        yield from self._get_paginated(
+            'search/assets', params={'repository': self.name, 'sha1': sha1})
 
+    def latest(self, repository_path: str = '', count: int = 1,
+               filters: Optional[Dict[str, str]] = None) -> List[Dict]:
+        """
+        The newest versions of the components in ``repository_path``, using
+        the version ordering of the Nexus search API. Pages are only requested
+        until ``count`` versions are found, so the newest version takes a
+        single request however many versions there are.
+
+        Use ``filters`` to select a single component (e.g. ``name``);
+        otherwise the newest versions of every matching component are mixed.
+
+        :param repository_path: location on the repository service.
+        :param count: number of versions to return.
+        :param filters: as per :meth:`list_raw`.
+        :return: the components as returned by the Nexus ``search/components``
+            API, newest first. Components without a version are skipped.
+        """
+        self._check_filters(filters)
+        path_filter = self._path_filter(repository_path).lstrip(nexus_util.REMOTE_PATH_SEPARATOR)
+        params = self._search_query(path_filter, filters)
+        params.update({'sort': 'version', 'direction': 'desc'})
+
+        components = (
+            c for c in self._get_paginated('search/components', params=params)
+            if c.get('version'))
+        return list(itertools.islice(components, count))
+
+    def _delete_target(self, target: Tuple[str, List[str]]):
+        """Returns the target's artefact paths, the response status (None on error) and reason"""
+        endpoint, artefact_paths = target
         try:
-            content = response.json()
-        except json.decoder.JSONDecodeError:
-            raise exception.NexusClientAPIError(response.content)
+            response = self._client.delete(endpoint)
+        except exception.NexusClientConnectionError as e:
+            return artefact_paths, None, str(e)
 
-        while True:
-            for item in content.get('items'):
-                yield item
+        return artefact_paths, response.status_code, response.reason
 
-            continuation_token = content.get('continuationToken')
-            if continuation_token is None:
-                break
+    def _bulk_delete(
+            self, list_targets: Callable[[], Iterable[Tuple[str, List[str]]]],
+            workers: int) -> DeleteResult:
+        """
+        Deletes targets with up to ``workers`` concurrent requests sharing a
+        connection pool, as they're listed.
 
-            request_kwargs['params'].update(
-                {'continuationToken': continuation_token})
-            response = self._client.request('get', endpoint, **request_kwargs)
+        Deleting while paginating a listing can make the server skip items, so
+        the listing is repeated until a pass finds nothing new to delete.
 
-            try:
-                content = response.json()
-            except json.decoder.JSONDecodeError:
-                raise exception.NexusClientAPIError(response.content)
+        :param list_targets: callable returning the endpoint to delete each
+            target with and the paths of the artefacts deleted with it.
+        :param workers: number of concurrent delete requests.
+        """
+        deleted = not_found = errors = 0
+        seen = set()
+
+        def _new_targets():
+            for endpoint, artefact_paths in list_targets():
+                if endpoint not in seen:
+                    seen.add(endpoint)
+                    yield endpoint, artefact_paths
+
+        with self._client.pooled_session(workers):
+            while True:
+                pass_deleted = 0
+                responses = nexus_util.concurrent_map(
+                    self._delete_target, _new_targets(), workers)
+
+                with progressbar(responses, label='Deleting') as bar:
+                    for artefact_paths, status_code, reason in bar:
+                        if status_code == 204:
+                            LOG.info('Deleted: %s', ', '.join(artefact_paths))
+                            pass_deleted += len(artefact_paths)
+                        elif status_code == 404:
+                            LOG.warning('File disappeared while deleting: %s',
+                                        ', '.join(artefact_paths))
+                            not_found += len(artefact_paths)
+                        else:
+                            LOG.error('Error deleting %s: %s', ', '.join(artefact_paths), reason)
+                            errors += len(artefact_paths)
+
+                deleted += pass_deleted
+                if not pass_deleted:
+                    break
+
+        return DeleteResult(deleted, not_found, errors)
+
+    def bulk_delete(
+            self, repository_path, workers=1, filters=None, match=None) -> DeleteResult:
+        """
+        Delete artefacts, recursively if ``repository_path`` is a directory,
+        with up to ``workers`` concurrent requests sharing a connection pool.
 
-    def delete(self, repository_path):
+        Artefacts are deleted as the listing is received and a failure to
+        delete one doesn't stop the others. Deleting while paginating the
+        listing can make the server skip artefacts, so the listing is repeated
+        until a pass finds nothing new to delete.
+
+        :param repository_path: location on the repository service.
+        :type repository_path: str
+        :param workers: number of concurrent delete requests.
+        :type workers: int
+        :param filters: only delete the artefacts matching these search
+            parameters, as per :meth:`list_raw`.
+        :type filters: dict
+        :param match: only delete the artefacts with a path selected by this,
+            as per :meth:`list_raw`.
+        :type match: callable
+        :return: the number of artefacts deleted, not found and not deleted
+            due to errors.
+        :rtype: DeleteResult
         """
-        Delete artefacts, recursively if ``repository_path`` is a directory.
+        def _list_targets():
+            for artefact in self.list_raw(repository_path, filters=filters, match=match):
+                yield f'assets/{artefact["id"]}', [artefact['path']]
+
+        return self._bulk_delete(_list_targets, workers)
+
+    @property
+    def _script_asset_delete(self) -> str:
+        return api_util.script_for_version(
+            SCRIPT_NAME_ASSET_DELETE, self._client.server_version, SCRIPT_ASSET_DELETE_VERSIONS)
+
+    def server_delete(
+            self, repository_path: Optional[str] = None,
+            asset_ids: Optional[Iterable[str]] = None,
+            batch_size: int = SERVER_DELETE_BATCH_SIZE) -> DeleteResult:
+        """
+        Delete artefacts inside the Nexus service using a groovy script, which
+        deletes up to ``batch_size`` assets per request instead of one.
+
+        Give either ``repository_path`` or ``asset_ids``.
+
+        :param repository_path: location on the repository service: a
+            directory when it ends with ``/``; otherwise, the artefact with
+            that path and the artefacts under the directory with that path.
+        :param asset_ids: ids of the assets to delete, as returned by
+            :meth:`list_raw`.
+        :param batch_size: number of assets deleted per request.
+        :return: the number of artefacts deleted and not found. Errors aren't
+            counted: a batch that fails raises an exception.
+        :raises exception.NexusClientAPIError: if the script fails; assets
+            deleted by the previous batches remain deleted.
+        """
+        if (repository_path is None) == (asset_ids is None):
+            raise ValueError('Exactly one of repository_path and asset_ids is required')
+
+        script_name = self._script_asset_delete
+        scripts = ScriptCollection(nexus_http=self._client)
+        scripts.create_if_missing(script_name)
+
+        def _run(script_args):
+            response = scripts.run_script(script_name, data=json.dumps(script_args))
+            return json.loads(response['result'])
+
+        def _batches():
+            if asset_ids is None:
+                path_filter = self._path_filter(repository_path).lstrip(
+                    nexus_util.REMOTE_PATH_SEPARATOR)
+                script_args = {
+                    'repository': self.name, 'path': path_filter, 'batchSize': batch_size}
+                while True:
+                    result = _run(script_args)
+                    yield result
+                    if not result['more']:
+                        return
+            else:
+                ids = iter(asset_ids)
+                while batch := list(itertools.islice(ids, batch_size)):
+                    yield _run({'repository': self.name, 'ids': batch})
+
+        deleted = not_found = 0
+        with progressbar(_batches(), label='Deleting') as bar:
+            for result in bar:
+                LOG.info('Deleted a batch of %d assets; %d not found',
+                         result['deleted'], result['notFound'])
+                deleted += result['deleted']
+                not_found += result['notFound']
+
+        return DeleteResult(deleted, not_found, 0)
+
+    def _component_delete_targets(
+            self, repository_path, filters=None) -> Iterator[Tuple[str, List[str]]]:
+        path_filter = self._path_filter(repository_path).lstrip(nexus_util.REMOTE_PATH_SEPARATOR)
+        components = self._get_paginated(
+            'search/components', params=self._search_query(path_filter, filters))
+
+        for component in components:
+            assets = component.get('assets') or []
+            matching = [
+                a for a in assets
+                if a['path'].lstrip(nexus_util.REMOTE_PATH_SEPARATOR).startswith(path_filter)]
+
+            if matching and len(matching) == len(assets):
+                yield f'components/{component["id"]}', [a['path'] for a in assets]
+            else:
+                for asset in matching:
+                    yield f'assets/{asset["id"]}', [asset['path']]
+
+    def delete_components(self, repository_path, workers=1, filters=None) -> DeleteResult:
+        """
+        As per :meth:`bulk_delete` but deletes a component (e.g. a Maven or
+        npm version) with a single request when all of its assets are under
+        ``repository_path``. Assets of components only partially under it are
+        deleted one by one.
 
         :param repository_path: location on the repository service.
         :type repository_path: str
-        :return: number of deleted files. Negative number for errors.
-        :rtype: int
+        :param workers: number of concurrent delete requests.
+        :type workers: int
+        :param filters: only delete the components matching these search
+            parameters, as per :meth:`list_raw`, except for the ones in
+            :data:`ASSET_SEARCH_FILTERS`.
+        :type filters: dict
+        :return: the number of artefacts deleted, not found and not deleted
+            due to errors.
+        :rtype: DeleteResult
+        :raises ValueError: a filter selecting assets was given; the search
+            would match whole components with any matching asset.
         """
+        asset_filters = sorted(set(filters or {}).intersection(ASSET_SEARCH_FILTERS))
+        if asset_filters:
+            raise ValueError(
+                f'Filters selecting assets can\'t delete components: {", ".join(asset_filters)}')
+
+        return self._bulk_delete(
+            lambda: self._component_delete_targets(repository_path, filters), workers)
+
+    def prune_plan(
+            self, keep_last: Optional[int] = None,
+            older_than: Optional[datetime.timedelta] = None,
+            match: Optional[str] = None) -> List[prune.PruneCandidate]:
+        """
+        Lists the components that :meth:`prune` would delete, without deleting
+        them. See :func:`nexuscli.api.repository.prune.plan` for the rules.
+
+        :param keep_last: number of newest versions to keep for each component
+            group and name.
+        :param older_than: only select versions last modified longer ago.
+        :param match: only select versions with a ``group:name:version``
+            matching this regular expression.
+        :return: the components to be deleted.
+        """
+        components = self._get_paginated(
+            'search/components', params={'repository': self.name})
 
-        delete_count = 0
-        death_row = self.list_raw(repository_path)
+        return prune.plan(components, keep_last, older_than, match)
 
-        with progressbar([a for a in death_row], label='Deleting') as death_row:
-            for artefact in death_row:
-                id_ = artefact['id']
-                artefact_path = artefact['path']
+    def prune(
+            self, keep_last: Optional[int] = None,
+            older_than: Optional[datetime.timedelta] = None,
+            match: Optional[str] = None,
+            workers: int = 1) -> Tuple[List[prune.PruneCandidate], DeleteResult]:
+        """
+        Deletes old component versions, e.g. all but the 20 newest snapshots
+        of each artefact. Components are deleted with one request each, with
+        up to ``workers`` concurrent requests.
 
-                response = self._client.delete(f'assets/{id_}')
-                LOG.info('Deleted: %s (%s)', artefact_path, id_)
-                delete_count += 1
-                if response.status_code == 404:
-                    LOG.warning('File disappeared while deleting')
-                    LOG.debug(response.reason)
-                elif response.status_code != 204:
-                    LOG.error(response.reason)
-                    return -1
+        See :meth:`prune_plan` for the parameters.
 
-        return delete_count
+        :return: the components selected for deletion and the result of
+            deleting their assets.
+        """
+        candidates = self.prune_plan(keep_last, older_than, match)
+
+        def _list_targets():
+            for candidate in candidates:
+                yield f'components/{candidate.component_id}', candidate.asset_paths
+
+        return candidates, self._bulk_delete(_list_targets, workers)
 
     @staticmethod
-    def _should_skip_download(download_url, download_path, artefact, nocache):
+    def _should_skip_download(download_url, download_path, artefact, nocache, local_hashes=None):
         """False when nocache is set or local file is out-of-date"""
         if nocache:
             try:
@@ -276,7 +778,7 @@ class Repository(base_repository.BaseRepository):
                 pass
             return False
 
-        if nexus_util.has_same_hash(artefact, download_path):
+        if nexus_util.has_same_hash(artefact, download_path, local_hashes):
             LOG.debug(
                 'Skipping %s because local copy %s is up-to-date', download_url, download_path)
             return True
@@ -295,18 +797,25 @@ class Repository(base_repository.BaseRepository):
         :type destination: str
         :return:
         """
+        response = self._download_response(download_url)
+
+        with open(destination, 'wb') as fd:
+            LOG.debug('Writing %s to %s', download_url, destination)
+            for chunk in response.iter_content(chunk_size=8192):
+                fd.write(chunk)
+
+    def _download_response(self, download_url):
+        """The streamed response for an asset download; its body hasn't been read yet"""
         response = self._client.get(download_url)
 
         if response.status_code != 200:
             raise exception.DownloadError(
                 f'Downloading from {download_url}. Reason: {response.reason}')
 
-        with open(destination, 'wb') as fd:
-            LOG.debug('Writing %s to %s', download_url, destination)
-            for chunk in response.iter_content(chunk_size=8192):
-                fd.write(chunk)
+        return response
 
-    def download(self, source, destination, flatten=False, nocache=False):
+    def download(self, source, destination, flatten=False, nocache=False, filters=None,
+                 latest=None, match=None):
         """Download artefacts. The source must be a valid Nexus 3
         repository path, including the repository name as the first component
         of the path.
@@ -329,6 +838,15 @@ class Repository(base_repository.BaseRepository):
                         the one in Nexus (as determined by
                         :meth:`nexuscli.nexus_util.has_same_hash`).
         :type nocache: bool
+        :param filters: only download the artefacts matching these search
+            parameters, as per :meth:`list_raw`.
+        :type filters: dict
+        :param latest: only download the assets of this many of the newest
+            component versions, as per :meth:`latest`.
+        :type latest: int
+        :param match: only download the artefacts with a path selected by
+            this, as per :meth:`list_raw`.
+        :type match: callable
         :return: number of downloaded files.
         :rtype: int
         """
@@ -337,20 +855,34 @@ class Repository(base_repository.BaseRepository):
                 not (destination.endswith('.') or destination.endswith('..')):
             destination += os.sep
 
-        artefacts = self.list_raw(source)
-
-        with progressbar([a for a in artefacts], label='Downloading') as artefacts:
-            for artefact in artefacts:
+        if latest is None:
+            artefacts = [a for a in self.list_raw(source, filters=filters, match=match)]
+        else:
+            separator = nexus_util.REMOTE_PATH_SEPARATOR
+            path_filter = self._path_filter(source).lstrip(separator)
+            artefacts = [
+                a for component in self.latest(source, latest, filters)
+                for a in component.get('assets') or []
+                if a['path'].lstrip(separator).startswith(path_filter) and
+                (match is None or match(a['path'].lstrip(separator)))]
+        download_paths = [
+            nexus_util.remote_path_to_local(a['path'], destination, flatten) for a in artefacts]
+
+        # check all existing local copies at once, using every CPU
+        local_hashes = {}
+        if not nocache:
+            local_hashes = dict(nexus_util.calculate_hashes_batch(download_paths, ['sha1']))
+
+        with progressbar(list(zip(artefacts, download_paths)), label='Downloading') as artefacts:
+            for artefact, download_path in artefacts:
                 download_url = artefact['downloadUrl']
                 artefact_path = artefact['path']
                 LOG.debug('Downloading [%s] to [%s] from [%s], flatten=%s',
                           artefact_path, destination, download_url, flatten)
-                download_path = nexus_util.remote_path_to_local(
-                    artefact_path, destination, flatten
-                )
 
                 if self._should_skip_download(
-                        download_url, download_path, artefact, nocache):
+                        download_url, download_path, artefact, nocache,
+                        local_hashes.get(download_path)):
                     download_count += 1
                     continue
 
@@ -363,12 +895,188 @@ class Repository(base_repository.BaseRepository):
 
         return download_count
 
-    def upload(self, source, destination, recurse=True, flatten=False):
+    def _copy_targets(
+            self, source_path: str, destination_path: str) -> Iterator[Tuple[Dict, str]]:
+        """The artefacts to copy and the destination path of each, for :meth:`copy_to`"""
+        separator = nexus_util.REMOTE_PATH_SEPARATOR
+        key = self._path_filter(source_path).lstrip(separator)
+        base = key if not key or key.endswith(separator) else key + separator
+
+        for artefact in self.list_raw(source_path):
+            path = artefact['path'].lstrip(separator)
+            if path == key:
+                if destination_path and not destination_path.endswith(separator):
+                    yield artefact, destination_path
+                else:
+                    yield artefact, posixpath.join(destination_path, posixpath.basename(path))
+            # the listing may include paths that aren't under the source directory
+            elif path.startswith(base):
+                yield artefact, posixpath.join(destination_path, path[len(base):])
+
+    def copy_to(self, destination: 'Repository', source_path: str = '',
+                destination_path: str = '', workers: int = 1) -> CopyResult:
+        """
+        Copy artefacts to another repository, which may be on another Nexus
+        server, without writing them to local disk: each download is sent to
+        the destination as it's received.
+
+        Artefacts already in the destination with the same SHA-1 checksum are
+        skipped. When the destination recipe can search for a path exactly
+        (e.g. raw and Maven), each destination path is looked up with one
+        search request as it's copied; otherwise the destination under
+        ``destination_path`` is listed once, before copying, and held in
+        memory, so give a ``destination_path`` as deep as possible. A failure
+        to copy an artefact doesn't stop the others; it's reported in the
+        result.
+
+        :param destination: the repository to copy to. Its recipe must support
+            :meth:`upload_stream`.
+        :param source_path: file or directory in this repository; a directory
+            is copied recursively.
+        :param destination_path: directory in the destination repository or,
+            when copying a single file, the destination file name.
+        :param workers: number of artefacts to copy concurrently.
+        :return: the number of artefacts copied and skipped, and the errors.
+        :raises exception.FeatureNotImplemented: the destination recipe can't
+            upload from a stream.
+        """
+        if not destination._uploads_chunks:
+            raise exception.FeatureNotImplemented(
+                f'Copying to a {destination.recipe_name} repository')
+
+        separator = nexus_util.REMOTE_PATH_SEPARATOR
+        existing: Optional[Dict[str, Optional[str]]] = None
+        if type(destination)._path_search_filters is Repository._path_search_filters:
+            existing = {
+                artefact['path'].lstrip(separator): (artefact.get('checksum') or {}).get('sha1')
+                for artefact in destination.list_raw(destination_path)}
+
+        def _existing_sha1(dst_path: str) -> Optional[str]:
+            key = dst_path.lstrip(separator)
+            if existing is not None:
+                return existing.get(key)
+
+            filters = destination._path_search_filters(key)
+            if filters is None:
+                return None
+            query = {'repository': destination.name, **filters}
+            for artefact in destination._get_paginated('search/assets', params=query):
+                if artefact['path'].lstrip(separator) == key:
+                    return (artefact.get('checksum') or {}).get('sha1')
+            return None
+
+        def _copy(target):
+            artefact, dst_path = target
+            sha1 = (artefact.get('checksum') or {}).get('sha1')
+            if sha1 is not None and _existing_sha1(dst_path) == sha1:
+                LOG.debug('Skipping %s because %s is up-to-date', artefact['path'], dst_path)
+                return artefact['path'], False, None
+
+            LOG.debug('Copying [%s] to [%s] in repository=%s',
+                      artefact['path'], dst_path, destination.name)
+            try:
+                response = self._download_response(artefact['downloadUrl'])
+                with closing(response):
+                    destination._upload_chunks(
+                        response.iter_content(chunk_size=nexus_util.HASH_CHUNK_SIZE),
+                        dst_path, artefact.get('fileSize'))
+            except Exception as e:
+                return artefact['path'], True, e
+            return artefact['path'], True, None
+
+        copied = skipped = 0
+        errors: Dict[str, BaseException] = {}
+        results = nexus_util.concurrent_map(
+            _copy, self._copy_targets(source_path, destination_path), workers)
+
+        with progressbar(results, label='Copying') as bar:
+            for path, transferred, error in bar:
+                if error is not None:
+                    LOG.warning('Error copying %s: %s', path, error)
+                    errors[path] = error
+                elif transferred:
+                    copied += 1
+                else:
+                    skipped += 1
+
+        return CopyResult(copied, skipped, errors)
+
+    @property
+    def _script_asset_copy(self) -> str:
+        return api_util.script_for_version(
+            SCRIPT_NAME_ASSET_COPY, self._client.server_version, SCRIPT_ASSET_COPY_VERSIONS)
+
+    def server_copy(self, destination: 'Repository', source_path: str = '',
+                    destination_path: str = '', move: bool = False,
+                    batch_size: int = SERVER_COPY_BATCH_SIZE) -> CopyResult:
+        """
+        Copy, or move, artefacts to a repository on the same Nexus server
+        using a groovy script, so no file contents go through the client.
+        Moves within a blob store only update the asset records.
+
+        Paths are handled as per :meth:`copy_to`. Format-specific metadata,
+        such as ``maven-metadata.xml``, isn't rebuilt.
+
+        :param destination: the repository to copy to; it may be this one.
+        :param source_path: file or directory in this repository.
+        :param destination_path: as per :meth:`copy_to`.
+        :param move: delete the artefacts from this repository once copied.
+        :param batch_size: number of artefacts copied per request.
+        :return: the number of artefacts copied and skipped. Errors aren't
+            collected: a batch that fails raises an exception.
+        :raises ValueError: the destination is on another Nexus server, or
+            inside the source directory.
+        :raises exception.NexusClientAPIError: if the script fails; artefacts
+            copied by the previous batches remain copied.
+        """
+        if destination._client.config.url != self._client.config.url:
+            raise ValueError('The destination must be on the same Nexus server')
+
+        separator = nexus_util.REMOTE_PATH_SEPARATOR
+        path = self._path_filter(source_path).lstrip(separator)
+        destination_path = destination_path.lstrip(separator)
+        if destination.name == self.name and (
+                not path or f'{destination_path}{separator}'.startswith(
+                    path.rstrip(separator) + separator)):
+            raise ValueError(f'Cannot copy {path or "/"} into itself')
+
+        script_name = self._script_asset_copy
+        scripts = ScriptCollection(nexus_http=self._client)
+        scripts.create_if_missing(script_name)
+
+        def _batches():
+            script_args = {
+                'source': self.name, 'destination': destination.name, 'path': path,
+                'destinationPath': destination_path, 'move': move, 'batchSize': batch_size}
+            while True:
+                response = scripts.run_script(script_name, data=json.dumps(script_args))
+                result = json.loads(response['result'])
+                yield result
+                if not result['more']:
+                    return
+                script_args['after'] = result['after']
+
+        copied = skipped = 0
+        with progressbar(_batches(), label='Moving' if move else 'Copying') as bar:
+            for result in bar:
+                LOG.info('Copied a batch of %d assets; %d already there',
+                         result['copied'], result['skipped'])
+                copied += result['copied']
+                skipped += result['skipped']
+
+        return CopyResult(copied, skipped, {})
+
+    def upload(self, source, destination, recurse=True, flatten=False, workers=1,
+               extract=False):
         """
         Upload artefacts. The source must be either a local file name or
-        directory. The flatten and recurse options are honoured for
+        directory. The flatten, recurse and workers options are honoured for
         directory uploads.
 
+        When extract is True and the source is an archive (see
+        :py:data:`util.ARCHIVE_SUFFIXES`), the files in the archive are uploaded
+        instead, as per :meth:`upload_directory`.
+
         The destination must be a valid Nexus 3 repository path, including the
         repository name as the first component of the path.
 
@@ -383,10 +1091,16 @@ class Repository(base_repository.BaseRepository):
         :param flatten: Flatten directory structure by not reproducing local
                         directory structure remotely
         :type flatten: bool
+        :param workers: number of files to upload concurrently.
+        :type workers: int
+        :param extract: upload the contents of an archive source instead of
+            the archive itself.
+        :type extract: bool
         :return: number of files uploaded.
         """
-        if os.path.isdir(source):
-            return self.upload_directory(source, destination, recurse=recurse, flatten=flatten)
+        if os.path.isdir(source) or (extract and util.is_archive(source)):
+            return self.upload_directory(
+                source, destination, recurse=recurse, flatten=flatten, workers=workers)
 
         self.upload_file(source, destination)
         return 1
@@ -394,6 +1108,70 @@ class Repository(base_repository.BaseRepository):
     def upload_file(self, source, destination):
         raise NotImplementedError
 
+    def upload_stream(self, fileobj, destination, size=None) -> Dict[str, str]:
+        """
+        Upload the contents of a binary file object, such as ``sys.stdin.buffer``, to a file in
+        this repository. The contents are read in chunks while the request is sent, so they
+        are never held in memory nor written to a temporary file.
+
+        :param fileobj: binary file object to read the contents from.
+        :param destination: path to the file in this repository, excluding the repository name.
+        :type destination: str
+        :param size: size of the contents, when known. When None, the request body is sent
+            using chunked transfer encoding.
+        :type size: int
+        :return: the sha1 and md5 hex digests of the uploaded contents, keyed by hash name.
+        :raises exception.FeatureNotImplemented: the recipe can't upload from a stream.
+        :raises exception.NexusClientInvalidRepositoryPath: destination doesn't include a
+            file name.
+        :raises exception.NexusClientAPIError: unknown response from Nexus API.
+        """
+        if not self._uploads_chunks:
+            raise exception.FeatureNotImplemented(
+                f'Uploading a stream to a {self.recipe_name} repository')
+
+        reader = nexus_util.HashingReader(fileobj)
+        self._upload_chunks(reader, destination, size)
+
+        return reader.hexdigests
+
+    def _upload_chunks(self, chunks, destination, size=None) -> None:
+        """
+        Upload a file from an iterable of ``bytes`` chunks. Recipes that can upload a file
+        without knowing its contents, or size, in advance implement this to support
+        :meth:`upload_stream`.
+
+        :param chunks: the file contents.
+        :param destination: as per :meth:`upload_stream`.
+        :param size: as per :meth:`upload_stream`.
+        """
+        raise NotImplementedError
+
+    @property
+    def _uploads_chunks(self) -> bool:
+        """Whether the recipe implements :meth:`_upload_chunks`"""
+        return type(self)._upload_chunks is not Repository._upload_chunks
+
+    @staticmethod
+    def _upload_stream_dst_path_and_file(destination):
+        dst_path, dst_file = nexus_util.get_dst_path_and_file('', destination)
+        if not dst_file:
+            raise exception.NexusClientInvalidRepositoryPath(
+                f'Destination for a stream must include a file name: {destination}')
+
+        return dst_path, dst_file
+
+    @contextmanager
+    def _upload_session(self, workers: int = 1) -> Iterator[None]:
+        """
+        Context for a batch of :meth:`upload_file` calls, such as the ones made by
+        :meth:`upload_directory`. Recipes that need an expensive set-up per upload (e.g. a
+        new HTTP session) override this to do the set-up once for the whole batch.
+
+        :param workers: maximum number of concurrent uploads in the batch.
+        """
+        yield
+
     @staticmethod
     def _upload_dst_path(
             source: pathlib.Path,
@@ -405,33 +1183,78 @@ class Repository(base_repository.BaseRepository):
         else:
             return destination.joinpath(source_file.relative_to(source))
 
-    def upload_directory(self, source, destination, recurse=True, flatten=False):
+    def _upload_extracted(self, source, destination, recurse, flatten, workers):
+        """
+        For recipes that upload whole directories from disk, or from files
+        rather than streams, and for concurrent uploads: extracts an archive
+        to a temporary directory and uploads that with :meth:`upload_directory`.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            util.extract_archive(source, directory, recurse)
+            return self.upload_directory(
+                directory, destination, recurse=recurse, flatten=flatten, workers=workers)
+
+    def upload_directory(self, source, destination, recurse=True, flatten=False, workers=1):
         """
         Uploads all files in a directory to the specified destination directory
         in this repository, honouring options flatten and recurse.
 
-        :param source: path to local directory to be uploaded
+        The source may also be a tar or zip archive. With a single worker, and
+        a recipe that supports :meth:`upload_stream`, its files are streamed
+        from the archive one at a time, without extracting it to disk.
+        Otherwise the archive is extracted to a temporary directory, whose
+        files are uploaded ``workers`` at a time.
+
+        :param source: path to local directory, or archive, to be uploaded
         :param destination: destination directory
         :param recurse: when True, upload directory recursively.
         :type recurse: bool
         :param flatten: when True, the source directory tree isn't replicated
             on the destination.
+        :param workers: number of files to upload concurrently.
+        :type workers: int
         :return: number of files uploaded
         :rtype: int
         """
+        if os.path.isfile(source):
+            if workers > 1 or not self._uploads_chunks:
+                return self._upload_extracted(source, destination, recurse, flatten, workers)
+            return self._upload_archive(source, destination, recurse, flatten)
+
         destination = pathlib.Path(destination)
         file_set = util.get_files(source, recurse)
         expected_upload_count = len(file_set)
         upload_count = 0
-        with progressbar(file_set, length=expected_upload_count) as file_set:
-            for source_file in file_set:
-                dst_path = self._upload_dst_path(source, source_file, destination, flatten)
-                LOG.debug('Uploading [%s] to [%s] in repository=%s, flatten=%s',
-                          source_file, dst_path, self.name, flatten)
-                self.upload_file(source_file, dst_path)
+
+        def _upload(source_file):
+            dst_path = self._upload_dst_path(source, source_file, destination, flatten)
+            LOG.debug('Uploading [%s] to [%s] in repository=%s, flatten=%s',
+                      source_file, dst_path, self.name, flatten)
+            self.upload_file(source_file, dst_path)
+
+        with self._upload_session(workers), \
+                progressbar(length=expected_upload_count) as bar:
+            for _ in nexus_util.concurrent_map(_upload, file_set, workers):
                 upload_count += 1
+                bar.update(1)
 
         if expected_upload_count != upload_count:
             warnings.warn(f'expected {expected_upload_count} to upload but got {upload_count}')
 
         return upload_count
+
+    def _upload_archive(self, source, destination, recurse, flatten):
+        destination = pathlib.PurePosixPath(destination or nexus_util.REMOTE_PATH_SEPARATOR)
+        upload_count = 0
+
+        with progressbar(util.iter_archive(source, recurse)) as members:
+            for member_path, fh, size in members:
+                dst_path = self._upload_dst_path(
+                    pathlib.PurePosixPath(), pathlib.PurePosixPath(member_path),
+                    destination, flatten)
+                LOG.debug('Uploading [%s] from %s to [%s] in repository=%s, flatten=%s',
+                          member_path, source, dst_path, self.name, flatten)
+                self.upload_stream(fh, str(dst_path), size=size)
+                upload_count += 1
+
+        return upload_count
@@ -1,5 +1,29 @@
+import logging
 import pathlib
-from typing import Union, List
+import posixpath
+import queue
+import shutil
+import tarfile
+import threading
+import zipfile
+from typing import Union, List, Iterator, Tuple
+
+from nexuscli import exception, nexus_util
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+LOG = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz', '.tar.zst', '.zip')
+"""Archive types accepted by :func:`iter_archive`"""
+ARCHIVE_READ_AHEAD = 16
+"""Maximum number of chunks decompressed ahead of the uploads by :func:`iter_archive`"""
+
+_END_OF_MEMBER = object()
+_END_OF_ARCHIVE = object()
 
 
 def get_files(src_dir: Union[pathlib.Path, str], recurse: bool = True) -> List[pathlib.Path]:
@@ -21,3 +45,165 @@ def get_files(src_dir: Union[pathlib.Path, str], recurse: bool = True) -> List[p
         files = src_dir.glob('*')
 
     return [f for f in files if f.is_file()]
+
+
+def is_archive(path: Union[pathlib.Path, str]) -> bool:
+    """
+    :param path: path to a local file.
+    :return: whether the file name has one of the :py:data:`ARCHIVE_SUFFIXES`.
+    """
+    return str(path).lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _archive_members(path: str) -> Iterator[Tuple[str, object, int]]:
+    """
+    Yields the name, file object and size of each regular file in an archive, reading it
+    sequentially. Each file object is only valid until the next one is yielded.
+    """
+    if path.lower().endswith('.zip'):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    with archive.open(info) as fh:
+                        yield info.filename, fh, info.file_size
+        return
+
+    with open(path, 'rb') as fh:
+        if path.lower().endswith('.zst'):
+            tar = tarfile.open(fileobj=zstandard.ZstdDecompressor().stream_reader(fh), mode='r|')
+        else:
+            tar = tarfile.open(fileobj=fh, mode='r|*')
+
+        with tar:
+            for member in tar:
+                if member.isfile():
+                    yield member.name, tar.extractfile(member), member.size
+
+
+class _ArchiveMemberReader:
+    """
+    Binary file object for one archive member, reading the chunks queued by
+    :func:`iter_archive`. Each read returns at most one chunk.
+    """
+    def __init__(self, chunks: queue.Queue):
+        self._chunks = chunks
+        self._done = False
+
+    def read(self, size: int = -1) -> bytes:
+        if self._done:
+            return b''
+
+        chunk = self._chunks.get()
+        if chunk is _END_OF_MEMBER:
+            self._done = True
+            return b''
+        if isinstance(chunk, BaseException):
+            self._done = True
+            raise chunk
+
+        return chunk
+
+    def drain(self) -> None:
+        while self.read():
+            pass
+
+
+def iter_archive(
+        path: Union[pathlib.Path, str],
+        recurse: bool = True) -> Iterator[Tuple[str, _ArchiveMemberReader, int]]:
+    """
+    Yields the relative path, a binary file object and the size of each regular file in a tar
+    or zip archive, in archive order, without extracting it to disk.
+
+    The archive is read and decompressed by a background thread, up to
+    :py:data:`ARCHIVE_READ_AHEAD` chunks ahead, so decompression overlaps with whatever the
+    caller does with the file objects (e.g. uploading them). Each file object is only valid
+    until the next one is yielded.
+
+    :param path: path to an archive with one of the :py:data:`ARCHIVE_SUFFIXES`.
+    :param recurse: If false, only the files on the root of the archive are returned.
+    :raises exception.FeatureNotImplemented: the archive type isn't supported or it's a
+        ``.tar.zst`` and the ``zstandard`` package isn't installed.
+    """
+    path = str(path)
+    if not is_archive(path):
+        raise exception.FeatureNotImplemented(
+            f'{path} is not a supported archive: {", ".join(ARCHIVE_SUFFIXES)}')
+    if path.lower().endswith('.zst') and zstandard is None:
+        raise exception.FeatureNotImplemented(
+            'Install the zstandard package to read .tar.zst archives')
+
+    items: queue.Queue = queue.Queue(maxsize=ARCHIVE_READ_AHEAD)
+    stop = threading.Event()
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _read_archive():
+        try:
+            for name, fh, size in _archive_members(path):
+                name = posixpath.normpath(name.lstrip('/'))
+                if name.startswith('..'):
+                    LOG.warning('Skipping archive member outside of the archive root: %s', name)
+                    continue
+                if not recurse and posixpath.dirname(name):
+                    continue
+
+                if not _put((name, size)):
+                    return
+                while chunk := fh.read(nexus_util.HASH_CHUNK_SIZE):
+                    if not _put(chunk):
+                        return
+                if not _put(_END_OF_MEMBER):
+                    return
+        except Exception as e:
+            _put(e)
+        _put(_END_OF_ARCHIVE)
+
+    reader_thread = threading.Thread(target=_read_archive, daemon=True)
+    reader_thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _END_OF_ARCHIVE:
+                break
+            if isinstance(item, BaseException):
+                raise item
+
+            name, size = item
+            member_reader = _ArchiveMemberReader(items)
+            yield name, member_reader, size
+            # skip whatever the caller didn't read, to get to the next member
+            member_reader.drain()
+    finally:
+        stop.set()
+        reader_thread.join()
+
+
+def extract_archive(
+        path: Union[pathlib.Path, str], directory: Union[pathlib.Path, str],
+        recurse: bool = True) -> int:
+    """
+    Extracts the regular files of an archive, as read by :func:`iter_archive`, to a local
+    directory; members outside of the archive root are skipped.
+
+    :param path: path to an archive with one of the :py:data:`ARCHIVE_SUFFIXES`.
+    :param directory: where to extract the files to.
+    :param recurse: If false, only the files on the root of the archive are extracted.
+    :return: number of files extracted.
+    """
+    count = 0
+    for name, fh, _ in iter_archive(path, recurse):
+        target = pathlib.Path(directory, name)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, 'wb') as out:
+            shutil.copyfileobj(fh, out)
+        count += 1
+
+    return count
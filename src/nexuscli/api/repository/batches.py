@@ -0,0 +1,88 @@
+"""
+Asset listings as columnar batches, NumPy structured arrays, for analysing the contents of large
+repositories (sizes, age, duplicates) with vectorised operations instead of a loop over dicts.
+"""
+import datetime
+import itertools
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from nexuscli import exception, nexus_util
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+ASSET_BATCH_SIZE = 10000
+"""Number of assets in each batch yielded by :func:`asset_batches`"""
+
+ASSET_BATCH_FIELDS = (
+    ('path', 'O'),
+    ('size', 'i8'),
+    ('last_modified', 'M8[ms]'),
+    ('last_downloaded', 'M8[ms]'),
+    ('sha1', 'S40'),
+)
+"""Name and NumPy type of each column of a batch; see :func:`asset_batch`"""
+
+
+def _require_numpy() -> None:
+    if numpy is None:
+        raise exception.FeatureNotImplemented(
+            'Install the numpy package to list assets in batches')
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime.datetime]:
+    """An asset timestamp as a naive UTC datetime, as NumPy expects"""
+    parsed = nexus_util.parse_datetime(value)
+    if parsed is None:
+        return None
+    return parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def asset_batch(records: List[Dict]) -> 'numpy.ndarray':
+    """
+    Converts asset records into a structured array with the columns in
+    :data:`ASSET_BATCH_FIELDS`:
+
+    - ``path``: without a leading path separator.
+    - ``size``: in bytes; -1 when unknown.
+    - ``last_modified`` and ``last_downloaded``: UTC; ``NaT`` when unknown.
+    - ``sha1``: the hex digest as bytes; empty when unknown.
+
+    :param records: assets as returned by
+        :meth:`~nexuscli.api.repository.base_models.Repository.list_raw`.
+    :raises exception.FeatureNotImplemented: the ``numpy`` package isn't installed.
+    """
+    _require_numpy()
+    separator = nexus_util.REMOTE_PATH_SEPARATOR
+    rows = []
+    for record in records:
+        size = record.get('fileSize')
+        rows.append((
+            record['path'].lstrip(separator),
+            -1 if size is None else size,
+            _timestamp(record.get('lastModified')),
+            _timestamp(record.get('lastDownloaded')),
+            (record.get('checksum') or {}).get('sha1') or ''))
+
+    return numpy.array(rows, dtype=list(ASSET_BATCH_FIELDS))
+
+
+def asset_batches(
+        records: Iterable[Dict], batch_size: int = ASSET_BATCH_SIZE) -> Iterator['numpy.ndarray']:
+    """
+    Groups a listing into batches of ``batch_size`` assets, as per :func:`asset_batch`.
+
+    Only one batch is held at a time, so memory use depends on ``batch_size``, not on the
+    length of the listing.
+
+    :param records: assets as returned by
+        :meth:`~nexuscli.api.repository.base_models.Repository.list_raw`.
+    :param batch_size: number of assets in each batch; the last one may be shorter.
+    :raises exception.FeatureNotImplemented: the ``numpy`` package isn't installed.
+    """
+    _require_numpy()
+    records = iter(records)
+    while batch := list(itertools.islice(records, batch_size)):
+        yield asset_batch(batch)
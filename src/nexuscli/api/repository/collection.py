@@ -1,11 +1,16 @@
+import contextlib
+import fnmatch
 import inspect
+import itertools
 import json
-from typing import List, Optional, Tuple, Type, Union
+import logging
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
 
 import semver
 import sys
 
-from nexuscli import exception
+from nexuscli import exception, nexus_util
 from nexuscli.api import util
 from nexuscli.api.base_collection import BaseCollection
 from nexuscli.api.repository import model, Repository
@@ -15,6 +20,8 @@ SCRIPT_CREATE_VERSIONS = [semver.VersionInfo(3, 21, 0)]
 SCRIPT_NAME_CREATE = 'nexus3-cli-repository-create'
 SCRIPT_NAME_GET = 'nexus3-cli-repository-get'
 
+LOG = logging.getLogger(__name__)
+
 
 def get_repository_classes() -> List[Type[Repository]]:
     members = inspect.getmembers(sys.modules['nexuscli.api.repository.model'], inspect.isclass)
@@ -242,6 +249,105 @@ class RepositoryCollection(BaseCollection):
         """
         return self._http.service_get('repositories')
 
+    def search_all(
+            self, pattern: str, repositories: str = '*', workers: int = 8,
+            limit: Optional[int] = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Searches many repositories at the same time for the assets with a
+        path matching ``pattern``.
+
+        Group repositories aren't searched, as their members are. A
+        repository that can't be searched is skipped with a warning.
+
+        :param pattern: glob matching the whole asset path, such as
+            ``*/foo-1.0.jar``; the longest part without wildcards is sent to
+            Nexus as a keyword, to narrow the search.
+        :param repositories: glob matching the names of the repositories to
+            search.
+        :param workers: number of repositories searched at the same time.
+        :param limit: stop searching after this many matches.
+        :return: the repository name and the asset, as per
+            :meth:`Repository.list_raw`, for each match in the order they're
+            found.
+        """
+        separator = nexus_util.REMOTE_PATH_SEPARATOR
+        pattern = pattern.lstrip(separator)
+        literals = re.split(r'[*?\[\]]', pattern)
+        keyword = max(literals, key=len).strip(separator)
+
+        def _search(name: str) -> Callable[[], Iterator[Dict]]:
+            def _source():
+                repository = Repository(self._http, name=name)
+                try:
+                    for asset in repository._list_raw_search(keyword):
+                        if fnmatch.fnmatchcase(asset['path'].lstrip(separator), pattern):
+                            yield asset
+                except exception.NexusClientBaseError as e:
+                    LOG.warning('Skipping repository %s: %s', name, e)
+            return _source
+
+        yield from self._search_concurrently(_search, repositories, workers, limit)
+
+    def locate(
+            self, sha1: Optional[str] = None, local_path=None, repositories: str = '*',
+            workers: int = 8, limit: Optional[int] = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Finds the assets with the same content as a local file, by SHA-1
+        checksum. The checksum is matched by the Nexus service, so
+        repositories aren't listed: searching all repositories takes a single
+        request, while a ``repositories`` glob takes one search request per
+        matching repository (see :meth:`Repository.locate`).
+
+        Group repositories aren't searched, as their members are. When
+        searching by glob, a repository that can't be searched is skipped
+        with a warning.
+
+        :param sha1: the SHA-1 checksum to look for.
+        :param local_path: path to a local file; its SHA-1 checksum is
+            calculated and used instead of ``sha1``.
+        :param repositories: glob matching the names of the repositories to
+            search.
+        :param workers: number of repositories searched at the same time.
+        :param limit: stop searching after this many matches.
+        :return: the repository name and the asset, as per
+            :meth:`Repository.list_raw`, for each match in the order they're
+            found.
+        :raises ValueError: unless exactly one of ``sha1`` and ``local_path``
+            is given.
+        """
+        if (sha1 is None) == (local_path is None):
+            raise ValueError('Exactly one of sha1 or local_path is required')
+        if local_path is not None:
+            sha1 = nexus_util.calculate_hash('sha1', local_path)
+
+        if repositories == '*':
+            found = util.get_paginated(self._http, 'search/assets', params={'sha1': sha1})
+            with contextlib.closing(found):
+                for asset in itertools.islice(found, limit):
+                    yield asset['repository'], asset
+            return
+
+        def _search(name: str) -> Callable[[], Iterator[Dict]]:
+            def _source():
+                try:
+                    yield from Repository(self._http, name=name).locate(sha1)
+                except exception.NexusClientBaseError as e:
+                    LOG.warning('Skipping repository %s: %s', name, e)
+            return _source
+
+        yield from self._search_concurrently(_search, repositories, workers, limit)
+
+    def _search_concurrently(
+            self, search: Callable[[str], Callable[[], Iterator[Dict]]], repositories: str,
+            workers: int, limit: Optional[int]) -> Iterator[Tuple[str, Dict]]:
+        names = [
+            x['name'] for x in self.raw_list()
+            if x.get('type') != 'group' and fnmatch.fnmatchcase(x['name'], repositories)]
+
+        results = nexus_util.concurrent_chain(((x, search(x)) for x in names), workers)
+        with contextlib.closing(results):
+            yield from itertools.islice(results, limit)
+
     def delete(self, name: str) -> None:
         """
         Delete a repository.
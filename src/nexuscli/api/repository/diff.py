@@ -0,0 +1,191 @@
+"""
+Compares the files in a repository with the ones in another repository or in a local directory,
+by path and checksum, without holding both listings in memory.
+"""
+import heapq
+import itertools
+import json
+import os
+import pathlib
+import tempfile
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from nexuscli import nexus_util
+
+if TYPE_CHECKING:
+    from nexuscli.api.repository.base_models import Repository
+    from nexuscli.api.repository.index import AssetIndex
+
+DIFF_SORT_THRESHOLD = 100000
+"""Number of entries sorted in memory; longer listings are sorted in temporary files"""
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+
+class Entry(NamedTuple):
+    """A file on one side of a diff"""
+    path: str
+    """Path relative to the directory being compared"""
+    size: Optional[int]
+    sha1: Optional[str]
+    """The checksum, when known without reading the file"""
+    local_path: Optional[str] = None
+    """For local files, where to read the file from to calculate the checksum"""
+
+
+class Difference(NamedTuple):
+    """A file that's different on the two sides of a diff"""
+    status: str
+    """One of :data:`ADDED` (only on the second side), :data:`REMOVED` (only on the first)
+    or :data:`CHANGED`"""
+    path: str
+
+
+def remote_entries(
+        repository: 'Repository', repository_path: str = '',
+        index: Optional['AssetIndex'] = None) -> Iterator[Entry]:
+    """
+    The files under a directory of a repository, as listed by
+    :meth:`~nexuscli.api.repository.base_models.Repository.list_raw`.
+
+    :param repository: the repository.
+    :param repository_path: the directory in the repository.
+    :param index: list from this local index instead of the Nexus service.
+    """
+    separator = nexus_util.REMOTE_PATH_SEPARATOR
+    base = repository._path_filter(repository_path).lstrip(separator)
+    if base and not base.endswith(separator):
+        base += separator
+
+    for record in repository.list_raw(base, index):
+        path = record['path'].lstrip(separator)
+        # the listing may include paths that don't start with the directory
+        if path.startswith(base):
+            sha1 = (record.get('checksum') or {}).get('sha1')
+            yield Entry(path[len(base):], record.get('fileSize'), sha1)
+
+
+def local_entries(directory) -> Iterator[Entry]:
+    """
+    The files under a local directory. Checksums are calculated only when needed, by
+    :func:`diff`.
+
+    :param directory: path to the local directory.
+    """
+    directory = pathlib.Path(directory)
+    for root, _, files in os.walk(directory):
+        for name in files:
+            local_path = os.path.join(root, name)
+            relative_path = pathlib.Path(local_path).relative_to(directory).as_posix()
+            yield Entry(relative_path, os.path.getsize(local_path), None, local_path)
+
+
+def _path(entry: Entry) -> str:
+    return entry.path
+
+
+def _spill(entries: List[Entry]):
+    run = tempfile.TemporaryFile('w+', encoding='utf-8')
+    for entry in sorted(entries, key=_path):
+        run.write(json.dumps(entry) + '\n')
+    run.seek(0)
+    return run
+
+
+def sorted_entries(
+        entries: Iterable[Entry], threshold: Optional[int] = None) -> Iterator[Entry]:
+    """
+    Sorts entries by path, dropping repeated paths. Up to ``threshold`` entries are sorted in
+    memory; beyond that, each ``threshold`` entries are sorted and written to a temporary
+    file, and the files are merged.
+
+    :param entries: the entries to sort.
+    :param threshold: maximum number of entries in memory; defaults to
+        :data:`DIFF_SORT_THRESHOLD`.
+    """
+    threshold = threshold or DIFF_SORT_THRESHOLD
+    entries = iter(entries)
+    runs = []
+    try:
+        while batch := list(itertools.islice(entries, threshold)):
+            if not runs and len(batch) < threshold:
+                merged = iter(sorted(batch, key=_path))
+                break
+            runs.append(_spill(batch))
+        else:
+            merged = heapq.merge(
+                *[(Entry(*json.loads(line)) for line in run) for run in runs], key=_path)
+
+        # a listing can repeat a path when its pages shift
+        for _, entries_for_path in itertools.groupby(merged, key=_path):
+            yield next(entries_for_path)
+    finally:
+        for run in runs:
+            run.close()
+
+
+def _merge(a: Iterator[Entry],
+           b: Iterator[Entry]) -> Iterator[Tuple[Optional[Entry], Optional[Entry]]]:
+    """Joins two sorted listings by path"""
+    x, y = next(a, None), next(b, None)
+    while x is not None or y is not None:
+        if y is None or (x is not None and x.path < y.path):
+            yield x, None
+            x = next(a, None)
+        elif x is None or y.path < x.path:
+            yield None, y
+            y = next(b, None)
+        else:
+            yield x, y
+            x, y = next(a, None), next(b, None)
+
+
+def _sha1(entry: Entry, local_sha1: Callable[[str], str]) -> Optional[str]:
+    if entry.sha1 is None and entry.local_path is not None:
+        return local_sha1(entry.local_path)
+    return entry.sha1
+
+
+def diff(a: Iterable[Entry], b: Iterable[Entry], workers: int = 1,
+         local_sha1: Optional[Callable[[str], str]] = None,
+         sort_threshold: Optional[int] = None) -> Iterator[Difference]:
+    """
+    Compares two listings, such as the ones from :func:`remote_entries` and
+    :func:`local_entries`, by path and checksum.
+
+    Both listings are sorted by path, using temporary files for long listings (see
+    :func:`sorted_entries`), and joined as they're read. Files with different sizes are
+    changed; otherwise, their SHA-1 checksums are compared. Local files are only hashed when
+    there's a file with the same path and size on the other side.
+
+    :param a: the first listing.
+    :param b: the second listing.
+    :param workers: number of files compared at the same time; local files are hashed
+        concurrently.
+    :param local_sha1: callable returning the SHA-1 checksum of a local file, e.g.
+        :meth:`~nexuscli.api.repository.index.AssetIndex.local_sha1` to reuse the checksums
+        of unchanged files. Defaults to calculating it.
+    :param sort_threshold: as per :func:`sorted_entries`.
+    :return: the differences, in path order when ``workers`` is one; otherwise, in the order
+        the comparisons finish.
+    """
+    local_sha1 = local_sha1 or (lambda path: nexus_util.calculate_hash('sha1', path))
+
+    def _compare(pair: Tuple[Optional[Entry], Optional[Entry]]) -> Optional[Difference]:
+        x, y = pair
+        if y is None:
+            return Difference(REMOVED, x.path)
+        if x is None:
+            return Difference(ADDED, y.path)
+        if None not in (x.size, y.size) and x.size != y.size:
+            return Difference(CHANGED, x.path)
+        if _sha1(x, local_sha1) != _sha1(y, local_sha1):
+            return Difference(CHANGED, x.path)
+        return None
+
+    pairs = _merge(sorted_entries(a, sort_threshold), sorted_entries(b, sort_threshold))
+    for difference in nexus_util.concurrent_map(_compare, pairs, workers):
+        if difference is not None:
+            yield difference
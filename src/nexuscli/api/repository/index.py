@@ -0,0 +1,325 @@
+"""
+A local SQLite index of the assets in Nexus repositories, so listings can be answered without
+walking the Nexus search API every time.
+"""
+import datetime
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from nexuscli import exception, nexus_util
+
+if TYPE_CHECKING:
+    from nexuscli.api.repository.base_models import Repository
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_INDEX = str(Path.home().joinpath('.nexus-cli-index.sqlite3').absolute())
+
+INDEX_BATCH_SIZE = 1000
+"""Number of asset rows written to the index at once"""
+
+GLOB_CHARACTERS = '*?['
+
+_ASSET_COLUMNS = """
+    server TEXT NOT NULL,
+    repository TEXT NOT NULL,
+    key TEXT NOT NULL,
+    path TEXT NOT NULL,
+    id TEXT NOT NULL,
+    sha1 TEXT,
+    md5 TEXT,
+    sha256 TEXT,
+    size INTEGER,
+    last_modified TEXT,
+    record TEXT NOT NULL"""
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS assets ({_ASSET_COLUMNS},
+    PRIMARY KEY (server, repository, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS repositories (
+    server TEXT NOT NULL,
+    repository TEXT NOT NULL,
+    refreshed_at TEXT NOT NULL,
+    PRIMARY KEY (server, repository)
+);
+CREATE TABLE IF NOT EXISTS local_hashes (
+    path TEXT NOT NULL PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha1 TEXT NOT NULL
+);
+"""
+
+_REFRESH_SCHEMA = f"""
+DROP TABLE IF EXISTS temp.refresh_listing;
+DROP TABLE IF EXISTS temp.refresh_changes;
+CREATE TEMP TABLE refresh_listing ({_ASSET_COLUMNS},
+    PRIMARY KEY (key)
+) WITHOUT ROWID;
+CREATE TEMP TABLE refresh_changes (
+    key TEXT NOT NULL PRIMARY KEY,
+    status TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+"""Temporary tables used by :meth:`AssetIndex.refresh`, so a listing isn't held in memory"""
+
+_ADDED, _UPDATED, _REMOVED = 'added', 'updated', 'removed'
+
+
+class RefreshResult(NamedTuple):
+    """The outcome of :meth:`AssetIndex.refresh`"""
+    added: int
+    updated: int
+    removed: int
+
+
+def _key(path: str) -> str:
+    """The asset path used for queries; only some formats start paths with a separator"""
+    return path.lstrip(nexus_util.REMOTE_PATH_SEPARATOR)
+
+
+def _prefix_range(prefix: str) -> Tuple[str, List[str]]:
+    """A condition matching the keys starting with ``prefix``, using the primary key"""
+    if not prefix:
+        return '', []
+    # SQLite compares text as UTF-8 bytes; no character sorts after U+10FFFF
+    return ' AND key >= ? AND key < ?', [prefix, prefix + '\U0010ffff']
+
+
+def _row(server: str, repository_name: str, record: Dict, record_json: str) -> Tuple:
+    checksum = record.get('checksum') or {}
+    return (
+        server, repository_name, _key(record['path']), record['path'], record['id'],
+        checksum.get('sha1'), checksum.get('md5'), checksum.get('sha256'),
+        record.get('fileSize'), record.get('lastModified'), record_json)
+
+
+def _changes(listed: Iterator[Tuple[str, str]],
+             indexed: Iterator[Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+    """Joins two ``(key, record)`` listings ordered by key into the status of each change"""
+    x, y = next(listed, None), next(indexed, None)
+    while x is not None or y is not None:
+        if y is None or (x is not None and x[0] < y[0]):
+            yield x[0], _ADDED
+            x = next(listed, None)
+        elif x is None or y[0] < x[0]:
+            yield y[0], _REMOVED
+            y = next(indexed, None)
+        else:
+            if x[1] != y[1]:
+                yield x[0], _UPDATED
+            x, y = next(listed, None), next(indexed, None)
+
+
+class AssetIndex:
+    """
+    A local index of the assets in Nexus repositories, kept in a SQLite database.
+
+    The index keeps the records returned by the Nexus search API, per server and repository.
+    It's filled by :meth:`build` and kept up-to-date by :meth:`refresh`; it's never updated
+    by other operations, such as uploads.
+
+    :param path: path to the database file; it's created if it doesn't exist.
+    """
+    def __init__(self, path=None):
+        self.path = Path(path or DEFAULT_INDEX)
+        # local_sha1 is called from worker threads; writes are serialised by the lock
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _names(repository: 'Repository') -> Tuple[str, str]:
+        return repository._client.config.url, repository.name
+
+    def _set_refreshed(self, server: str, repository_name: str) -> None:
+        self._db.execute(
+            'INSERT OR REPLACE INTO repositories VALUES (?, ?, ?)',
+            (server, repository_name,
+             datetime.datetime.now(datetime.timezone.utc).isoformat()))
+
+    def refreshed_at(
+            self, repository: 'Repository'
+    ) -> Optional[datetime.datetime]:
+        """
+        When the repository was last indexed.
+
+        :return: the time, or None if the repository isn't in the index.
+        """
+        row = self._db.execute(
+            'SELECT refreshed_at FROM repositories WHERE server = ? AND repository = ?',
+            self._names(repository)).fetchone()
+        return None if row is None else datetime.datetime.fromisoformat(row[0])
+
+    def build(self, repository: 'Repository') -> int:
+        """
+        Replaces the index of a repository with a complete listing from the Nexus service.
+
+        :param repository: the repository to index.
+        :return: the number of assets indexed.
+        """
+        server, repository_name = self._names(repository)
+        records = repository._list_raw_search('')
+        count = 0
+
+        with self._db:
+            self._db.execute(
+                'DELETE FROM assets WHERE server = ? AND repository = ?',
+                (server, repository_name))
+            while batch := list(itertools.islice(records, INDEX_BATCH_SIZE)):
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    [_row(server, repository_name, record, json.dumps(record, sort_keys=True))
+                     for record in batch])
+                count += len(batch)
+            self._set_refreshed(server, repository_name)
+
+        LOG.info('Indexed %d assets in %s', count, repository_name)
+        return count
+
+    def refresh(
+            self, repository: 'Repository',
+            repository_path: str = '') -> RefreshResult:
+        """
+        Brings the index of a repository, or of a path in it, up-to-date with the Nexus
+        service.
+
+        The Nexus search API can't list only what changed, so the path is listed again; only
+        the assets added, changed or removed since the last refresh are written to the index.
+        Refreshing the path where changes are expected keeps the listing short. The listing is
+        written to a temporary table and compared with the index in path order, so neither is
+        held in memory.
+
+        :param repository: the repository to refresh.
+        :param repository_path: only refresh the assets with paths starting with this.
+        :return: the number of assets added, updated and removed.
+        :raises exception.NotFound: if a path is given and the repository isn't in the index;
+            the index would only have that path, but answer for the whole repository.
+        """
+        server, repository_name = self._names(repository)
+        prefix = _key(repository_path)
+        if prefix and self.refreshed_at(repository) is None:
+            raise exception.NotFound(
+                f'Repository {repository.name} isn\'t indexed; '
+                f'run `nexus3 index build {repository.name}`')
+        condition, params = _prefix_range(prefix)
+
+        # the keyword search also matches paths that don't start with the prefix
+        records = (
+            r for r in repository._list_raw_search(prefix) if _key(r['path']).startswith(prefix))
+
+        self._db.executescript(_REFRESH_SCHEMA)
+        try:
+            with self._db:
+                while batch := list(itertools.islice(records, INDEX_BATCH_SIZE)):
+                    # pages can shift while listing; the first record of a path is kept
+                    self._db.executemany(
+                        'INSERT OR IGNORE INTO refresh_listing '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        [_row(server, repository_name, record,
+                              json.dumps(record, sort_keys=True)) for record in batch])
+
+                # both are walked in key order, so neither is held in memory
+                listed = self._db.execute(
+                    'SELECT key, record FROM refresh_listing ORDER BY key')
+                indexed = self._db.execute(
+                    f'SELECT key, record FROM assets WHERE server = ? AND repository = ?'
+                    f'{condition} ORDER BY key', [server, repository_name] + params)
+                changes = _changes(listed, indexed)
+                while batch := list(itertools.islice(changes, INDEX_BATCH_SIZE)):
+                    self._db.executemany('INSERT INTO refresh_changes VALUES (?, ?)', batch)
+
+                self._db.execute(
+                    'INSERT OR REPLACE INTO assets SELECT l.* FROM refresh_listing AS l '
+                    'JOIN refresh_changes AS c ON c.key = l.key WHERE c.status != ?',
+                    (_REMOVED,))
+                self._db.execute(
+                    'DELETE FROM assets WHERE server = ? AND repository = ? AND key IN '
+                    '(SELECT key FROM refresh_changes WHERE status = ?)',
+                    (server, repository_name, _REMOVED))
+                counts = dict(self._db.execute(
+                    'SELECT status, COUNT(*) FROM refresh_changes GROUP BY status'))
+                if not prefix:
+                    self._set_refreshed(server, repository_name)
+        finally:
+            self._db.executescript(
+                'DROP TABLE IF EXISTS temp.refresh_listing; '
+                'DROP TABLE IF EXISTS temp.refresh_changes;')
+
+        result = RefreshResult(
+            counts.get(_ADDED, 0), counts.get(_UPDATED, 0), counts.get(_REMOVED, 0))
+        LOG.info('Refreshed %s: %d added, %d updated, %d removed', repository_name, *result)
+        return result
+
+    def query(
+            self, repository: 'Repository',
+            pattern: str = '') -> Iterator[Dict]:
+        """
+        Lists the indexed assets of a repository, as returned by the Nexus search API.
+
+        :param repository: the repository, which must have been indexed with :meth:`build`.
+        :param pattern: path prefix or, if it contains any of ``*?[``, a glob matching the
+            whole path, as per SQLite's ``GLOB``. A leading path separator is ignored.
+        :return: the asset records, ordered by path.
+        :raises exception.NotFound: if the repository isn't in the index.
+        """
+        if self.refreshed_at(repository) is None:
+            raise exception.NotFound(
+                f'Repository {repository.name} isn\'t indexed; '
+                f'run `nexus3 index build {repository.name}`')
+
+        pattern = _key(pattern)
+        literal_end = min([pattern.find(c) for c in GLOB_CHARACTERS if c in pattern] or [-1])
+        if literal_end < 0:
+            condition, params = _prefix_range(pattern)
+        else:
+            condition, params = _prefix_range(pattern[:literal_end])
+            condition += ' AND key GLOB ?'
+            params.append(pattern)
+
+        rows = self._db.execute(
+            f'SELECT record FROM assets WHERE server = ? AND repository = ?{condition} '
+            f'ORDER BY key', list(self._names(repository)) + params)
+        for record_json, in rows:
+            yield json.loads(record_json)
+
+    def local_sha1(self, path) -> str:
+        """
+        The SHA-1 checksum of a local file. Checksums are kept in the index, with the size and
+        modification time of the file, and reused while these don't change.
+
+        Safe to call from several threads at once.
+
+        :param path: path to the local file.
+        """
+        path = str(Path(path).absolute())
+        stat = os.stat(path)
+        with self._lock:
+            row = self._db.execute(
+                'SELECT sha1 FROM local_hashes WHERE path = ? AND size = ? AND mtime_ns = ?',
+                (path, stat.st_size, stat.st_mtime_ns)).fetchone()
+        if row is not None:
+            return row[0]
+
+        sha1 = nexus_util.calculate_hash('sha1', path)
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO local_hashes VALUES (?, ?, ?, ?)',
+                (path, stat.st_size, stat.st_mtime_ns, sha1))
+        return sha1
@@ -0,0 +1,94 @@
+"""
+Client-side retention rules, such as "keep the last 20 versions of each artefact", which Nexus
+cleanup policies can't express.
+"""
+import datetime
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from nexuscli import nexus_util
+from nexuscli.api.repository.versions import Version
+
+
+class PruneCandidate(NamedTuple):
+    """A component version selected for deletion by :func:`plan`"""
+    component_id: str
+    group: Optional[str]
+    name: str
+    version: str
+    asset_paths: List[str]
+    size: int
+    """Total size of the assets, in bytes"""
+    last_modified: Optional[datetime.datetime]
+    """When the most recently modified asset of the component was modified"""
+
+    @property
+    def coordinates(self) -> str:
+        return ':'.join(x for x in (self.group, self.name, self.version) if x)
+
+
+def _candidate(component: Dict) -> PruneCandidate:
+    assets = component.get('assets') or []
+    last_modified = [nexus_util.parse_datetime(a.get('lastModified')) for a in assets]
+    last_modified = [x for x in last_modified if x is not None]
+
+    return PruneCandidate(
+        component_id=component['id'],
+        group=component.get('group'),
+        name=component['name'],
+        version=component['version'],
+        asset_paths=[a['path'] for a in assets],
+        size=sum(a.get('fileSize') or 0 for a in assets),
+        last_modified=max(last_modified) if last_modified else None)
+
+
+def plan(components: Iterable[Dict], keep_last: Optional[int] = None,
+         older_than: Optional[datetime.timedelta] = None, match: Optional[str] = None,
+         now: Optional[datetime.datetime] = None) -> List[PruneCandidate]:
+    """
+    Selects the component versions to delete, in a single pass over a component listing.
+
+    Components are grouped by group and name. A version is selected when it isn't one of the
+    ``keep_last`` newest versions of its group and name, and its assets were last modified more
+    than ``older_than`` ago; a rule that isn't given always selects. Components without a
+    version, such as the ones in raw repositories, are never selected.
+
+    :param components: components as returned by the Nexus ``search/components`` API.
+    :param keep_last: number of newest versions to keep for each group and name. Versions are
+        ordered as per :class:`~nexuscli.api.repository.versions.Version`.
+    :param older_than: minimum age of the component, based on the ``lastModified`` of its
+        assets. Components without a ``lastModified`` are kept.
+    :param match: regular expression searched for in ``group:name:version``; components that
+        don't match are kept.
+    :param now: the current time, used with ``older_than``; defaults to now in UTC.
+    :return: the selected components, grouped by group and name, oldest version first.
+    """
+    if keep_last is None and older_than is None:
+        raise ValueError('At least one of keep_last or older_than is required')
+
+    match_re = re.compile(match) if match else None
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+
+    versions: Dict[Tuple[Optional[str], str], List[PruneCandidate]] = {}
+    for component in components:
+        if not component.get('version'):
+            continue
+
+        candidate = _candidate(component)
+        if match_re is not None and not match_re.search(candidate.coordinates):
+            continue
+
+        versions.setdefault((candidate.group, candidate.name), []).append(candidate)
+
+    selected = []
+    for candidates in versions.values():
+        candidates.sort(key=lambda x: Version(x.version))
+        if keep_last is not None:
+            candidates = candidates[:max(len(candidates) - keep_last, 0)]
+        if older_than is not None:
+            candidates = [
+                x for x in candidates
+                if x.last_modified is not None and now - x.last_modified > older_than]
+        selected.extend(candidates)
+
+    return selected
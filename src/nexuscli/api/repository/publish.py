@@ -0,0 +1,149 @@
+"""
+Uploads the same files to several repositories, possibly on different Nexus servers, reading
+each file only once.
+"""
+import concurrent.futures
+import functools
+import logging
+import os
+import pathlib
+import posixpath
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from click import progressbar
+
+from nexuscli import exception, nexus_util
+from nexuscli.api.repository.base_models import Repository
+from nexuscli.api.repository.base_models import util
+
+LOG = logging.getLogger(__name__)
+
+Destination = Tuple[Repository, str]
+"""A repository and the destination path in it, excluding the repository name"""
+
+
+class PublishResult(NamedTuple):
+    """The outcome of :func:`publish` for one destination"""
+    repository: Repository
+    destination: str
+    upload_count: int
+    errors: Dict[str, BaseException]
+    """The error for each local file that couldn't be uploaded"""
+
+
+def _upload(repository: Repository, dst_path: str, size: Optional[int]) -> Callable:
+    """Creates a :func:`nexus_util.tee` consumer uploading to the given destination"""
+    def _consumer(chunks):
+        repository._upload_chunks(chunks, dst_path, size)
+    return _consumer
+
+
+def _publish_file(
+        fileobj, dst_paths: Sequence[Tuple[Repository, str]],
+        source_file: Optional[pathlib.Path] = None,
+        size: Optional[int] = None) -> List[Optional[BaseException]]:
+    errors: List[Optional[BaseException]] = [None] * len(dst_paths)
+    streamed = [i for i, (repository, _) in enumerate(dst_paths) if repository._uploads_chunks]
+    separate = [i for i in range(len(dst_paths)) if i not in streamed]
+
+    if source_file is None:
+        for i in separate:
+            errors[i] = exception.FeatureNotImplemented(
+                f'Uploading a stream to a {dst_paths[i][0].recipe_name} repository')
+        separate = []
+
+    # recipes that can't upload a stream read the file on their own, next to the tee; as
+    # consumers of the tee, they'd hold back the others until they finished
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(len(separate), 1)) as executor:
+        futures = {
+            i: executor.submit(dst_paths[i][0].upload_file, source_file, dst_paths[i][1])
+            for i in separate}
+
+        if streamed:
+            consumers = [_upload(*dst_paths[i], size) for i in streamed]
+            chunks = iter(functools.partial(fileobj.read, nexus_util.HASH_CHUNK_SIZE), b'')
+            for i, future in zip(streamed, nexus_util.tee(chunks, consumers)):
+                errors[i] = future.exception()
+
+        for i, future in futures.items():
+            errors[i] = future.exception()
+
+    return errors
+
+
+def publish_stream(
+        fileobj, destinations: Sequence[Destination],
+        size: Optional[int] = None) -> List[Optional[BaseException]]:
+    """
+    Uploads the contents of a binary file object, such as ``sys.stdin.buffer``, to a file in
+    every destination, concurrently, reading the contents only once.
+
+    :param fileobj: binary file object to read the contents from.
+    :param destinations: the repositories and the path to the file in each of them.
+    :param size: size of the contents, when known.
+    :return: for each destination, in the same order, None when the upload succeeded or the
+        exception raised otherwise.
+    """
+    return _publish_file(fileobj, destinations, size=size)
+
+
+def publish(
+        source, destinations: Sequence[Destination], recurse: bool = True,
+        flatten: bool = False) -> List[PublishResult]:
+    """
+    Uploads a local file, or all files in a directory, to every destination. Each file is read
+    once and its contents are sent to all destinations concurrently, as it's read.
+
+    Destination paths are handled as per :meth:`Repository.upload`. Recipes that can't upload
+    from a stream (see :meth:`Repository.upload_stream`) read the file themselves.
+
+    A failure to upload a file to a destination doesn't stop the uploads of that file to the
+    other destinations, nor of the remaining files; it's reported in the result.
+
+    :param source: path to the local file or directory to be uploaded.
+    :param destinations: the repositories and the destination path in each of them.
+    :param recurse: when True, upload a directory recursively.
+    :param flatten: when True, a directory tree isn't replicated on the destinations.
+    :return: the result for each destination, in the same order.
+    """
+    source = pathlib.Path(source)
+
+    if source.is_dir():
+        file_set = util.get_files(source, recurse)
+
+        def _dst_path(destination, source_file):
+            return str(Repository._upload_dst_path(
+                source, source_file, pathlib.PurePosixPath(destination), flatten))
+    else:
+        file_set = [source]
+
+        def _dst_path(destination, source_file):
+            return posixpath.join(
+                *nexus_util.get_dst_path_and_file(str(source_file), destination))
+
+    upload_counts = [0] * len(destinations)
+    errors: List[Dict[str, BaseException]] = [{} for _ in destinations]
+
+    with progressbar(file_set) as bar:
+        for source_file in bar:
+            dst_paths = [
+                (repository, _dst_path(destination, source_file))
+                for repository, destination in destinations]
+            LOG.debug('Uploading [%s] to %s', source_file, dst_paths)
+
+            with open(source_file, 'rb') as fh:
+                results = _publish_file(
+                    fh, dst_paths, source_file, os.fstat(fh.fileno()).st_size)
+
+            for i, error in enumerate(results):
+                if error is None:
+                    upload_counts[i] += 1
+                else:
+                    LOG.warning('Error uploading %s to %s: %s', source_file,
+                                destinations[i][0].name, error)
+                    errors[i][str(source_file)] = error
+
+    return [
+        PublishResult(repository, destination, upload_count, destination_errors)
+        for (repository, destination), upload_count, destination_errors
+        in zip(destinations, upload_counts, errors)]
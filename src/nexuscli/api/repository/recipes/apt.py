@@ -1,3 +1,4 @@
+import pathlib
 from typing import Optional
 
 from nexuscli.api.repository.base_models import Repository
@@ -46,6 +47,16 @@ class AptHostedRepository(_AptRepository, HostedRepository):
 
         return repo_config
 
+    def upload_file(self, source, destination=None):
+        """
+        Upload a single ``.deb`` package to an apt repository.
+
+        :param source: path to the local file to be uploaded.
+        :param destination: NOT USED
+        :raises exception.NexusClientAPIError: unknown response from Nexus API.
+        """
+        self._post_component_file([], 'apt.asset', pathlib.Path(source).name, source)
+
 
 class AptProxyRepository(_AptRepository, ProxyRepository):
     def __init__(self, *args, **kwargs):
@@ -1,12 +1,78 @@
-from nexuscli import exception
+import logging
+import pathlib
+import re
+import warnings
+from contextlib import ExitStack
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from click import progressbar
+
+from nexuscli import exception, nexus_util
 from nexuscli.api import validations
 from nexuscli.api.repository.base_models import Repository
 from nexuscli.api.repository.base_models import HostedRepository
 from nexuscli.api.repository.base_models import ProxyRepository
 from nexuscli.api.repository.base_models import GroupRepository
+from nexuscli.api.repository.base_models import util
 
 __all__ = ['MavenGroupRepository', 'MavenHostedRepository', 'MavenProxyRepository']
 
+LOG = logging.getLogger(__name__)
+
+CHECKSUM_EXTENSIONS = ('md5', 'sha1', 'sha256', 'sha512')
+"""Nexus calculates these for every uploaded asset, so local copies aren't uploaded"""
+SNAPSHOT_SUFFIX = '-SNAPSHOT'
+
+
+class MavenAsset(NamedTuple):
+    """A file in a Maven repository layout, identified by its coordinates"""
+    group_id: str
+    artifact_id: str
+    version: str
+    extension: str
+    classifier: Optional[str] = None
+    # timestamp and build number of a timestamped snapshot, e.g.: 20200101.123456-1
+    build: Optional[str] = None
+
+    @property
+    def gav(self) -> Tuple[str, str, str]:
+        """The ``(groupId, artifactId, version)`` of the component this asset belongs to"""
+        return self.group_id, self.artifact_id, self.version
+
+
+def maven_asset(path: str) -> Optional[MavenAsset]:
+    """
+    Parses a path in the Maven 2 repository layout (as used by ``~/.m2/repository`` and by
+    Nexus) into the coordinates for the file.
+
+        >>> maven_asset('org/example/foo/1.0/foo-1.0-sources.jar')
+        >>> MavenAsset(group_id='org.example', artifact_id='foo', version='1.0',
+        >>>            extension='jar', classifier='sources')
+
+    :param path: relative path, using ``/`` as the separator.
+    :return: the coordinates or None, when the path doesn't follow the layout or is for a
+        checksum file.
+    """
+    parts = path.strip(nexus_util.REMOTE_PATH_SEPARATOR).split(nexus_util.REMOTE_PATH_SEPARATOR)
+    if len(parts) < 4:
+        return None
+    *group, artifact_id, version, filename = parts
+
+    prefixes = [re.escape(f'{artifact_id}-{version}')]
+    if version.endswith(SNAPSHOT_SUFFIX):
+        # timestamped snapshot, e.g.: foo-1.0-20200101.123456-1.jar
+        base_version = version[:-len(SNAPSHOT_SUFFIX)]
+        prefixes.append(
+            re.escape(f'{artifact_id}-{base_version}-') + r'(?P<build>\d{8}\.\d{6}-\d+)')
+
+    match = re.fullmatch(
+        rf'(?:{"|".join(prefixes)})(?:-(?P<classifier>[^.]+))?\.(?P<extension>.+)', filename)
+    if match is None or match['extension'].split('.')[-1] in CHECKSUM_EXTENSIONS:
+        return None
+
+    return MavenAsset('.'.join(group), artifact_id, version,
+                      match['extension'], match['classifier'], match.groupdict().get('build'))
+
 
 class _MavenRepository(Repository):
     """
@@ -60,6 +126,23 @@ class _MavenRepository(Repository):
     def recipe_name(self):
         return 'maven2'
 
+    def _path_search_filters(self, path_filter):
+        """The coordinates of the file at ``path_filter``, if it follows the Maven layout"""
+        asset = maven_asset(path_filter)
+        if asset is None:
+            return None
+
+        filters = {
+            'maven.groupId': asset.group_id,
+            'maven.artifactId': asset.artifact_id,
+            'maven.baseVersion': asset.version,
+            'maven.extension': asset.extension,
+        }
+        if asset.classifier is not None:
+            filters['maven.classifier'] = asset.classifier
+
+        return filters
+
 
 class MavenHostedRepository(HostedRepository, _MavenRepository):
     """
@@ -69,7 +152,122 @@ class MavenHostedRepository(HostedRepository, _MavenRepository):
 
     See :class:`HostedRepository` and :class:`MavenRepository`
     """
-    pass
+    def upload_component(self, assets: List[Tuple[MavenAsset, pathlib.Path]]) -> None:
+        """
+        Upload all assets for a component (e.g.: pom, jar, sources and javadoc for one
+        groupId, artifactId and version) in a single request.
+
+        A pom is generated by Nexus when none of the assets is a pom.
+
+        :param assets: coordinates and local path for each asset. All assets must have the
+            same ``groupId``, ``artifactId`` and ``version``.
+        :raises exception.NexusClientAPIError: unknown response from Nexus API.
+        """
+        group_id, artifact_id, version = assets[0][0].gav
+        if any(asset.gav != (group_id, artifact_id, version) for asset, _ in assets):
+            raise ValueError(f'All assets must belong to {group_id}:{artifact_id}:{version}')
+
+        fields = [
+            ('maven2.groupId', (None, group_id)),
+            ('maven2.artifactId', (None, artifact_id)),
+            ('maven2.version', (None, version)),
+        ]
+        if not any(asset.extension == 'pom' for asset, _ in assets):
+            packaging = next(
+                (a.extension for a, _ in assets if a.classifier is None), assets[0][0].extension)
+            fields += [
+                ('maven2.generate-pom', (None, 'true')),
+                ('maven2.packaging', (None, packaging)),
+            ]
+
+        with ExitStack() as stack:
+            for i, (asset, source) in enumerate(assets, start=1):
+                fh = stack.enter_context(open(source, 'rb'))
+                fields += [
+                    (f'maven2.asset{i}', (pathlib.Path(source).name, fh)),
+                    (f'maven2.asset{i}.extension', (None, asset.extension)),
+                ]
+                if asset.classifier:
+                    fields.append((f'maven2.asset{i}.classifier', (None, asset.classifier)))
+
+            self._post_component(fields)
+
+    def upload_file(self, source, destination):
+        """
+        Upload a single file to a maven repository. The Maven coordinates are taken from the
+        destination, which must follow the Maven repository layout.
+
+        :param source: path to the local file to be uploaded.
+        :param destination: path for the file in the repository; e.g.:
+            ``org/example/foo/1.0/foo-1.0.jar``. When it ends with a ``/``, the name of the
+            source file is appended to it.
+        :raises exception.NexusClientInvalidRepositoryPath: the destination doesn't follow the
+            Maven repository layout.
+        :raises exception.NexusClientAPIError: unknown response from Nexus API.
+        """
+        destination = str(destination)
+        if destination.endswith(nexus_util.REMOTE_PATH_SEPARATOR):
+            destination += pathlib.Path(source).name
+
+        asset = maven_asset(pathlib.PurePath(destination).as_posix())
+        if asset is None:
+            raise exception.NexusClientInvalidRepositoryPath(
+                f'Not a path in the Maven repository layout: {destination}')
+
+        self.upload_component([(asset, pathlib.Path(source))])
+
+    def upload_directory(self, source, destination=None, recurse=True, flatten=False, workers=1):
+        """
+        Uploads all artefacts in a local directory with the Maven repository layout, such as
+        ``~/.m2/repository``. The files for each groupId, artifactId and version are uploaded
+        as a single component, as are the files of each timestamped snapshot build; components
+        are uploaded concurrently when ``workers`` is greater than one.
+
+        Files that don't follow the layout (e.g.: ``maven-metadata.xml``, checksums) are
+        skipped.
+
+        :param source: path to local directory to be uploaded, or to a tar or
+            zip archive, which is extracted to a temporary directory first
+        :param destination: NOT USED
+        :param recurse: when True, upload directory recursively.
+        :type recurse: bool
+        :param flatten: NOT USED
+        :param workers: number of components to upload concurrently.
+        :type workers: int
+        :return: number of files uploaded
+        :rtype: int
+        """
+        source = pathlib.Path(source)
+        if source.is_file():
+            return self._upload_extracted(source, destination, recurse, flatten, workers)
+
+        components: Dict[
+            Tuple[Tuple[str, str, str], Optional[str]], List[Tuple[MavenAsset, pathlib.Path]]] = {}
+        for source_file in util.get_files(source, recurse):
+            asset = maven_asset(source_file.relative_to(source).as_posix())
+            if asset is None:
+                LOG.debug('Skipping %s: not a Maven artefact', source_file)
+                continue
+            components.setdefault((asset.gav, asset.build), []).append((asset, source_file))
+
+        expected_upload_count = sum(len(x) for x in components.values())
+        upload_count = 0
+
+        def _upload(assets):
+            LOG.debug('Uploading %s to repository=%s', ':'.join(assets[0][0].gav), self.name)
+            self.upload_component(assets)
+            return len(assets)
+
+        with self._upload_session(workers), \
+                progressbar(length=expected_upload_count) as bar:
+            for count in nexus_util.concurrent_map(_upload, components.values(), workers):
+                upload_count += count
+                bar.update(count)
+
+        if expected_upload_count != upload_count:
+            warnings.warn(f'expected {expected_upload_count} to upload but got {upload_count}')
+
+        return upload_count
 
 
 class MavenProxyRepository(_MavenRepository, ProxyRepository):
@@ -1,3 +1,5 @@
+import pathlib
+
 from nexuscli.api.repository.base_models import Repository
 from nexuscli.api.repository.base_models import GroupRepository
 from nexuscli.api.repository.base_models import HostedRepository
@@ -15,7 +17,15 @@ class NugetGroupRepository(_NugetRepository, GroupRepository):
 
 
 class NugetHostedRepository(_NugetRepository, HostedRepository):
-    pass
+    def upload_file(self, source, destination=None):
+        """
+        Upload a single ``.nupkg`` package to a nuget repository.
+
+        :param source: path to the local file to be uploaded.
+        :param destination: NOT USED
+        :raises exception.NexusClientAPIError: unknown response from Nexus API.
+        """
+        self._post_component_file([], 'nuget.asset', pathlib.Path(source).name, source)
 
 
 class NugetProxyRepository(_NugetRepository, ProxyRepository):
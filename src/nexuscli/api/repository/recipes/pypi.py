@@ -1,8 +1,18 @@
-from nexuscli import exception
+import concurrent.futures
+import os
+import warnings
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from click import progressbar
+import requests.adapters
+
+from nexuscli import exception, nexus_util
 from nexuscli.api.repository.base_models import Repository
 from nexuscli.api.repository.base_models import GroupRepository
 from nexuscli.api.repository.base_models import HostedRepository
 from nexuscli.api.repository.base_models import ProxyRepository
+from nexuscli.api.repository.base_models import util
 
 from twine.exceptions import TwineException
 import twine.package
@@ -11,6 +21,14 @@ import twine.repository
 __all__ = ['PypiHostedRepository', 'PypiProxyRepository', 'PypiGroupRepository']
 
 
+def _package_file(src_file) -> twine.package.PackageFile:
+    """
+    Reads the metadata and calculates the digests for a distribution file. This is the
+    CPU-bound part of an upload; it's a module function so it can run in a process pool.
+    """
+    return twine.package.PackageFile.from_filename(str(src_file), '')
+
+
 class _PypiRepository(Repository):
     RECIPE_NAME = 'pypi'
 
@@ -20,6 +38,61 @@ class PypiGroupRepository(_PypiRepository, GroupRepository):
 
 
 class PypiHostedRepository(_PypiRepository, HostedRepository):
+    def __init__(self, *args, **kwargs):
+        self._twine_repository: Optional[twine.repository.Repository] = None
+
+        super().__init__(*args, **kwargs)
+
+    def _new_twine_repository(self, workers: int = 1) -> twine.repository.Repository:
+        twine_repository = twine.repository.Repository(
+            repository_url=self._url + '/',
+            username=self._client.config.auth[0],
+            password=self._client.config.auth[1],
+            disable_progress_bar=True
+        )
+
+        # keep one connection per worker; the twine default pool is too small for many workers
+        if workers > requests.adapters.DEFAULT_POOLSIZE:
+            for scheme in ('http://', 'https://'):
+                adapter = twine_repository.session.get_adapter(scheme)
+                twine_repository.session.mount(scheme, requests.adapters.HTTPAdapter(
+                    pool_maxsize=workers, max_retries=adapter.max_retries))
+
+        return twine_repository
+
+    @contextmanager
+    def _upload_session(self, workers: int = 1) -> Iterator[None]:
+        """
+        Uses a single twine repository, and its HTTP session, for all uploads made in this
+        context.
+        """
+        if self._twine_repository is not None:
+            yield
+            return
+
+        self._twine_repository = self._new_twine_repository(workers)
+        try:
+            yield
+        finally:
+            self._twine_repository.close()
+            self._twine_repository = None
+
+    def _upload_package(self, twine_package: twine.package.PackageFile) -> None:
+        if self._twine_repository is None:
+            with self._upload_session():
+                return self._upload_package(twine_package)
+
+        try:
+            response = self._twine_repository.upload(twine_package)
+        except TwineException as e:
+            raise exception.NexusClientAPIError(
+                f'Uploading to {self.name}. Reason: {e}') from None
+
+        if response.status_code != 200:
+            raise exception.NexusClientAPIError(
+                f'Uploading to {self.name}. Reason: {response.reason} '
+                f'Status code: {response.status_code} Text: {response.text}')
+
     def upload_file(self, src_file, dst_dir=None, dst_file=None):
         """
         Upload a single file to a PyPI repository.
@@ -32,22 +105,62 @@ class PypiHostedRepository(_PypiRepository, HostedRepository):
         :raises exception.NexusClientAPIError: unknown response from Nexus API.
         """
         try:
-            twine_package = twine.package.PackageFile.from_filename(str(src_file), '')
-            twine_repository = twine.repository.Repository(
-                repository_url=self._url + '/',
-                username=self._client.config.auth[0],
-                password=self._client.config.auth[1],
-                disable_progress_bar=True
-            )
-            response = twine_repository.upload(twine_package)
+            twine_package = _package_file(src_file)
         except TwineException as e:
             raise exception.NexusClientAPIError(
                 f'Uploading to {self.name}. Reason: {e}') from None
 
-        if response.status_code != 200:
+        self._upload_package(twine_package)
+
+    def upload_directory(self, source, destination=None, recurse=True, flatten=False, workers=1):
+        """
+        Uploads all distributions in a directory.
+
+        Every distribution is validated, and its digests calculated, before the first upload
+        starts; with more than one worker this is done in a process pool. The uploads then
+        share a single twine session.
+
+        :param source: path to local directory to be uploaded, or to a tar or
+            zip archive of distributions, which is extracted to a temporary
+            directory first
+        :param destination: NOT USED
+        :param recurse: when True, upload directory recursively.
+        :type recurse: bool
+        :param flatten: NOT USED
+        :param workers: number of processes used for validation and of concurrent uploads.
+        :type workers: int
+        :return: number of files uploaded
+        :rtype: int
+        :raises exception.NexusClientAPIError: a file isn't a valid distribution or the upload
+            failed.
+        """
+        if os.path.isfile(source):
+            return self._upload_extracted(source, destination, recurse, flatten, workers)
+
+        file_set = util.get_files(source, recurse)
+        expected_upload_count = len(file_set)
+
+        try:
+            if workers > 1:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                    twine_packages = list(pool.map(_package_file, file_set))
+            else:
+                twine_packages = [_package_file(x) for x in file_set]
+        except TwineException as e:
             raise exception.NexusClientAPIError(
-                f'Uploading to {self.name}. Reason: {response.reason} '
-                f'Status code: {response.status_code} Text: {response.text}')
+                f'Uploading to {self.name}. Reason: {e}') from None
+
+        upload_count = 0
+        with self._upload_session(workers), \
+                progressbar(length=expected_upload_count) as bar:
+            for _ in nexus_util.concurrent_map(self._upload_package, twine_packages, workers):
+                upload_count += 1
+                bar.update(1)
+
+        if expected_upload_count != upload_count:
+            warnings.warn(f'expected {expected_upload_count} to upload but got {upload_count}')
+
+        return upload_count
 
 
 class PypiProxyRepository(_PypiRepository, ProxyRepository):
@@ -1,15 +1,28 @@
-from nexuscli import exception, nexus_util
+from nexuscli import nexus_http, nexus_util
 from nexuscli.api.repository.base_models import Repository
 from nexuscli.api.repository.base_models import GroupRepository
 from nexuscli.api.repository.base_models import HostedRepository
 from nexuscli.api.repository.base_models import ProxyRepository
-from requests_toolbelt.multipart.encoder import MultipartEncoder
+
 __all__ = ['RawHostedRepository', 'RawProxyRepository', 'RawGroupRepository']
 
 
 class _RawRepository(Repository):
     RECIPE_NAME = 'raw'
 
+    def _path_search_filters(self, path_filter):
+        """Raw components are named after the path of their only asset"""
+        if path_filter.endswith(nexus_util.REMOTE_PATH_SEPARATOR):
+            return None
+        return {'name': path_filter.lstrip(nexus_util.REMOTE_PATH_SEPARATOR)}
+
+    def delete_components(self, repository_path, workers=1, filters=None):
+        """
+        Raw repositories have one component per asset, so this is the same
+        as :meth:`bulk_delete`.
+        """
+        return self.bulk_delete(repository_path, workers, filters)
+
 
 class RawGroupRepository(_RawRepository, GroupRepository):
     pass
@@ -28,22 +41,17 @@ class RawHostedRepository(_RawRepository, HostedRepository):
         """
         destination, dst_file = nexus_util.get_dst_path_and_file(source, destination)
 
-        params = {'repository': self.name}
-        data = MultipartEncoder(
-            fields={
-                'raw.directory': (None, destination),
-                'raw.asset1': (str(source), open(source, 'rb')),
-                'raw.asset1.filename': (None, dst_file),
-            }
-        )
-        headers = {'Content-Type': data.content_type}
-        response = self._client.post(
-            'components', data=data, params=params, headers=headers, stream=True)
-
-        if response.status_code != 204:
-            raise exception.NexusClientAPIError(
-                f'Uploading to {self.name}. Reason: {response.reason} '
-                f'Status code: {response.status_code} Text: {response.text}')
+        self._post_component_file(
+            [('raw.directory', destination), ('raw.asset1.filename', dst_file)],
+            'raw.asset1', dst_file, source)
+
+    def _upload_chunks(self, chunks, destination, size=None):
+        dst_path, dst_file = self._upload_stream_dst_path_and_file(destination)
+        data, content_type = nexus_http.multipart_body(
+            [('raw.directory', dst_path), ('raw.asset1.filename', dst_file)],
+            'raw.asset1', dst_file, chunks, size)
+
+        self._post_component_body(data, content_type)
 
 
 class RawProxyRepository(_RawRepository, ProxyRepository):
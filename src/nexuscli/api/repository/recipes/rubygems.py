@@ -1,3 +1,5 @@
+import pathlib
+
 from nexuscli.api.repository.base_models import Repository
 from nexuscli.api.repository.base_models import GroupRepository
 from nexuscli.api.repository.base_models import HostedRepository
@@ -15,7 +17,15 @@ class RubygemsGroupRepository(_RubygemsRepository, GroupRepository):
 
 
 class RubygemsHostedRepository(_RubygemsRepository, HostedRepository):
-    pass
+    def upload_file(self, source, destination=None):
+        """
+        Upload a single ``.gem`` file to a rubygems repository.
+
+        :param source: path to the local file to be uploaded.
+        :param destination: NOT USED
+        :raises exception.NexusClientAPIError: unknown response from Nexus API.
+        """
+        self._post_component_file([], 'rubygems.asset', pathlib.Path(source).name, source)
 
 
 class RubygemsProxyRepository(_RubygemsRepository, ProxyRepository):
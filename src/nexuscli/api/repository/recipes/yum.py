@@ -1,6 +1,6 @@
 from typing import Optional
 
-from nexuscli import exception, nexus_util
+from nexuscli import exception, nexus_http, nexus_util
 from nexuscli.api.repository.base_models import Repository
 from nexuscli.api.repository.base_models import HostedRepository
 from nexuscli.api.repository.base_models import ProxyRepository
@@ -55,9 +55,20 @@ class YumHostedRepository(HostedRepository, _YumRepository):
         repository_path = nexus_util.REMOTE_PATH_SEPARATOR.join(
             ['repository', self.name, dst_path, dst_file])
 
-        with open(source, 'rb') as fh:
-            response = self._client.put(
-                repository_path, data=fh, stream=True, service_url=self._client.config.url)
+        with nexus_http.mapped_file(source) as contents:
+            self._put_file(repository_path, contents)
+
+    def _upload_chunks(self, chunks, destination, size=None):
+        dst_path, dst_file = self._upload_stream_dst_path_and_file(destination)
+
+        repository_path = nexus_util.REMOTE_PATH_SEPARATOR.join(
+            ['repository', self.name, dst_path, dst_file])
+
+        self._put_file(repository_path, nexus_http.StreamingBody(chunks, size))
+
+    def _put_file(self, repository_path, data):
+        response = self._client.put(
+            repository_path, data=data, stream=True, service_url=self._client.config.url)
 
         if response.status_code != 200:
             raise exception.NexusClientAPIError(
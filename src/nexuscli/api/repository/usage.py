@@ -0,0 +1,63 @@
+"""
+Storage usage of the artefacts in a repository, aggregated by directory.
+"""
+import heapq
+from typing import Dict, Iterable, List, NamedTuple
+
+from nexuscli import nexus_util
+
+
+class DirectoryUsage(NamedTuple):
+    """The storage used by the artefacts under a directory, including its subdirectories"""
+    path: str
+    """The directory, ending in ``/``"""
+    size: int
+    """Total size of the artefacts, in bytes"""
+    file_count: int
+
+
+def directory_usage(
+        records: Iterable[Dict], base: str = '', depth: int = 1) -> List[DirectoryUsage]:
+    """
+    Adds up the size of the artefacts under each directory, in a single pass over a listing.
+
+    Only the totals for each directory are kept, so memory use depends on the number of
+    directories up to ``depth``, not on the number of artefacts.
+
+    :param records: artefacts as returned by
+        :meth:`~nexuscli.api.repository.base_models.Repository.list_raw`.
+    :param base: only artefacts under this directory are counted; it must be empty or end
+        with ``/``.
+    :param depth: number of directory levels under ``base`` to report; 0 for ``base`` only.
+    :return: the usage of ``base`` and of each directory under it, up to ``depth``, ordered
+        by path.
+    """
+    separator = nexus_util.REMOTE_PATH_SEPARATOR
+    base = base.lstrip(separator)
+    totals: Dict[str, List[int]] = {base: [0, 0]}
+
+    for record in records:
+        path = record['path'].lstrip(separator)
+        if not path.startswith(base):
+            continue
+
+        size = record.get('fileSize') or 0
+        directory = base
+        directories = path[len(base):].split(separator)[:-1]
+        for name in [None] + directories[:depth]:
+            if name is not None:
+                directory = f'{directory}{name}{separator}'
+            total = totals.setdefault(directory, [0, 0])
+            total[0] += size
+            total[1] += 1
+
+    return [DirectoryUsage(path, size, count) for path, (size, count) in sorted(totals.items())]
+
+
+def heaviest(usage: Iterable[DirectoryUsage], count: int) -> List[DirectoryUsage]:
+    """
+    :param usage: as returned by :func:`directory_usage`.
+    :param count: maximum number of directories to return.
+    :return: the directories using the most storage, heaviest first.
+    """
+    return heapq.nlargest(count, usage, key=lambda x: (x.size, x.file_count))
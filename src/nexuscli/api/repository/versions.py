@@ -0,0 +1,156 @@
+"""
+Ordering of component versions, following the rules of Maven's ``ComparableVersion``. These
+also order `semver <https://semver.org>`_ versions, including pre-releases, and the common
+PEP 440 suffixes (``dev``, ``a``, ``b``, ``rc``, ``post``) correctly.
+"""
+import functools
+import re
+from typing import List, Optional, Union
+
+_QUALIFIERS = ['dev', 'alpha', 'beta', 'milestone', 'rc', 'snapshot', '', 'sp']
+"""Known qualifiers, in ascending order; the empty string is a release"""
+
+_QUALIFIER_ALIASES = {
+    'a': 'alpha', 'b': 'beta', 'm': 'milestone', 'c': 'rc', 'cr': 'rc', 'pre': 'rc',
+    'preview': 'rc', 'ga': '', 'final': '', 'release': '', 'post': 'sp',
+}
+
+_TOKEN_RE = re.compile(r'(?P<number>\d+)|(?P<qualifier>[a-z]+)|(?P<dash>-)|[^a-z\d-]')
+
+Item = Union[int, str, List['Item']]
+"""A number, a qualifier or, after a ``-`` or a change between digits and letters, a sub-list"""
+
+
+def _qualifier_key(qualifier: str):
+    qualifier = _QUALIFIER_ALIASES.get(qualifier, qualifier)
+    try:
+        return _QUALIFIERS.index(qualifier), ''
+    except ValueError:
+        # unknown qualifiers sort after the known ones, alphabetically
+        return len(_QUALIFIERS), qualifier
+
+
+def _cmp(a, b) -> int:
+    return (a > b) - (a < b)
+
+
+def _is_null(item: Item) -> bool:
+    """Whether the item is the same as a missing one: 0, a release qualifier or an empty list"""
+    if isinstance(item, list):
+        return not item
+    if isinstance(item, int):
+        return item == 0
+    return _qualifier_key(item) == _qualifier_key('')
+
+
+def _normalize(items: List[Item]) -> None:
+    """Trims trailing zeros and release qualifiers, up to the last number or qualifier"""
+    for i in reversed(range(len(items))):
+        if _is_null(items[i]):
+            del items[i]
+        elif not isinstance(items[i], list):
+            break
+
+
+def _compare_items(a: Optional[Item], b: Optional[Item]) -> int:
+    """Compares two items of a version; None stands for a missing item"""
+    if a is None and b is None:
+        return 0
+    if a is None:
+        return -_compare_items(b, a)
+
+    if isinstance(a, list):
+        if b is None:
+            return _compare_items(a[0], None) if a else 0
+        if isinstance(b, list):
+            for i in range(max(len(a), len(b))):
+                result = _compare_items(
+                    a[i] if i < len(a) else None, b[i] if i < len(b) else None)
+                if result:
+                    return result
+            return 0
+        return -1 if isinstance(b, int) else 1  # numbers > lists > qualifiers
+
+    if isinstance(a, int):
+        if b is None:
+            return _cmp(a, 0)
+        if isinstance(b, int):
+            return _cmp(a, b)
+        return 1  # numbers are greater than qualifiers and lists: 1.1 > 1-sp and 1.1 > 1-1
+
+    if b is None:
+        return _cmp(_qualifier_key(a), _qualifier_key(''))
+    if isinstance(b, str):
+        return _cmp(_qualifier_key(a), _qualifier_key(b))
+    return -1
+
+
+def _hashable(item: Item):
+    if isinstance(item, list):
+        return tuple(_hashable(x) for x in item)
+    return item if isinstance(item, int) else _qualifier_key(item)
+
+
+@functools.total_ordering
+class Version:
+    """
+    A component version that can be compared with others, e.g. to sort a list of versions with
+    ``sorted(versions, key=Version)``.
+
+    :param version: the version string, such as ``1.2.3``, ``1.0-SNAPSHOT`` or
+        ``2.0.0-rc.1+build.5``.
+    """
+    def __init__(self, version: str):
+        self.version = version
+        self._items = self._parse(version)
+
+    @staticmethod
+    def _parse(version: str) -> List[Item]:
+        # semver build metadata doesn't take part in the ordering
+        version = version.lower().split('+')[0]
+        items: List[Item] = []
+        lists = [items]
+        previous = None
+
+        for token in _TOKEN_RE.finditer(version):
+            # as in Maven, `-` and a change between digits and letters start a sub-list, so
+            # 1.0-20200102.000000-1 < 1.0.1-20200101.000000-1; so does a qualifier after a
+            # dot, for PEP 440 versions such as 1.0.dev1 and 1.0.post2
+            if token['dash'] or (token['number'] and previous == 'qualifier') or (
+                    token['qualifier'] and previous in ('number', 'dot')):
+                lists.append([])
+                lists[-2].append(lists[-1])
+
+            if token['number']:
+                lists[-1].append(int(token['number']))
+                previous = 'number'
+            elif token['qualifier']:
+                lists[-1].append(token['qualifier'])
+                previous = 'qualifier'
+            else:
+                previous = 'dash' if token['dash'] else 'dot'
+
+        # trailing zeros and release qualifiers don't change a version: 1.0.0 == 1 == 1-ga
+        for sub_list in reversed(lists):
+            _normalize(sub_list)
+
+        return items
+
+    def _compare(self, other: 'Version') -> int:
+        return _compare_items(self._items, other._items)
+
+    def __eq__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self._compare(other) == 0
+
+    def __lt__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self._compare(other) < 0
+
+    def __hash__(self):
+        return hash(_hashable(self._items))
+
+    def __repr__(self):
+        return f'Version({self.version!r})'
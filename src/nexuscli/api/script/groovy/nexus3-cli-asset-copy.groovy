@@ -0,0 +1,182 @@
+import groovy.json.JsonOutput
+import groovy.json.JsonSlurper
+import java.util.function.Supplier
+import org.sonatype.nexus.common.hash.HashAlgorithm
+import org.sonatype.nexus.repository.storage.StorageFacet
+
+// Copies, or moves, one batch of assets from a file or directory in a repository to a path in
+// the same or another repository on this server. Arguments, as JSON:
+//   {"source": "name", "destination": "name", "path": "dir/", "destinationPath": "other/",
+//    "move": false, "batchSize": 1000, "after": null}
+// "path" is a file or, if no asset has that exact name, a directory; an empty path is the
+// whole repository. Files are copied under "destinationPath" as `cp -r` would; a single file
+// is renamed when "destinationPath" doesn't end with "/".
+// Returns, as JSON: {"copied": n, "skipped": n, "more": true|false, "after": "name"}; when
+// "more" is true, the script should be run again with "after" set to the returned value.
+//
+// Blobs are never transferred through the client; moves within a blob store only rewrite the
+// asset records. Format-specific metadata, such as maven-metadata.xml, isn't rebuilt.
+
+def parsed_args = new JsonSlurper().parseText(args)
+def repositories = [parsed_args.source, parsed_args.destination].collect { name ->
+    def repo = repository.repositoryManager.get(name)
+    if (repo == null) {
+        throw new Exception("Repository not found: ${name}")
+    }
+    repo
+}
+def srcRepo = repositories[0]
+def dstRepo = repositories[1]
+
+int batchSize = parsed_args.batchSize ?: 1000
+boolean move = parsed_args.move ?: false
+String path = parsed_args.path ?: ''
+String destinationPath = parsed_args.destinationPath ?: ''
+def srcBlobStore = srcRepo.facet(StorageFacet).blobStore()
+def dstBlobStoreName = dstRepo.configuration.attributes('storage').get('blobStoreName')
+def hashAlgorithms = [HashAlgorithm.SHA1, HashAlgorithm.MD5]
+
+int copied = 0
+int skipped = 0
+boolean more = false
+String after = parsed_args.after
+def movedBlobIds = []
+
+// the same component database holds every repository, so one transaction can read the source
+// and write the destination
+def tx = dstRepo.facet(StorageFacet).txSupplier().get()
+try {
+    tx.begin()
+    def srcBucket = tx.findBucket(srcRepo)
+    def dstBucket = tx.findBucket(dstRepo)
+
+    String prefix = path
+    String replacement = destinationPath
+    def assets
+    def file = null
+    if (path && !path.endsWith('/')) {
+        file = tx.findAssetWithProperty('name', path, srcBucket)
+    }
+    if (file != null) {
+        if (!destinationPath || destinationPath.endsWith('/')) {
+            replacement = destinationPath + path.substring(path.lastIndexOf('/') + 1)
+        }
+        assets = after == null ? [file] : []
+    } else {
+        if (prefix && !prefix.endsWith('/')) {
+            prefix += '/'
+        }
+        if (replacement && !replacement.endsWith('/')) {
+            replacement += '/'
+        }
+        // ranges rather than LIKE, which would treat _ and % in the prefix as wildcards
+        def where = ['name >= :lower', 'name < :upper']
+        def params = [lower: prefix, upper: prefix + '\uffff']
+        if (after != null) {
+            where << 'name > :after'
+            params.after = after
+        }
+        assets = tx.findAssets(
+            where.join(' AND '), params, [srcRepo], "ORDER BY name LIMIT ${batchSize + 1}")
+    }
+
+    assets.each { srcAsset ->
+        if (copied + skipped == batchSize) {
+            more = true
+            return
+        }
+        after = srcAsset.name()
+        String name = replacement + srcAsset.name().substring(prefix.length())
+        def srcBlobRef = srcAsset.requireBlobRef()
+        def existing = tx.findAssetWithProperty('name', name, dstBucket)
+        boolean upToDate = existing != null &&
+            existing.getChecksum(HashAlgorithm.SHA1) == srcAsset.getChecksum(HashAlgorithm.SHA1)
+        // a move within a blob store hands the blob over to the new asset, without reading it
+        boolean reuseBlob = move && !upToDate && srcBlobRef.store == dstBlobStoreName
+
+        if (upToDate) {
+            skipped++
+        } else {
+            if (existing != null) {
+                tx.deleteAsset(existing)
+            }
+
+            def component = null
+            if (srcAsset.componentId() != null) {
+                def srcComponent = tx.findComponentInBucket(srcAsset.componentId(), srcBucket)
+                def coordinates = [
+                    group: srcComponent.group(), name: srcComponent.name(),
+                    version: srcComponent.version()]
+                if (dstRepo.format.value == 'raw') {
+                    // raw components are named after their asset, grouped by directory
+                    int slash = name.lastIndexOf('/')
+                    coordinates = [
+                        group: '/' + (slash < 0 ? '' : name.substring(0, slash)),
+                        name: name, version: null]
+                }
+                def conditions = coordinates.collect { k, v ->
+                    v == null ? "${k} IS NULL" : "${k} = :${k}"
+                }
+                component = tx.findComponents(
+                    conditions.join(' AND '), coordinates.findAll { k, v -> v != null }, [dstRepo],
+                    'LIMIT 1').find()
+                if (component == null) {
+                    component = tx.createComponent(dstBucket, dstRepo.format)
+                        .group(coordinates.group).name(coordinates.name)
+                        .version(coordinates.version)
+                    srcComponent.attributes().backing().each { k, v ->
+                        component.attributes().backing().put(
+                            k, v instanceof Map ? new HashMap(v) : v)
+                    }
+                    tx.saveComponent(component)
+                }
+            }
+
+            def asset = component != null ? tx.createAsset(dstBucket, component) :
+                tx.createAsset(dstBucket, dstRepo.format)
+            asset.name(name)
+            srcAsset.attributes().backing().each { k, v ->
+                asset.attributes().backing().put(k, v instanceof Map ? new HashMap(v) : v)
+            }
+
+            if (reuseBlob) {
+                asset.blobRef(srcBlobRef)
+                asset.size(srcAsset.size())
+                asset.contentType(srcAsset.contentType())
+            } else {
+                def blob = srcBlobStore.get(srcBlobRef.blobId)
+                tx.setBlob(asset, name, { blob.inputStream } as Supplier, hashAlgorithms, null,
+                    srcAsset.contentType(), true)
+            }
+            tx.saveAsset(asset)
+            copied++
+        }
+
+        if (move) {
+            tx.deleteAsset(srcAsset, false)
+            if (!reuseBlob) {
+                movedBlobIds << srcBlobRef.blobId
+            }
+            if (srcAsset.componentId() != null) {
+                def srcComponent = tx.findComponentInBucket(srcAsset.componentId(), srcBucket)
+                if (srcComponent != null && !tx.browseAssets(srcComponent).iterator().hasNext()) {
+                    tx.deleteComponent(srcComponent, false)
+                }
+            }
+        }
+    }
+
+    tx.commit()
+}
+finally {
+    tx.close()
+}
+
+// only once the new assets are committed
+movedBlobIds.each { blobId ->
+    srcBlobStore.delete(blobId, "Moved to ${dstRepo.name}")
+}
+
+log.info("${move ? 'Moved' : 'Copied'} ${copied} assets from ${srcRepo.name} to " +
+    "${dstRepo.name}; ${skipped} already there")
+return JsonOutput.toJson([copied: copied, skipped: skipped, more: more, after: after])
@@ -0,0 +1,83 @@
+import groovy.json.JsonOutput
+import groovy.json.JsonSlurper
+import org.sonatype.nexus.common.entity.DetachedEntityId
+import org.sonatype.nexus.common.entity.EntityHelper
+import org.sonatype.nexus.repository.rest.api.RepositoryItemIDXO
+import org.sonatype.nexus.repository.storage.ComponentMaintenance
+import org.sonatype.nexus.repository.storage.StorageFacet
+
+// Deletes one batch of assets from a repository, selected either by path or by the asset ids
+// given by the REST API. Arguments, as JSON:
+//   {"repository": "name", "path": "dir/", "batchSize": 1000}
+//   {"repository": "name", "ids": ["id", ...]}
+// "path" is a directory when it ends with "/"; otherwise, the file with that name and the files
+// under the directory with that name. An empty path is the whole repository.
+// Returns, as JSON: {"deleted": n, "notFound": n, "more": true|false}; "more" is true when
+// there may be more assets under the path, so the script should be run again.
+
+def parsed_args = new JsonSlurper().parseText(args)
+def repo = repository.repositoryManager.get(parsed_args.repository)
+if (repo == null) {
+    throw new Exception("Repository not found: ${parsed_args.repository}")
+}
+
+int batchSize = parsed_args.batchSize ?: 1000
+def maintenance = repo.facet(ComponentMaintenance)
+def entityIds = []
+int notFound = 0
+boolean more = false
+
+def tx = repo.facet(StorageFacet).txSupplier().get()
+try {
+    tx.begin()
+    def bucket = tx.findBucket(repo)
+
+    if (parsed_args.ids != null) {
+        parsed_args.ids.each { id ->
+            def itemId = RepositoryItemIDXO.fromString(id)
+            def asset = itemId.repositoryId == repo.name ?
+                tx.findAsset(new DetachedEntityId(itemId.value), bucket) : null
+            if (asset == null) {
+                notFound++
+            } else {
+                entityIds << EntityHelper.id(asset)
+            }
+        }
+    } else {
+        String path = parsed_args.path ?: ''
+        String where = null
+        def params = [:]
+        if (path) {
+            // ranges rather than LIKE, which would treat _ and % in the path as wildcards; the
+            // range starts after a separator so that "1.0" doesn't match "1.0.1/"
+            String directory = path.endsWith('/') ? path : path + '/'
+            where = 'name >= :lower AND name < :upper'
+            params = [lower: directory, upper: directory + '\uffff']
+            if (!path.endsWith('/')) {
+                where = "name = :path OR (${where})"
+                params.path = path
+            }
+        }
+        tx.findAssets(where, params, [repo], "LIMIT ${batchSize + 1}").each { asset ->
+            if (entityIds.size() < batchSize) {
+                entityIds << EntityHelper.id(asset)
+            } else {
+                more = true
+            }
+        }
+    }
+}
+finally {
+    tx.close()
+}
+
+int deleted = 0
+entityIds.each { entityId ->
+    // as the REST API does, so format-specific metadata and empty components are cleaned up
+    def paths = maintenance.deleteAsset(entityId)
+    log.debug("Deleted ${paths}")
+    deleted++
+}
+
+log.info("Deleted ${deleted} assets from ${repo.name}; ${notFound} not found")
+return JsonOutput.toJson([deleted: deleted, notFound: notFound, more: more])
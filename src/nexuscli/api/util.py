@@ -2,7 +2,7 @@ import functools
 import json
 import pathlib
 import warnings
-from typing import Any, Callable, List, TypeVar, Type, Union, cast
+from typing import Any, Callable, Dict, Iterator, List, TypeVar, Type, Union, cast
 
 import requests
 import semver
@@ -86,3 +86,47 @@ def validate_response(response: requests.Response,
         except (IndexError, KeyError, TypeError, json.JSONDecodeError):
             pass
         raise exc_class(message)
+
+
+def get_paginated(http, endpoint: str, **request_kwargs) -> Iterator[Dict]:
+    """
+    Performs a GET request using the given args and kwargs. If the response
+    is paginated, the method will repeat the request, manipulating the
+    `params` keyword argument each time in order to receive all pages of
+    the response.
+
+    Items in the responses are sent in "batches": when all elements of a
+    response have been yielded, a new request is made and the process
+    repeated.
+
+    :param http: the client instance used to make the requests.
+    :param endpoint: the API endpoint, e.g. ``search/assets``.
+    :param request_kwargs: passed verbatim to the _request() method, except
+        for the argument needed to paginate requests.
+    :return: a generator that yields on response item at a time.
+    """
+    response = http.request('get', endpoint, **request_kwargs)
+    if response.status_code == 404:
+        raise exception.NexusClientAPIError(response.reason)
+
+    try:
+        content = response.json()
+    except json.decoder.JSONDecodeError:
+        raise exception.NexusClientAPIError(response.content)
+
+    while True:
+        for item in content.get('items'):
+            yield item
+
+        continuation_token = content.get('continuationToken')
+        if continuation_token is None:
+            break
+
+        request_kwargs['params'].update(
+            {'continuationToken': continuation_token})
+        response = http.request('get', endpoint, **request_kwargs)
+
+        try:
+            content = response.json()
+        except json.decoder.JSONDecodeError:
+            raise exception.NexusClientAPIError(response.content)
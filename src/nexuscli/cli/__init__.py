@@ -7,8 +7,8 @@ from nexuscli.api.repository import collection as repository_collection
 from nexuscli.api.repository import model as repository_model
 from nexuscli.cli import (
     repository_options, root_commands, util, subcommand_blobstore, subcommand_repository,
-    subcommand_cleanup_policy, subcommand_realm, subcommand_role, subcommand_script, subcommand_task,
-    blobstore_options)
+    subcommand_cleanup_policy, subcommand_index, subcommand_realm, subcommand_role,
+    subcommand_script, subcommand_task, blobstore_options)
 from nexuscli.cli.constants import ENV_VAR_PREFIX
 
 PACKAGE_VERSION = pkg_resources.get_distribution('nexus3-cli').version
@@ -47,34 +47,167 @@ def login(**kwargs):
 
 @nexus_cli.command(name='list', aliases=['ls'])
 @click.argument('repository_path')
-@util.with_nexus_client
-def list_(ctx: click.Context, repository_path):
+@click.option('--use-index/--no-use-index', default=False,
+              help='List from the local index (see `nexus3 index`) instead of Nexus')
+@click.option('--depth', '-d', type=click.IntRange(min=1),
+              help='Only list this many directory levels, one request per directory, '
+                   'instead of every file in the subtree')
+@util.add_options(repository_options.SEARCH)
+@util.add_options(repository_options.PATHS)
+@util.with_nexus_client
+def list_(ctx: click.Context, repository_path, use_index, depth, **kwargs):
     """
     List all files within REPOSITORY_PATH.
 
-    REPOSITORY_PATH must start with a repository name.
+    REPOSITORY_PATH must start with a repository name. With --use-index, it
+    may be a glob. With --depth, directories are listed too, ending with `/`.
+    """
+    filters = util.search_filters(kwargs)
+    match = util.path_matcher(kwargs)
+    if depth is not None and (use_index or filters or match):
+        raise click.UsageError(
+            '--depth can\'t be used with --use-index, search filters or path patterns')
+
+    root_commands.cmd_list(
+        ctx.obj, repository_path, use_index=use_index, filters=filters, depth=depth,
+        match=match)
+
+
+@nexus_cli.command()
+@click.argument('pattern')
+@click.option('--repos', '-r', default='*', show_default=True,
+              help='Only search the repositories with names matching this glob')
+@click.option('--limit', '-l', type=click.IntRange(min=1), help='Stop after this many files')
+@click.option('--workers', '-w', default=8, show_default=True, type=click.IntRange(min=1),
+              help='Number of repositories to search concurrently')
+@util.with_nexus_client
+def find(ctx: click.Context, **kwargs):
+    """
+    Find the files matching PATTERN in every repository.
+
+    PATTERN is a glob matching the whole path of a file, such as '*/foo-1.0.jar'.
     """
-    root_commands.cmd_list(ctx.obj, repository_path)
+    root_commands.cmd_find(ctx.obj, **kwargs)
+
+
+@nexus_cli.command()
+@click.argument('file', required=False, type=click.Path(exists=True, dir_okay=False))
+@click.option('--sha1', help='Look for this SHA-1 checksum instead of the one of FILE')
+@click.option('--repos', '-r', default='*', show_default=True,
+              help='Only search the repositories with names matching this glob')
+@click.option('--limit', '-l', type=click.IntRange(min=1), help='Stop after this many files')
+@click.option('--workers', '-w', default=8, show_default=True, type=click.IntRange(min=1),
+              help='Number of repositories to search concurrently')
+@util.with_nexus_client
+def locate(ctx: click.Context, file, sha1, **kwargs):
+    """
+    Find the files with the same content as the local FILE in every
+    repository, by SHA-1 checksum.
+    """
+    if (file is None) == (sha1 is None):
+        raise click.UsageError('Give exactly one of FILE or --sha1')
+
+    root_commands.cmd_locate(ctx.obj, sha1=sha1, local_path=file, **kwargs)
 
 
 @nexus_cli.command()
 @click.argument('repository_path')
+@click.option('--depth', '-d', default=1, show_default=True, type=click.IntRange(min=0),
+              help='Number of directory levels to report')
+@click.option('--top', '-n', default=20, show_default=True, type=click.IntRange(min=1),
+              help='Number of directories to show')
+@click.option('--json/--no-json', default=False, help='Print output as json')
+@click.option('--use-index/--no-use-index', default=False,
+              help='List from the local index (see `nexus3 index`) instead of Nexus')
 @util.with_nexus_client
-def delete(ctx: click.Context, repository_path):
+def du(ctx: click.Context, **kwargs):
+    """
+    Show the directories within REPOSITORY_PATH using the most storage.
+
+    REPOSITORY_PATH must start with a repository name.
+    """
+    root_commands.cmd_du(ctx.obj, **kwargs)
+
+
+@nexus_cli.command()
+@click.argument('first')
+@click.argument('second')
+@click.option('--workers', '-w', default=4, show_default=True, type=click.IntRange(min=1),
+              help='Number of files to compare concurrently')
+@click.option('--json/--no-json', default=False, help='Print output as json lines')
+@click.option('--use-index/--no-use-index', default=False,
+              help='List from the local index (see `nexus3 index`) instead of Nexus')
+@util.with_nexus_client
+def diff(ctx: click.Context, **kwargs):
+    """
+    Show the files added, removed or changed from FIRST to SECOND.
+
+    FIRST and SECOND are each a local directory or a REPOSITORY_PATH starting
+    with a repository name. Files only in FIRST are shown with '-', files only
+    in SECOND with '+' and files with different contents with '~'.
+    """
+    root_commands.cmd_diff(ctx.obj, **kwargs)
+
+
+@nexus_cli.command()
+@click.argument('repository_path')
+@click.option('--workers', '-w', default=1, show_default=True, type=click.IntRange(min=1),
+              help='Number of files to delete concurrently')
+@click.option('--components/--no-components', default=False,
+              help='Delete whole components (e.g. a Maven version) with one request each')
+@click.option('--server-side/--client-side', default=False,
+              help='Delete inside Nexus, in batches, with a groovy script')
+@util.add_options(repository_options.SEARCH)
+@util.add_options(repository_options.PATHS)
+@util.with_nexus_client
+def delete(ctx: click.Context, repository_path, workers, components, server_side, **kwargs):
     """
     Recursively delete all files under REPOSITORY_PATH.
 
     REPOSITORY_PATH must start with a repository name.
     """
-    root_commands.cmd_delete(ctx.obj, repository_path)
+    root_commands.cmd_delete(
+        ctx.obj, repository_path, workers=workers, components=components,
+        server_side=server_side, filters=util.search_filters(kwargs),
+        match=util.path_matcher(kwargs))
+
+
+@nexus_cli.command()
+@click.argument('repository_name')
+@click.option('--keep-last', type=click.IntRange(min=0),
+              help='Number of newest versions to keep for each artefact')
+@click.option('--older-than', type=click.IntRange(min=0),
+              help='Only delete versions last modified more than this many days ago')
+@click.option('--match', help='Only delete versions with a group:name:version matching this '
+                              'regular expression')
+@click.option('--dry-run/--no-dry-run', default=False,
+              help='Print what would be deleted without deleting it')
+@click.option('--workers', '-w', default=1, show_default=True, type=click.IntRange(min=1),
+              help='Number of components to delete concurrently')
+@util.with_nexus_client
+def prune(ctx: click.Context, **kwargs):
+    """
+    Delete old versions of the components in REPOSITORY_NAME.
+
+    At least one of --keep-last and --older-than is required. When both are
+    given, only versions matching both rules are deleted.
+    """
+    if kwargs['keep_last'] is None and kwargs['older_than'] is None:
+        raise click.UsageError('At least one of --keep-last and --older-than is required')
+
+    root_commands.cmd_prune(ctx.obj, **kwargs)
 
 
 @nexus_cli.command()
 # TODO: use Path for src argument
 @click.argument('src')
-@click.argument('dst')
+@click.argument('dst', nargs=-1, required=True)
 @click.option('--flatten/--no-flatten', default=False, help='Flatten DST directory structure')
 @click.option('--recurse/--no-recurse', default=True, help='Process all SRC subdirectories')
+@click.option('--workers', '-w', default=1, show_default=True, type=click.IntRange(min=1),
+              help='Number of files to upload concurrently')
+@click.option('--extract/--no-extract', default=False,
+              help='Upload the files inside a tar or zip SRC instead of SRC itself')
 @util.with_nexus_client
 def upload(ctx: click.Context, **kwargs):
     """
@@ -83,16 +216,68 @@ def upload(ctx: click.Context, **kwargs):
 
     DEST must start with a repository name and optionally be followed by the
     path where SRC is to be uploaded to.
+
+    When SRC is `-`, standard input is uploaded; DST must then include the
+    file name.
+
+    When more than one DST is given, each file is read once and uploaded to
+    all of them concurrently.
     """
     root_commands.cmd_upload(ctx.obj, **kwargs)
 
 
+@nexus_cli.command()
+@click.argument('src')
+@click.argument('dst')
+@click.option('--workers', '-w', default=4, show_default=True, type=click.IntRange(min=1),
+              help='Number of files to copy concurrently')
+@click.option('--dst-config', type=click.Path(exists=True, dir_okay=False),
+              help='Configuration file, as saved by `nexus3 login`, for the Nexus '
+                   'server of DST; defaults to the same server as SRC')
+@click.option('--server-side/--client-side', default=False,
+              help='Copy inside Nexus using a groovy script, without transferring any '
+                   'file contents; DST must be on the same server')
+@util.with_nexus_client
+def copy(ctx: click.Context, **kwargs):
+    """
+    Copy remote SRC to remote DST without downloading to local disk. Files
+    already in DST with the same checksum are skipped.
+
+    SRC and DST must start with a repository name. If SRC ends with a `/`,
+    it's copied recursively into the DST directory.
+    """
+    if kwargs['server_side'] and kwargs['dst_config'] is not None:
+        raise click.UsageError('--server-side copies within one server; drop --dst-config')
+
+    root_commands.cmd_copy(ctx.obj, **kwargs)
+
+
+@nexus_cli.command(aliases=['mv'])
+@click.argument('src')
+@click.argument('dst')
+@util.with_nexus_client
+def move(ctx: click.Context, **kwargs):
+    """
+    Move remote SRC to remote DST inside Nexus, using a groovy script. Within
+    a blob store, only the asset records are changed.
+
+    SRC and DST must start with a repository name and be on the same server.
+    If SRC ends with a `/`, it's moved recursively into the DST directory.
+    """
+    root_commands.cmd_move(ctx.obj, **kwargs)
+
+
 @nexus_cli.command()
 @click.argument('src')
 @click.argument('dst')
 @click.option('--flatten/--no-flatten', default=False, help='Flatten DEST directory structure')
 @click.option('--cache/--no-cache', default=True,
               help='Do not download if a local copy is already up-to-date')
+@click.option('--latest', type=click.IntRange(min=1), is_flag=False, flag_value=1,
+              help='Only download the newest N versions (default: 1) of the components '
+                   'in SRC; use the search filters to select a single component')
+@util.add_options(repository_options.SEARCH)
+@util.add_options(repository_options.PATHS)
 @util.with_nexus_client
 def download(ctx: click.Context, **kwargs):
     """
@@ -101,8 +286,13 @@ def download(ctx: click.Context, **kwargs):
 
     SRC must start with a repository name and optionally be followed by a path
     to be downloaded.
+
+    --latest takes an optional value, so give it after SRC and DEST, or give
+    N: `nexus3 download --latest 1 SRC DEST`.
     """
-    root_commands.cmd_download(ctx.obj, **kwargs)
+    filters = util.search_filters(kwargs)
+    match = util.path_matcher(kwargs)
+    root_commands.cmd_download(ctx.obj, filters=filters, match=match, **kwargs)
 
 
 #############################################################################
@@ -413,6 +603,60 @@ def cleanup_policy_show(ctx: click.Context, policy_name):
     subcommand_cleanup_policy.cmd_show(ctx.obj, policy_name)
 
 
+@cleanup_policy.command(name='simulate')
+@click.argument('policy_name')
+@click.argument('repository_name')
+@click.option('--samples', default=10, show_default=True, type=click.IntRange(min=0),
+              help='Number of matching files to show')
+@util.with_nexus_client
+def cleanup_policy_simulate(ctx: click.Context, **kwargs):
+    """
+    Show what POLICY_NAME would delete from REPOSITORY_NAME, without deleting anything.
+    """
+    subcommand_cleanup_policy.cmd_simulate(ctx.obj, **kwargs)
+
+
+#############################################################################
+# index sub-commands
+@nexus_cli.group(cls=util.AliasedGroup)
+def index():
+    """Manage the local index of repository files."""
+    pass
+
+
+@index.command(name='build')
+@click.argument('repository_name')
+@util.with_nexus_client
+def index_build(ctx: click.Context, repository_name):
+    """Index all files in REPOSITORY_NAME, replacing its existing index."""
+    subcommand_index.cmd_build(ctx.obj, repository_name)
+
+
+@index.command(name='refresh')
+@click.argument('repository_path')
+@util.with_nexus_client
+def index_refresh(ctx: click.Context, repository_path):
+    """
+    Update the index with the changes to the files under REPOSITORY_PATH.
+
+    REPOSITORY_PATH must start with a repository name.
+    """
+    subcommand_index.cmd_refresh(ctx.obj, repository_path)
+
+
+@index.command(name='query')
+@click.argument('repository_path')
+@util.with_nexus_client
+def index_query(ctx: click.Context, repository_path):
+    """
+    List the indexed files within REPOSITORY_PATH.
+
+    REPOSITORY_PATH must start with a repository name and may be a glob, such
+    as my-repo/org/*/1.0/*.jar.
+    """
+    subcommand_index.cmd_query(ctx.obj, repository_path)
+
+
 #############################################################################
 # script sub-commands
 @nexus_cli.group(cls=util.AliasedGroup)
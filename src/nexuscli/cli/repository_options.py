@@ -67,3 +67,49 @@ MAVEN = [
     click.option('--layout-policy', help='Layout policy to use', default='strict',
                  type=click.Choice(['strict', 'permissive'], case_sensitive=False)),
 ]
+
+
+#############################################################################
+# search filter options, for commands acting on a listing of artefacts
+SEARCH_FILTER_NAMES = {
+    'group': 'group',
+    'name': 'name',
+    'version': 'version',
+    'sha1': 'sha1',
+    'maven_group_id': 'maven.groupId',
+    'maven_artifact_id': 'maven.artifactId',
+    'maven_base_version': 'maven.baseVersion',
+    'maven_extension': 'maven.extension',
+    'maven_classifier': 'maven.classifier',
+    'npm_scope': 'npm.scope',
+}
+"""Nexus search API parameter for each option in :data:`SEARCH`"""
+
+SEARCH = [
+    click.option('--group', help='Only artefacts in this component group'),
+    click.option('--name', help='Only artefacts of components with this name'),
+    click.option('--version', help='Only artefacts of components with this version'),
+    click.option('--sha1', help='Only artefacts with this SHA-1 checksum'),
+    click.option('--maven-group-id', help='Only Maven artefacts with this groupId'),
+    click.option('--maven-artifact-id', help='Only Maven artefacts with this artifactId'),
+    click.option('--maven-base-version',
+                 help='Only Maven artefacts with this base version; e.g.: 1.0-SNAPSHOT'),
+    click.option('--maven-extension', help='Only Maven artefacts with this extension'),
+    click.option('--maven-classifier', help='Only Maven artefacts with this classifier'),
+    click.option('--npm-scope', help='Only npm packages in this scope'),
+]
+
+PATHS = [
+    click.option('--include', '-i', multiple=True,
+                 help='Only artefacts with a path matching this glob; `*` also matches `/`. '
+                      'May be repeated'),
+    click.option('--exclude', '-x', multiple=True,
+                 help='Leave out the artefacts with a path matching this glob. May be repeated'),
+    click.option('--include-regex', multiple=True,
+                 help='Only artefacts with a path containing a match for this regular '
+                      'expression. May be repeated'),
+    click.option('--exclude-regex', multiple=True,
+                 help='Leave out the artefacts with a path containing a match for this '
+                      'regular expression. May be repeated'),
+]
+"""Options selecting artefacts by path on the client; see :func:`util.path_matcher`"""
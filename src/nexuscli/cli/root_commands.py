@@ -1,9 +1,16 @@
 """Handles base/root commands (as opposed to subcommands)"""
+import click
+import datetime
 import inflect
+import json
+import os
 import sys
 
 from nexuscli import exception, nexus_config, nexus_util
+from nexuscli.api.repository import diff, publish, usage
+from nexuscli.api.repository.index import AssetIndex
 from nexuscli.nexus_client import NexusClient
+from nexuscli.cli import util
 
 
 PLURAL = inflect.engine().plural
@@ -27,19 +34,115 @@ def cmd_login(**kwargs):
     return exception.CliReturnCode.SUCCESS.value
 
 
-def cmd_list(nexus_client, full_path):
+def cmd_list(nexus_client, full_path, use_index=False, filters=None, depth=None, match=None):
     """Performs ``nexus3 list``"""
     # TODO: refactor the path handling
     repository_name, path_fragments = nexus_util.pop_repository(full_path)
     repository_path = nexus_util.REMOTE_PATH_SEPARATOR.join(path_fragments)
     repository = nexus_client.repositories.get_by_name(repository_name)
 
-    artefact_list = repository.list(repository_path)
+    if depth is not None:
+        for node in repository.browse(repository_path, depth):
+            print(node.path, flush=True)
+        return exception.CliReturnCode.SUCCESS.value
+
+    if use_index:
+        with AssetIndex() as index:
+            for artefact in repository.list(repository_path, index, filters, match):
+                print(artefact)
+        return exception.CliReturnCode.SUCCESS.value
+
+    artefact_list = repository.list(repository_path, filters=filters, match=match)
     for artefact in iter(artefact_list):
         print(artefact)
     return exception.CliReturnCode.SUCCESS.value
 
 
+def cmd_find(nexus_client, pattern, repos='*', limit=None, workers=8):
+    """Performs ``nexus3 find``"""
+    found = nexus_client.repositories.search_all(pattern, repos, workers=workers, limit=limit)
+    count = 0
+    for repository_name, artefact in found:
+        print(f'{repository_name}{nexus_util.REMOTE_PATH_SEPARATOR}{artefact["path"]}',
+              flush=True)
+        count += 1
+
+    if not count:
+        sys.exit(exception.CliReturnCode.NOT_FOUND.value)
+    return exception.CliReturnCode.SUCCESS.value
+
+
+def cmd_locate(nexus_client, sha1=None, local_path=None, repos='*', limit=None, workers=8):
+    """Performs ``nexus3 locate``"""
+    found = nexus_client.repositories.locate(
+        sha1, local_path, repos, workers=workers, limit=limit)
+    count = 0
+    for repository_name, artefact in found:
+        print(f'{repository_name}{nexus_util.REMOTE_PATH_SEPARATOR}{artefact["path"]}',
+              flush=True)
+        count += 1
+
+    if not count:
+        sys.exit(exception.CliReturnCode.NOT_FOUND.value)
+    return exception.CliReturnCode.SUCCESS.value
+
+
+def cmd_du(nexus_client, repository_path, depth=1, top=20, use_index=False, **kwargs):
+    """Performs ``nexus3 du``"""
+    repository_name, path_fragments = nexus_util.pop_repository(repository_path)
+    repository = nexus_client.repositories.get_by_name(repository_name)
+    path = nexus_util.REMOTE_PATH_SEPARATOR.join(path_fragments)
+
+    if use_index:
+        with AssetIndex() as index:
+            directories = repository.disk_usage(path, depth, index)
+    else:
+        directories = repository.disk_usage(path, depth)
+
+    rows = [
+        {'path': f'{repository_name}{nexus_util.REMOTE_PATH_SEPARATOR}{x.path}',
+         'size': x.size, 'files': x.file_count}
+        for x in usage.heaviest(directories, top)]
+
+    if kwargs.get('json'):
+        print(json.dumps(rows))
+    else:
+        util.print_as_table(rows, ['path', 'size', 'files'])
+    return exception.CliReturnCode.SUCCESS.value
+
+
+DIFF_MARKERS = {diff.ADDED: '+', diff.REMOVED: '-', diff.CHANGED: '~'}
+
+
+def _diff_entries(nexus_client, location, index):
+    """The listing of a local directory or a REPOSITORY_PATH, for :func:`cmd_diff`"""
+    if os.path.isdir(location):
+        return diff.local_entries(location)
+
+    repository_name, path_fragments = nexus_util.pop_repository(location)
+    repository = nexus_client.repositories.get_by_name(repository_name)
+    path = nexus_util.REMOTE_PATH_SEPARATOR.join(path_fragments)
+    return diff.remote_entries(repository, path, index)
+
+
+def cmd_diff(nexus_client, first, second, workers=4, use_index=False, **kwargs):
+    """Performs ``nexus3 diff``"""
+    with AssetIndex() as index:
+        listing_index = index if use_index else None
+        differences = diff.diff(
+            _diff_entries(nexus_client, first, listing_index),
+            _diff_entries(nexus_client, second, listing_index),
+            workers=workers, local_sha1=index.local_sha1)
+
+        for difference in differences:
+            if kwargs.get('json'):
+                print(json.dumps(difference._asdict()), flush=True)
+            else:
+                print(f'{DIFF_MARKERS[difference.status]} {difference.path}', flush=True)
+
+    return exception.CliReturnCode.SUCCESS.value
+
+
 def _cmd_up_down_errors(count, action):
     """Print and exit with error if upload/download/delete didn't succeed"""
     if count == 0:
@@ -52,16 +155,59 @@ def _cmd_up_down_errors(count, action):
         sys.exit(exception.CliReturnCode.API_ERROR.value)
 
 
-def cmd_upload(nexus_client, src=None, dst=None, flatten=None, recurse=None):
+def _cmd_publish(nexus_client, src, dst, flatten, recurse):
+    """Performs ``nexus3 upload`` with more than one destination"""
+    destinations = []
+    for full_path in dst:
+        repository_name, path_fragments = nexus_util.pop_repository(full_path)
+        destinations.append((
+            nexus_client.repositories.get_by_name(repository_name),
+            nexus_util.REMOTE_PATH_SEPARATOR.join(path_fragments)))
+
+    if src == '-':
+        results = [
+            publish.PublishResult(
+                repository, dst_path, int(error is None), {} if error is None else {src: error})
+            for (repository, dst_path), error
+            in zip(destinations, publish.publish_stream(sys.stdin.buffer, destinations))]
+    else:
+        results = publish.publish(src, destinations, recurse=recurse, flatten=flatten)
+
+    for full_path, result in zip(dst, results):
+        file = PLURAL('file', result.upload_count)
+        sys.stderr.write(f'Uploaded {result.upload_count} {file} to {full_path}\n')
+        for source_file, error in result.errors.items():
+            sys.stderr.write(f'ERROR uploading {source_file} to {full_path}: {error}\n')
+
+    if any(result.errors for result in results):
+        sys.exit(exception.CliReturnCode.API_ERROR.value)
+
+    _cmd_up_down_errors(sum(result.upload_count for result in results), 'upload')
+    return exception.CliReturnCode.SUCCESS.value
+
+
+def cmd_upload(
+        nexus_client, src=None, dst=(), flatten=None, recurse=None, workers=1, extract=False):
     """Performs ``nexus3 upload``"""
-    sys.stderr.write(f'Uploading {src} to {dst}\n')
+    sys.stderr.write(f'Uploading {src} to {", ".join(dst)}\n')
+
+    if len(dst) > 1:
+        if extract:
+            raise exception.FeatureNotImplemented('--extract with more than one DST')
+        return _cmd_publish(nexus_client, src, dst, flatten, recurse)
 
     # TODO: refactor the path handling
-    repository_name, path_fragments = nexus_util.pop_repository(dst)
+    repository_name, path_fragments = nexus_util.pop_repository(dst[0])
     dst_path = nexus_util.REMOTE_PATH_SEPARATOR.join(path_fragments)
     repository = nexus_client.repositories.get_by_name(repository_name)
 
-    upload_count = repository.upload(src, dst_path, flatten=flatten, recurse=recurse)
+    if src == '-':
+        checksums = repository.upload_stream(sys.stdin.buffer, dst_path)
+        sys.stderr.write(f'Uploaded stdin to {dst_path} (sha1: {checksums["sha1"]})\n')
+        return exception.CliReturnCode.SUCCESS.value
+
+    upload_count = repository.upload(
+        src, dst_path, flatten=flatten, recurse=recurse, workers=workers, extract=extract)
 
     _cmd_up_down_errors(upload_count, 'upload')
 
@@ -70,7 +216,42 @@ def cmd_upload(nexus_client, src=None, dst=None, flatten=None, recurse=None):
     return exception.CliReturnCode.SUCCESS.value
 
 
-def cmd_download(nexus_client, src=None, dst=None, flatten=None, cache=None):
+def cmd_prune(nexus_client, repository_name, keep_last=None, older_than=None, match=None,
+              dry_run=False, workers=1):
+    """Performs ``nexus3 prune``"""
+    repository = nexus_client.repositories.get_by_name(repository_name)
+    if older_than is not None:
+        older_than = datetime.timedelta(days=older_than)
+
+    if dry_run:
+        candidates = repository.prune_plan(keep_last, older_than, match)
+        for candidate in candidates:
+            asset_word = PLURAL('asset', len(candidate.asset_paths))
+            print(f'{candidate.coordinates}\t{len(candidate.asset_paths)} {asset_word}\t'
+                  f'{candidate.size} bytes')
+    else:
+        candidates, result = repository.prune(keep_last, older_than, match, workers=workers)
+
+    component_word = PLURAL('component', len(candidates))
+    total_size = sum(candidate.size for candidate in candidates)
+    if dry_run:
+        sys.stderr.write(
+            f'Would delete {len(candidates)} {component_word} ({total_size} bytes)\n')
+        return exception.CliReturnCode.SUCCESS.value
+
+    file_word = PLURAL('file', result.deleted)
+    sys.stderr.write(
+        f'Deleted {result.deleted} {file_word} from {len(candidates)} {component_word} '
+        f'({total_size} bytes); {result.not_found} not found; {result.errors} errors\n')
+
+    if result.errors:
+        sys.exit(exception.CliReturnCode.API_ERROR.value)
+
+    return exception.CliReturnCode.SUCCESS.value
+
+
+def cmd_download(nexus_client, src=None, dst=None, flatten=None, cache=None, filters=None,
+                 latest=None, match=None):
     """Performs ``nexus3 download``"""
     sys.stderr.write(f'Downloading {src} to {dst}\n')
 
@@ -79,7 +260,9 @@ def cmd_download(nexus_client, src=None, dst=None, flatten=None, cache=None):
     src_path = nexus_util.REMOTE_PATH_SEPARATOR.join(path_fragments)
     repository = nexus_client.repositories.get_by_name(repository_name)
 
-    download_count = repository.download(src_path, dst, flatten=flatten, nocache=not cache)
+    download_count = repository.download(
+        src_path, dst, flatten=flatten, nocache=not cache, filters=filters, latest=latest,
+        match=match)
 
     _cmd_up_down_errors(download_count, 'download')
 
@@ -89,17 +272,82 @@ def cmd_download(nexus_client, src=None, dst=None, flatten=None, cache=None):
     return exception.CliReturnCode.SUCCESS.value
 
 
-def cmd_delete(nexus_client, repository_path):
+def _copy_repositories(src_client, src, dst_client, dst):
+    """The repositories and paths in them for :func:`cmd_copy` and :func:`cmd_move`"""
+    src_repository_name, src_fragments = nexus_util.pop_repository(src)
+    dst_repository_name, dst_fragments = nexus_util.pop_repository(dst)
+
+    return (
+        src_client.repositories.get_by_name(src_repository_name),
+        dst_client.repositories.get_by_name(dst_repository_name),
+        nexus_util.REMOTE_PATH_SEPARATOR.join(src_fragments),
+        nexus_util.REMOTE_PATH_SEPARATOR.join(dst_fragments))
+
+
+def _cmd_copy_result(result, dst, action):
+    """Print the outcome of a copy or move and exit with error if any file failed"""
+    for path, error in result.errors.items():
+        sys.stderr.write(f'ERROR copying {path}: {error}\n')
+    file_word = PLURAL('file', result.copied)
+    sys.stderr.write(
+        f'{action} {result.copied} {file_word} to {dst}; {result.skipped} already up-to-date\n')
+
+    if result.errors:
+        sys.exit(exception.CliReturnCode.API_ERROR.value)
+    return exception.CliReturnCode.SUCCESS.value
+
+
+def cmd_copy(nexus_client, src, dst, workers=4, dst_config=None, server_side=False):
+    """Performs ``nexus3 copy``"""
+    sys.stderr.write(f'Copying {src} to {dst}\n')
+    dst_client = nexus_client
+    if dst_config is not None:
+        config = nexus_config.NexusConfig(config_path=dst_config)
+        config.load()
+        dst_client = NexusClient(config=config)
+
+    src_repository, dst_repository, src_path, dst_path = _copy_repositories(
+        nexus_client, src, dst_client, dst)
+
+    if server_side:
+        result = src_repository.server_copy(dst_repository, src_path, dst_path)
+    else:
+        result = src_repository.copy_to(dst_repository, src_path, dst_path, workers=workers)
+
+    return _cmd_copy_result(result, dst, 'Copied')
+
+
+def cmd_move(nexus_client, src, dst):
+    """Performs ``nexus3 move``"""
+    sys.stderr.write(f'Moving {src} to {dst}\n')
+    src_repository, dst_repository, src_path, dst_path = _copy_repositories(
+        nexus_client, src, nexus_client, dst)
+
+    result = src_repository.server_copy(dst_repository, src_path, dst_path, move=True)
+    return _cmd_copy_result(result, dst, 'Moved')
+
+
+def cmd_delete(nexus_client, repository_path, workers=1, components=False, server_side=False,
+               filters=None, match=None):
     """Performs ``nexus3 delete``"""
     # TODO: refactor the path handling
     repository_name, path_fragments = nexus_util.pop_repository(repository_path)
     delete_path = nexus_util.REMOTE_PATH_SEPARATOR.join(path_fragments)
     repository = nexus_client.repositories.get_by_name(repository_name)
 
-    delete_count = repository.delete(delete_path)
+    try:
+        # as Repository.delete, with each count for the report
+        result = repository._delete(delete_path, workers, filters, match, server_side, components)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    file_word = PLURAL('file', result.deleted)
+    sys.stderr.write(
+        f'Deleted {result.deleted} {file_word}; {result.not_found} not found; '
+        f'{result.errors} errors\n')
 
-    _cmd_up_down_errors(delete_count, 'delete')
+    if result.errors:
+        sys.exit(exception.CliReturnCode.API_ERROR.value)
 
-    file_word = PLURAL('file', delete_count)
-    sys.stderr.write(f'Deleted {delete_count} {file_word}\n')
+    _cmd_up_down_errors(result.deleted + result.not_found, 'delete')
     return exception.CliReturnCode.SUCCESS.value
@@ -1,9 +1,11 @@
 import json
+import sys
 from texttable import Texttable
 
 from nexuscli import exception
 from nexuscli.nexus_client import NexusClient
 from nexuscli.api import cleanup_policy
+from nexuscli.api.cleanup_policy import simulation
 from nexuscli.cli import constants
 
 
@@ -47,3 +49,36 @@ def cmd_show(nexus_client: NexusClient, policy_name: str) -> None:
 
     print(json.dumps(policy.configuration, indent=2))
     return exception.CliReturnCode.SUCCESS.value
+
+
+def cmd_simulate(
+        nexus_client: NexusClient, policy_name: str, repository_name: str,
+        samples: int = 10) -> None:
+    """Performs ``nexus3 cleanup-policy simulate``"""
+    policy = nexus_client.cleanup_policies.get_by_name(policy_name)
+    repository = nexus_client.repositories.get_by_name(repository_name)
+
+    try:
+        result = simulation.simulate(
+            policy, repository.list_raw(''), sample_size=samples,
+            repository_format=repository.recipe_name)
+    except ValueError as e:
+        raise exception.ConfigError(str(e))
+
+    if result.samples:
+        table = Texttable(max_width=constants.TTY_MAX_WIDTH)
+        table.add_row(['Path', 'Size', 'Updated', 'Downloaded'])
+        table.set_deco(Texttable.HEADER)
+        for asset in result.samples:
+            table.add_row([
+                asset['path'], asset.get('fileSize', 'null'),
+                asset.get('lastModified', 'null'), asset.get('lastDownloaded') or 'never'])
+        print(table.draw())
+
+    print(f'{result.match_count} of {result.asset_count} files match; '
+          f'{result.match_bytes} bytes reclaimable')
+    if result.ignored_criteria:
+        sys.stderr.write(
+            f'WARNING: criteria not simulated: {", ".join(result.ignored_criteria)}; fewer '
+            f'files may match\n')
+    return exception.CliReturnCode.SUCCESS.value
@@ -0,0 +1,40 @@
+from nexuscli import exception, nexus_util
+from nexuscli.nexus_client import NexusClient
+from nexuscli.api.repository.index import AssetIndex
+
+
+def cmd_build(nexus_client: NexusClient, repository_name: str) -> None:
+    """Performs ``nexus3 index build``"""
+    repository = nexus_client.repositories.get_by_name(repository_name)
+
+    with AssetIndex() as index:
+        count = index.build(repository)
+
+    print(f'Indexed {count} files in {repository_name}')
+    return exception.CliReturnCode.SUCCESS.value
+
+
+def cmd_refresh(nexus_client: NexusClient, repository_path: str) -> None:
+    """Performs ``nexus3 index refresh``"""
+    repository_name, path_fragments = nexus_util.pop_repository(repository_path)
+    repository = nexus_client.repositories.get_by_name(repository_name)
+
+    with AssetIndex() as index:
+        result = index.refresh(
+            repository, nexus_util.REMOTE_PATH_SEPARATOR.join(path_fragments))
+
+    print(f'{result.added} added, {result.updated} updated, {result.removed} removed')
+    return exception.CliReturnCode.SUCCESS.value
+
+
+def cmd_query(nexus_client: NexusClient, repository_path: str) -> None:
+    """Performs ``nexus3 index query``"""
+    repository_name, path_fragments = nexus_util.pop_repository(repository_path)
+    repository = nexus_client.repositories.get_by_name(repository_name)
+
+    with AssetIndex() as index:
+        for artefact in repository.list(
+                nexus_util.REMOTE_PATH_SEPARATOR.join(path_fragments), index):
+            print(artefact)
+
+    return exception.CliReturnCode.SUCCESS.value
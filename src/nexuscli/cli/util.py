@@ -1,12 +1,13 @@
 import click
 import functools
 import os
+import re
 import sys
 from typing import Dict, List, Union, Optional, Callable
 from click_aliases import ClickAliasedGroup
 
-from nexuscli import exception
-from nexuscli.cli import constants
+from nexuscli import exception, nexus_util
+from nexuscli.cli import constants, repository_options
 from nexuscli.nexus_client import NexusClient
 from nexuscli.nexus_config import NexusConfig
 from texttable import Texttable
@@ -91,6 +92,38 @@ def rename_keys(mydict: dict, rename_map: dict):
             del mydict[current_name]
 
 
+def search_filters(kwargs: dict) -> Optional[Dict[str, str]]:
+    """
+    Removes the options in :data:`repository_options.SEARCH` from ``kwargs``.
+
+    :return: the search filters given, keyed by Nexus search API parameter, or
+        None if none were given.
+    """
+    filters = {}
+    for option, parameter in repository_options.SEARCH_FILTER_NAMES.items():
+        value = kwargs.pop(option, None)
+        if value is not None:
+            filters[parameter] = value
+
+    return filters or None
+
+
+def path_matcher(kwargs: dict) -> Optional[Callable[[str], bool]]:
+    """
+    Removes the options in :data:`repository_options.PATHS` from ``kwargs``.
+
+    :return: as per :func:`nexuscli.nexus_util.path_matcher`.
+    :raises click.UsageError: if a regular expression is invalid.
+    """
+    patterns = {
+        name: kwargs.pop(name, None) or ()
+        for name in ('include', 'exclude', 'include_regex', 'exclude_regex')}
+    try:
+        return nexus_util.path_matcher(**patterns)
+    except re.error as e:
+        raise click.UsageError(f'Invalid regular expression: {e}')
+
+
 def _with_env_var_prefix(names) -> List[str]:
     return [f'{constants.ENV_VAR_PREFIX}_{x}' for x in names]
 
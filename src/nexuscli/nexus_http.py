@@ -1,7 +1,13 @@
-from typing import Callable, Optional, List
+import mmap
+import os
+import stat
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Optional, List, Tuple
 from urllib.parse import urljoin
 
 import requests
+import requests.adapters
 import semver
 import warnings
 
@@ -9,10 +15,111 @@ from nexuscli import exception
 from nexuscli.nexus_config import NexusConfig
 
 
+class StreamingBody:
+    """
+    A request body produced by an iterable of ``bytes`` chunks, which is only consumed while
+    the request is sent.
+
+    When ``length`` is given, the body is sent with a ``Content-Length`` header; otherwise it's
+    sent using chunked transfer encoding.
+
+    :param chunks: the contents of the body.
+    :param length: total size of the chunks, if known.
+    """
+    def __init__(self, chunks: Iterable[bytes], length: Optional[int] = None):
+        self._chunks = chunks
+        self._length = length
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self._chunks)
+
+    def __len__(self) -> int:
+        # requests uses chunked transfer encoding for an iterable body of length 0
+        return self._length or 0
+
+    def __bool__(self) -> bool:
+        # requests replaces a falsy body with an empty form
+        return True
+
+
+def multipart_body(
+        fields: List[Tuple[str, str]], file_field: str, file_name: str,
+        file_chunks: Iterable[bytes],
+        file_size: Optional[int] = None) -> Tuple[StreamingBody, str]:
+    """
+    Creates a ``multipart/form-data`` body with the given form fields followed by a single
+    file, without reading the file contents until the body is sent.
+
+    :param fields: ``(name, value)`` for each form field.
+    :param file_field: name of the form field for the file.
+    :param file_name: file name sent for the file.
+    :param file_chunks: the file contents.
+    :param file_size: size of the file contents, if known. When not given, the body is sent
+        using chunked transfer encoding.
+    :return: the body and its content type.
+    """
+    boundary = uuid.uuid4().hex
+    preamble = ''.join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+        for name, value in fields)
+    preamble += (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="{file_field}"; filename="{file_name}"\r\n'
+        f'Content-Type: application/octet-stream\r\n\r\n')
+    epilogue = f'\r\n--{boundary}--\r\n'.encode()
+
+    def _chunks():
+        yield preamble.encode()
+        yield from file_chunks
+        yield epilogue
+
+    length = None
+    if file_size is not None:
+        length = len(preamble.encode()) + file_size + len(epilogue)
+
+    return StreamingBody(_chunks(), length), f'multipart/form-data; boundary={boundary}'
+
+
+@contextmanager
+def mapped_file(path) -> Iterator[memoryview]:
+    """
+    Maps a local file into memory, read-only, for use as (part of) a request body.
+
+    A buffer is handed by urllib3 straight to ``socket.sendall``, so the contents go from the
+    page cache to the socket without being copied into Python objects chunk by chunk, as
+    happens when the body is a file object.
+
+    :param path: path to the local file.
+    :return: a view of the whole file contents. It's released when the context exits.
+    """
+    with open(path, 'rb') as fh:
+        file_stat = os.fstat(fh.fileno())
+        # empty files can't be mapped; neither can pipes nor devices
+        if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size == 0:
+            mapped = None
+            contents = memoryview(fh.read())
+        else:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            contents = memoryview(mapped)
+
+        try:
+            yield contents
+        finally:
+            contents.release()
+            if mapped is not None:
+                try:
+                    mapped.close()
+                except BufferError:
+                    # a view of the map outlives the request (e.g. in an exception
+                    # traceback); the map is closed when it's garbage collected
+                    pass
+
+
 class NexusHttp:
     def __init__(self, config: NexusConfig = None):
         self.config: NexusConfig = config or NexusConfig()
         self._server_version: Optional[str] = None
+        self._session: Optional[requests.Session] = None
 
         self._create_method_attributes()
 
@@ -56,6 +163,33 @@ class NexusHttp:
 
         return resp.json()
 
+    @contextmanager
+    def pooled_session(
+            self, pool_size: int = requests.adapters.DEFAULT_POOLSIZE) -> Iterator[None]:
+        """
+        Sends every request made in this context, from any thread, through a single
+        :py:class:`requests.Session`, so connections to the server are reused instead of
+        opened for each request.
+
+        :param pool_size: maximum number of connections kept open; use the number of threads
+            making requests concurrently.
+        """
+        if self._session is not None:
+            yield
+            return
+
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=max(pool_size, requests.adapters.DEFAULT_POOLSIZE))
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        self._session = session
+        try:
+            yield
+        finally:
+            self._session = None
+            session.close()
+
     @property
     def rest_url(self) -> str:
         """
@@ -92,8 +226,9 @@ class NexusHttp:
         service_url = service_url or self.service_url
         url = urljoin(service_url, endpoint)
 
+        send = requests.request if self._session is None else self._session.request
         try:
-            response = requests.request(
+            response = send(
                 method=method, auth=self.config.auth, url=url,
                 verify=self.config.x509_verify, **kwargs)
         except requests.exceptions.ConnectionError as e:
@@ -1,10 +1,16 @@
+import concurrent.futures
+import datetime
+import fnmatch
 import hashlib
 import logging
 import mmap
 import os
 import pathlib
 import pkg_resources
-from typing import Tuple
+import queue
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from nexuscli import exception
 
@@ -13,6 +19,15 @@ LOG = logging.getLogger(__name__)
 REMOTE_PATH_SEPARATOR = '/'
 """The character used by the Nexus server as a path separator"""
 
+HASH_NAMES = ('sha1', 'md5', 'sha256', 'sha512')
+"""The checksums calculated by the Nexus server for every asset"""
+
+HASH_CHUNK_SIZE = 1024 * 1024
+"""Amount of data given to every hash algorithm before moving to the next chunk of a file"""
+
+TEE_READ_AHEAD = 16
+"""Maximum number of chunks queued for a consumer of :func:`tee` that's falling behind"""
+
 
 def _resource_filename(resource_name):
     """wrapper for pkg_resources.resource_filename"""
@@ -68,14 +83,34 @@ def calculate_hash(hash_name, file_path_or_handle):
     :return: the calculated hash
     :rtype: str
     """
+    return calculate_hashes([hash_name], file_path_or_handle)[hash_name]
+
+
+def calculate_hashes(hash_names: Sequence[str], file_path_or_handle) -> Dict[str, str]:
+    """
+    Calculate several hashes for the given file, reading it only once.
+
+    The file is mapped into memory and every chunk of :py:data:`HASH_CHUNK_SIZE` bytes is
+    given to all hash algorithms before moving on to the next, so each chunk is only read
+    from memory once.
+
+    :param hash_names: names of the hash algorithms in hashlib; e.g.: :py:data:`HASH_NAMES`.
+    :param file_path_or_handle: source file name (:py:obj:`str`) or file
+        handle (:py:obj:`file-like`) for the hash algorithms.
+    :return: the calculated hashes, keyed by hash name.
+    """
     def _hash(_fd):
-        h = hashlib.new(hash_name)
+        hashes = {name: hashlib.new(name) for name in hash_names}
         stat = os.fstat(_fd.fileno())
         if stat.st_size > 0:  # can't map a zero-length file
-            m = mmap.mmap(_fd.fileno(),
-                          stat.st_size, access=mmap.ACCESS_READ)
-            h.update(m)
-        return h.hexdigest()
+            with mmap.mmap(_fd.fileno(), stat.st_size, access=mmap.ACCESS_READ) as m:
+                with memoryview(m) as view:
+                    for offset in range(0, stat.st_size, HASH_CHUNK_SIZE):
+                        chunk = view[offset:offset + HASH_CHUNK_SIZE]
+                        for h in hashes.values():
+                            h.update(chunk)
+                        chunk.release()
+        return {name: h.hexdigest() for name, h in hashes.items()}
 
     if hasattr(file_path_or_handle, 'read'):
         return _hash(file_path_or_handle)
@@ -84,7 +119,68 @@ def calculate_hash(hash_name, file_path_or_handle):
             return _hash(fd)
 
 
-def has_same_hash(artefact, filepath):
+def calculate_hashes_batch(
+        file_paths: Iterable,
+        hash_names: Sequence[str] = HASH_NAMES,
+        workers: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """
+    Calculate hashes for many files concurrently, as per :func:`calculate_hashes`.
+
+    hashlib releases the GIL while hashing, so a thread pool uses every CPU core without the
+    cost of sending file contents or results between processes.
+
+    :param file_paths: names of the files to be hashed.
+    :param hash_names: names of the hash algorithms in hashlib.
+    :param workers: number of files hashed at the same time. Defaults to the number of CPUs.
+    :return: generator of ``(file_path, hashes)`` tuples, in completion order. Files that no
+        longer exist are skipped.
+    """
+    def _hash(file_path):
+        try:
+            return file_path, calculate_hashes(hash_names, file_path)
+        except FileNotFoundError:
+            return file_path, None
+
+    workers = workers or os.cpu_count() or 1
+    for file_path, hashes in concurrent_map(_hash, file_paths, workers):
+        if hashes is not None:
+            yield file_path, hashes
+
+
+class HashingReader:
+    """
+    Iterates over the contents of a binary file object in chunks, calculating hashes for the
+    data as it's read. Useful for checksumming a stream, such as stdin, that can only be read
+    once.
+
+    :param fileobj: binary file object to read from.
+    :param hash_names: names of the hash algorithms in hashlib.
+    :param chunk_size: maximum size of each chunk.
+    """
+    def __init__(self, fileobj, hash_names: Sequence[str] = ('sha1', 'md5'),
+                 chunk_size: int = HASH_CHUNK_SIZE):
+        self._fileobj = fileobj
+        self._hashes = {name: hashlib.new(name) for name in hash_names}
+        self._chunk_size = chunk_size
+        self.bytes_read: int = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self._fileobj.read(self._chunk_size)
+            if not chunk:
+                break
+            for h in self._hashes.values():
+                h.update(chunk)
+            self.bytes_read += len(chunk)
+            yield chunk
+
+    @property
+    def hexdigests(self) -> Dict[str, str]:
+        """The hashes for the data read so far, keyed by hash name"""
+        return {name: h.hexdigest() for name, h in self._hashes.items()}
+
+
+def has_same_hash(artefact, filepath, local_hashes=None):
     """
     Checks if a Nexus artefact has the same hash as a local filepath.
 
@@ -92,6 +188,10 @@ def has_same_hash(artefact, filepath):
         :py:meth:`~nexuscli.nexus_client.NexusClient.list_raw`
     :type artefact: dict
     :param filepath: local file path
+    :param local_hashes: hashes already calculated for ``filepath`` (e.g. by
+        :func:`calculate_hashes_batch`), keyed by hash name. Hashes not given here are
+        calculated when needed.
+    :type local_hashes: dict
     :return: True if artefact and filepath have the same hash.
     :rtype: bool
     """
@@ -100,12 +200,231 @@ def has_same_hash(artefact, filepath):
         if remote_hash is None:
             continue
 
-        local_hash = calculate_hash(hash_name, filepath)
+        local_hash = (local_hashes or {}).get(hash_name)
+        if local_hash is None:
+            local_hash = calculate_hash(hash_name, filepath)
         return local_hash == remote_hash
 
     return False
 
 
+def concurrent_map(func: Callable, iterable: Iterable, workers: int = 1) -> Iterator:
+    """
+    Yields ``func(item)`` for each element of ``iterable``, running up to ``workers`` calls at
+    the same time in a thread pool.
+
+    The iterable is consumed lazily, with at most ``2 * workers`` calls in flight, so it can be
+    a generator over a very long listing. When ``workers`` is greater than one, results are
+    yielded in completion order; otherwise they are yielded in order, without using threads.
+
+    :param func: callable taking a single element of ``iterable``.
+    :param iterable: elements to be processed.
+    :param workers: maximum number of concurrent calls to ``func``.
+    :return: generator of the values returned by ``func``. An exception raised by ``func`` is
+        raised when its result would have been yielded; calls not yet started are cancelled.
+    """
+    if workers <= 1:
+        for item in iterable:
+            yield func(item)
+        return
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: set = set()
+        try:
+            for item in iterable:
+                pending.add(executor.submit(func, item))
+                if len(pending) >= 2 * workers:
+                    done, pending = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+
+            while pending:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _iter_queue(chunks: queue.Queue) -> Iterator[bytes]:
+    while True:
+        chunk = chunks.get()
+        if chunk is None:
+            return
+        if isinstance(chunk, BaseException):
+            raise chunk
+        yield chunk
+
+
+def tee(chunks: Iterable[bytes],
+        consumers: Sequence[Callable[[Iterator[bytes]], Any]]) -> List[concurrent.futures.Future]:
+    """
+    Gives the same ``chunks`` to every consumer, each running in its own thread, while
+    iterating over ``chunks`` only once.
+
+    A consumer is called with an iterator over the chunks. At most
+    :py:data:`TEE_READ_AHEAD` chunks are queued for a consumer that's slower than the others;
+    one that returns, or raises, without reading all of them stops receiving chunks and
+    doesn't hold up the others. When iterating over ``chunks`` raises an exception, every
+    consumer's iterator raises it too, so no consumer mistakes the chunks so far for the
+    complete data.
+
+    :param chunks: the data for the consumers.
+    :param consumers: callables taking an iterator of chunks.
+    :return: a completed future for each consumer, in the same order, holding the value it
+        returned or the exception it raised.
+    """
+    queues: List[queue.Queue] = [queue.Queue(maxsize=TEE_READ_AHEAD) for _ in consumers]
+
+    def _put(chunk_queue, future, chunk):
+        while not future.done():
+            try:
+                chunk_queue.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(len(consumers), 1)) as executor:
+        futures = [
+            executor.submit(consumer, _iter_queue(chunk_queue))
+            for consumer, chunk_queue in zip(consumers, queues)]
+
+        end = None
+        try:
+            for chunk in chunks:
+                for chunk_queue, future in zip(queues, futures):
+                    _put(chunk_queue, future, chunk)
+        except Exception as e:
+            end = e
+
+        for chunk_queue, future in zip(queues, futures):
+            _put(chunk_queue, future, end)
+
+    return futures
+
+
+def concurrent_chain(
+        sources: Iterable[Tuple[Any, Callable[[], Iterable]]], workers: int = 1,
+        read_ahead: int = TEE_READ_AHEAD) -> Iterator[Tuple[Any, Any]]:
+    """
+    Iterates over several sources at the same time, each in a thread, yielding their items as
+    they're produced.
+
+    Up to ``workers`` sources run at a time; each can get at most ``read_ahead`` items ahead of
+    the caller. Closing the returned generator, e.g. by breaking out of a ``for`` loop over
+    it, stops the sources at their next item.
+
+    :param sources: ``(key, source)`` where ``source`` is a callable returning an iterable.
+    :param workers: maximum number of sources iterated over at the same time.
+    :param read_ahead: number of items queued for each worker.
+    :return: generator of ``(key, item)`` for the items of every source, in the order they're
+        produced. An exception raised by a source is raised by the generator, after stopping
+        the other sources.
+    """
+    items: queue.Queue = queue.Queue(maxsize=read_ahead * max(workers, 1))
+    stop = threading.Event()
+    end = object()
+
+    def _put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _run(key, source):
+        try:
+            for item in source():
+                if stop.is_set():
+                    return
+                _put((key, item))
+        except Exception as e:
+            _put((key, e))
+        finally:
+            _put((key, end))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        running = len([executor.submit(_run, key, source) for key, source in sources])
+        try:
+            while running:
+                key, item = items.get()
+                if item is end:
+                    running -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield key, item
+        finally:
+            stop.set()
+            executor.shutdown(cancel_futures=True)
+
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime.datetime]:
+    """
+    Parses a timestamp given by the Nexus API, such as an asset's ``lastModified``.
+
+    :param value: ISO 8601 timestamp; timestamps without a time zone are taken as UTC.
+    :return: the time zone aware timestamp, or None if ``value`` is empty or invalid.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def _combined_pattern(
+        globs: Iterable[str], regexes: Iterable[str]) -> Optional['re.Pattern']:
+    """One regular expression matching any of the globs, in full, or regexes, anywhere"""
+    alternatives = [fnmatch.translate(x) for x in globs]
+    alternatives += [f'.*?(?:{x})' for x in regexes]
+    if not alternatives:
+        return None
+    return re.compile('|'.join(f'(?:{x})' for x in alternatives), re.DOTALL)
+
+
+def path_matcher(
+        include: Iterable[str] = (), exclude: Iterable[str] = (),
+        include_regex: Iterable[str] = (),
+        exclude_regex: Iterable[str] = ()) -> Optional[Callable[[str], bool]]:
+    """
+    Selects asset paths by glob and regular expression.
+
+    All the patterns are compiled into one regular expression for inclusion and one for
+    exclusion, so matching a path costs the same however many patterns are given.
+
+    :param include: globs matching the whole path, as per :func:`fnmatch.fnmatchcase`; note
+        that ``*`` also matches the path separator.
+    :param exclude: globs for the paths to leave out, even if included.
+    :param include_regex: regular expressions searched for anywhere in the path.
+    :param exclude_regex: regular expressions for the paths to leave out, even if included.
+    :return: a callable returning whether a path, without a leading separator, is selected;
+        a path is selected if it matches any inclusion pattern, or none are given, and it
+        matches no exclusion pattern. None when no patterns are given.
+    :raises re.error: if a regular expression is invalid.
+    """
+    included = _combined_pattern(include, include_regex)
+    excluded = _combined_pattern(exclude, exclude_regex)
+    if included is None and excluded is None:
+        return None
+
+    def _match(path: str) -> bool:
+        if included is not None and included.match(path) is None:
+            return False
+        return excluded is None or excluded.match(path) is None
+
+    return _match
+
+
 def ensure_exists(path: pathlib.Path, is_dir: bool = False):
     """
     Ensures a path exists.
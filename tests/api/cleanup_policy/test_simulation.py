@@ -0,0 +1,91 @@
+import datetime
+
+import pytest
+
+from nexuscli.api.cleanup_policy import CleanupPolicy
+from nexuscli.api.cleanup_policy import simulation
+
+NOW = datetime.datetime(2026, 1, 31, tzinfo=datetime.timezone.utc)
+DAY = 86400
+
+
+def _asset(path, updated_days, downloaded_days=None, size=10):
+    def _ago(days):
+        return (NOW - datetime.timedelta(days=days)).isoformat()
+
+    return {
+        'path': path, 'fileSize': size, 'lastModified': _ago(updated_days),
+        'lastDownloaded': None if downloaded_days is None else _ago(downloaded_days),
+    }
+
+
+def _policy(policy_format='all', **criteria):
+    return CleanupPolicy(None, name='policy', format=policy_format, criteria=criteria)
+
+
+ASSETS = [
+    _asset('old/never-downloaded.jar', updated_days=100, size=1),
+    _asset('old/downloaded-recently.jar', updated_days=100, downloaded_days=2, size=2),
+    _asset('old/downloaded-long-ago.pom', updated_days=100, downloaded_days=60, size=4),
+    _asset('new/never-downloaded.jar', updated_days=1, size=8),
+]
+
+
+@pytest.mark.parametrize('criteria, x_paths', [
+    ({'lastBlobUpdated': str(30 * DAY)},
+     ['old/never-downloaded.jar', 'old/downloaded-recently.jar', 'old/downloaded-long-ago.pom']),
+    ({'lastDownloaded': str(30 * DAY)},
+     ['old/never-downloaded.jar', 'old/downloaded-long-ago.pom']),
+    ({'regex': r'.*\.jar'},
+     ['old/never-downloaded.jar', 'old/downloaded-recently.jar', 'new/never-downloaded.jar']),
+    ({'lastDownloaded': 30 * DAY, 'regex': 'old/.*jar'}, ['old/never-downloaded.jar']),
+    ({'regex': 'jar'}, []),  # the whole path must match
+    ({}, []),
+])
+def test_simulate(criteria, x_paths):
+    """Ensure each criterion is evaluated as Nexus does and that all of them must match"""
+    result = simulation.simulate(_policy(**criteria), iter(ASSETS), now=NOW)
+
+    assert result.asset_count == len(ASSETS)
+    assert [a['path'] for a in result.samples] == x_paths
+    assert result.match_count == len(x_paths)
+    assert result.match_bytes == sum(a['fileSize'] for a in ASSETS if a['path'] in x_paths)
+
+
+def test_simulate_batches(mocker):
+    """Ensure counts span batches and only the first matches are kept as samples"""
+    mocker.patch.object(simulation, 'SIMULATION_BATCH_SIZE', 3)
+    assets = [_asset(f'{i}.jar', updated_days=i) for i in range(10)]
+
+    result = simulation.simulate(
+        _policy(lastBlobUpdated=str(4 * DAY)), assets, now=NOW, sample_size=2)
+
+    assert result == (10, 5, 50, assets[5:7], [])
+
+
+@pytest.mark.parametrize('criteria, x_count', [
+    ({'isPrerelease': True, 'regex': r'.*\.jar'}, 3),
+    ({'isPrerelease': False}, len(ASSETS)),
+])
+def test_simulate_ignored_criteria(criteria, x_count):
+    """Ensure criteria that can't be evaluated on assets are reported, matching every asset"""
+    result = simulation.simulate(_policy(**criteria), iter(ASSETS), now=NOW)
+
+    assert result.match_count == x_count
+    assert result.ignored_criteria == ['isPrerelease']
+
+
+@pytest.mark.parametrize('policy_format, repository_format, x_error', [
+    ('all', 'npm', False), ('ALL_FORMATS', 'raw', False), ('maven2', 'maven', False),
+    ('maven', 'maven', False), ('maven2', 'raw', True), ('npm', 'maven', True),
+])
+def test_simulate_format(policy_format, repository_format, x_error):
+    """Ensure a policy for another format than the repository's is rejected"""
+    policy = _policy(policy_format, regex='.*')
+
+    if x_error:
+        with pytest.raises(ValueError):
+            simulation.simulate(policy, iter(ASSETS), repository_format=repository_format)
+    else:
+        result = simulation.simulate(policy, iter(ASSETS), repository_format=repository_format)
+        assert result.match_count == len(ASSETS)
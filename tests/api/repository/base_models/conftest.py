@@ -1,3 +1,7 @@
+import io
+import tarfile
+import zipfile
+
 import pytest
 
 
@@ -8,3 +12,31 @@ def x_artefacts(faker):
         faker.file_path(
             depth=faker.random_int(2, 10)) for _ in range(faker.random_int(1, 20))
     ]
+
+
+@pytest.fixture
+def archive_factory(tmp_path, faker):
+    """Creates an archive of the given type with random files; returns its path and contents"""
+    def fixture(suffix):
+        x_contents = {
+            'root.txt': faker.binary(length=faker.random_int(0, 999)),
+            'a/b/deep.bin': faker.binary(length=faker.random_int(0, 999)),
+            'a/other.bin': faker.binary(length=faker.random_int(0, 999)),
+        }
+        path = tmp_path / f'archive{suffix}'
+        if suffix == '.zip':
+            with zipfile.ZipFile(path, 'w') as archive:
+                for name, data in x_contents.items():
+                    archive.writestr(name, data)
+        else:
+            with tarfile.open(path, 'w:' + {'.tar': '', '.tar.gz': 'gz'}[suffix]) as archive:
+                directory = tarfile.TarInfo('a')
+                directory.type = tarfile.DIRTYPE  # directories are skipped
+                archive.addfile(directory)
+                for name, data in x_contents.items():
+                    info = tarfile.TarInfo(name)
+                    info.size = len(data)
+                    archive.addfile(info, io.BytesIO(data))
+        return path, x_contents
+
+    return fixture
@@ -0,0 +1,45 @@
+import pytest
+
+from nexuscli import exception
+from nexuscli.api.repository.base_models import util
+
+
+@pytest.mark.parametrize('suffix', ['.tar', '.tar.gz', '.zip'])
+@pytest.mark.parametrize('recurse', [True, False])
+def test_iter_archive(suffix, recurse, archive_factory):
+    """Ensure every file in the archive is yielded with its relative path, contents and size"""
+    path, x_contents = archive_factory(suffix)
+    if not recurse:
+        x_contents = {k: v for k, v in x_contents.items() if '/' not in k}
+
+    contents = {}
+    for name, fh, size in util.iter_archive(path, recurse):
+        contents[name] = b''.join(iter(fh.read, b''))
+        assert size == len(contents[name])
+
+    assert contents == x_contents
+
+
+def test_iter_archive_partial_read(archive_factory, monkeypatch):
+    """Ensure members the caller doesn't read don't spill into the following ones"""
+    monkeypatch.setattr(util.nexus_util, 'HASH_CHUNK_SIZE', 10)
+    path, x_contents = archive_factory('.tar.gz')
+
+    names = []
+    for name, fh, _ in util.iter_archive(path):
+        names.append(name)
+        if name == 'a/b/deep.bin':
+            assert b''.join(iter(fh.read, b'')) == x_contents[name]
+
+    assert names == list(x_contents)
+
+
+@pytest.mark.parametrize('name', ['foo.txt', 'foo.tar.zst'])
+def test_iter_archive_unsupported(name, tmp_path, monkeypatch):
+    """Ensure unsupported archives, or ones needing a missing package, are refused"""
+    monkeypatch.setattr(util, 'zstandard', None)
+    path = tmp_path / name
+    path.touch()
+
+    with pytest.raises(exception.FeatureNotImplemented):
+        next(util.iter_archive(path))
@@ -1,11 +1,14 @@
 import itertools
+import json
 import pathlib
+import threading
 import pytest
 from semver import VersionInfo
 
-from nexuscli import nexus_util
+from nexuscli import exception, nexus_util
 from nexuscli.api.repository import collection
 from nexuscli.api.repository.base_models.repository import Repository, CLEANUP_SET_MIN_VERSION
+from nexuscli.api.repository.model import RawHostedRepository
 
 
 @pytest.mark.parametrize('recipe', [x.RECIPE_NAME for x in collection.get_repository_classes()])
@@ -20,7 +23,7 @@ def test_list(recipe, x_artefacts, faker, mocker):
     artefacts = list(r.list(x_repository_path))
 
     assert artefacts == x_artefacts
-    r.list_raw.assert_called_with(x_repository_path)
+    r.list_raw.assert_called_with(x_repository_path, None, None, None)
 
 
 @pytest.mark.parametrize('recipe,version_policy', itertools.product(
@@ -74,6 +77,47 @@ def test_upload_directory(recipe, recurse, flatten, x_artefacts, mocker, faker):
     r.upload_file.assert_has_calls(x_upload_file_calls)
 
 
+@pytest.mark.parametrize('flatten', [True, False])
+def test_upload_directory_archive(flatten, archive_factory, mocker):
+    """Ensure the files in an archive source are streamed to their destination paths"""
+    path, x_contents = archive_factory('.zip')
+    uploads = {}
+
+    def _upload_stream(fh, destination, size=None):
+        uploads[destination] = b''.join(iter(fh.read, b''))
+
+    r = RawHostedRepository(name='dummy')
+    mocker.patch.object(r, 'upload_stream', side_effect=_upload_stream)
+
+    count = r.upload(str(path), 'dst', flatten=flatten, extract=True)
+
+    assert count == len(x_contents)
+    assert uploads == {
+        'dst/' + (k.split('/')[-1] if flatten else k): v for k, v in x_contents.items()}
+
+
+@pytest.mark.parametrize('recipe, workers', [('raw', 4), ('apt', 1), ('apt', 4)])
+def test_upload_directory_archive_extracted(recipe, workers, archive_factory, mocker):
+    """Ensure archives are extracted for recipes without stream uploads or for many workers"""
+    path, x_contents = archive_factory('.tar')
+    uploads = {}
+    lock = threading.Lock()
+
+    def _upload_file(source, destination):
+        with lock:
+            uploads[str(destination)] = pathlib.Path(source).read_bytes()
+
+    r = collection.get_repository_class({'recipeName': f'{recipe}-hosted'})(name='dummy')
+    mocker.patch.object(r, 'upload_file', side_effect=_upload_file)
+    mocker.patch.object(r, 'upload_stream')
+
+    count = r.upload(str(path), 'dst', workers=workers, extract=True)
+
+    assert count == len(x_contents)
+    assert uploads == {f'dst/{k}': v for k, v in x_contents.items()}
+    r.upload_stream.assert_not_called()
+
+
 @pytest.mark.parametrize('strict', [True, False])
 def test_configuration(strict, faker):
     """Ensure the property returns the attributes required by Nexus"""
@@ -115,4 +159,401 @@ def test_delete(recipe, x_artefacts, faker, nexus_mock_http, response_mock, mock
     delete_count = r.delete(x_path)
 
     assert delete_count == len(x_artefacts)
-    r.list_raw.assert_called_with(x_path)
+    r.list_raw.assert_called_with(x_path, filters=None, match=None)
+
+
+def test_delete_server_side(nexus_mock_http, mocker):
+    """Ensure the groovy script deletes in batches, until it reports there's nothing left"""
+    results = iter([
+        {'deleted': 2, 'notFound': 0, 'more': True}, {'deleted': 1, 'notFound': 0, 'more': False},
+        {'deleted': 1, 'notFound': 0, 'more': False}])
+    create_if_missing = mocker.patch('nexuscli.api.script.ScriptCollection.create_if_missing')
+    run_script = mocker.patch(
+        'nexuscli.api.script.ScriptCollection.run_script',
+        side_effect=lambda *a, **kw: {'result': json.dumps(next(results))})
+
+    r = Repository(nexus_http=nexus_mock_http, name='dummy', recipe='maven')
+    delete_count = r.delete('org/foo/', server_side=True)
+
+    assert delete_count == 3
+    create_if_missing.assert_called_once_with('nexus3-cli-asset-delete')
+    assert run_script.call_count == 2
+    script_name, = run_script.call_args[0]
+    assert script_name == 'nexus3-cli-asset-delete'
+    assert json.loads(run_script.call_args[1]['data']) == {
+        'repository': 'dummy', 'path': 'org/foo/', 'batchSize': 1000}
+
+
+@pytest.mark.integration
+def test_server_delete_path_boundary(nexus_client, hosted_raw_repo_empty, tmp_path):
+    """Ensure deleting a directory leaves alone siblings that share its name as a prefix"""
+    repository = nexus_client.repositories.get_by_name(hosted_raw_repo_empty)
+    local = tmp_path / 'foo.jar'
+    local.write_text('foo')
+    for directory in ['org/foo/1.0/', 'org/foo/1.0.1/', 'org/foo/1.0-SNAPSHOT/']:
+        repository.upload_file(str(local), directory)
+    pytest.helpers.repo_list(repository, 3)
+
+    result = repository.server_delete('org/foo/1.0')
+
+    assert result == (1, 0, 0)
+    assert pytest.helpers.repo_list(repository, 2) == {
+        'org/foo/1.0.1/foo.jar', 'org/foo/1.0-SNAPSHOT/foo.jar'}
+
+
+def test_server_delete_ids(nexus_mock_http, mocker):
+    """Ensure asset ids are sent to the groovy script in batches"""
+    mocker.patch('nexuscli.api.script.ScriptCollection.create_if_missing')
+    run_script = mocker.patch(
+        'nexuscli.api.script.ScriptCollection.run_script',
+        side_effect=lambda name, data: {'result': json.dumps(
+            {'deleted': len(json.loads(data)['ids']) - 1, 'notFound': 1, 'more': False})})
+
+    r = Repository(nexus_http=nexus_mock_http, name='dummy', recipe='maven')
+    result = r.server_delete(asset_ids=(str(i) for i in range(5)), batch_size=2)
+
+    assert result == (2, 3, 0)
+    assert [json.loads(c[1]['data'])['ids'] for c in run_script.call_args_list] == [
+        ['0', '1'], ['2', '3'], ['4']]
+
+    with pytest.raises(ValueError):
+        r.server_delete()
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_bulk_delete(workers, faker, nexus_mock_http, response_mock, mocker):
+    """
+    Ensure failures don't stop the remaining deletes and that artefacts skipped by the
+    listing while deleting are found by listing again.
+    """
+    artefacts = [{'id': str(i), 'path': faker.file_path()} for i in range(40)]
+    statuses = {a['id']: faker.random.choice([204, 204, 404, 500]) for a in artefacts}
+    nexus_mock_http.delete = mocker.Mock(side_effect=lambda endpoint: response_mock(
+        statuses[endpoint.split('/')[-1]], 'reason'))
+    # the first listing misses the last artefacts, as when deleting shifts the pages
+    listings = iter([artefacts[:30], artefacts, artefacts])
+
+    r = Repository(nexus_http=nexus_mock_http, name='dummy', recipe='raw')
+    mocker.patch.object(r, 'list_raw', side_effect=lambda *_, **__: iter(next(listings)))
+
+    result = r.bulk_delete(faker.uri_path(), workers=workers)
+
+    x_statuses = list(statuses.values())
+    assert result == (x_statuses.count(204), x_statuses.count(404), x_statuses.count(500))
+    assert nexus_mock_http.delete.call_count == len(artefacts)
+
+
+def test_delete_components(faker, nexus_mock_http, response_mock, mocker):
+    """
+    Ensure components entirely under the path are deleted with one request and only the
+    matching assets of the others are deleted.
+    """
+    def _component(id_, *paths):
+        return {'id': id_, 'assets': [{'id': f'{id_}{p}', 'path': p} for p in paths]}
+
+    components = [
+        _component('whole', 'org/foo/1.0/foo-1.0.jar', 'org/foo/1.0/foo-1.0.pom'),
+        _component('partial', 'org/foo/1.0/bar.jar', 'org/bar/bar.pom'),
+        _component('none', 'org/bar/1.0/bar-1.0.jar'),
+    ]
+    nexus_mock_http.delete = mocker.Mock(return_value=response_mock(204, 'All OK'))
+
+    r = Repository(nexus_http=nexus_mock_http, name='dummy', recipe='maven')
+    mocker.patch.object(r, '_get_paginated', side_effect=lambda *a, **kw: iter(components))
+
+    result = r.delete_components('org/foo/')
+
+    assert result == (3, 0, 0)
+    assert sorted(c[0][0] for c in nexus_mock_http.delete.call_args_list) == [
+        'assets/partialorg/foo/1.0/bar.jar', 'components/whole']
+    assert r._get_paginated.call_args[1]['params']['keyword'] == '"org/foo/"'
+
+
+def test_delete_components_asset_filters(mocker):
+    """Ensure filters that select assets can't delete whole components"""
+    r = Repository(name='dummy', recipe='maven')
+    mocker.patch.object(r, '_bulk_delete')
+
+    with pytest.raises(ValueError):
+        r.delete_components('', filters={'maven.classifier': 'sources'})
+    r._bulk_delete.assert_not_called()
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'server_side': True}, {'match': lambda path: True},
+    {'filters': {'maven.extension': 'jar'}}])
+def test_delete_components_rejected(kwargs, mocker):
+    """Ensure delete refuses to remove whole components selected by file"""
+    r = Repository(name='dummy', recipe='maven')
+    mocker.patch.object(r, '_bulk_delete')
+    mocker.patch.object(r, 'server_delete')
+
+    with pytest.raises(ValueError):
+        r.delete('', components=True, **kwargs)
+    r._bulk_delete.assert_not_called()
+    r.server_delete.assert_not_called()
+
+
+def test_delete_components_raw(mocker):
+    """Ensure raw repositories, with a component per asset, delete assets"""
+    r = RawHostedRepository(name='dummy')
+    mocker.patch.object(r, 'bulk_delete')
+
+    result = r.delete_components('path', workers=3)
+
+    assert result == r.bulk_delete.return_value
+    r.bulk_delete.assert_called_once_with('path', 3, None)
+
+
+def test_download_up_to_date(tmp_path, faker, mocker):
+    """Ensure local copies with the same checksum as the remote artefact aren't downloaded"""
+    x_artefacts = [faker.file_name() for _ in range(faker.random_int(2, 10))]
+    x_list_raw = list(pytest.helpers.nexus_raw_response(x_artefacts))
+    stale = x_list_raw[0]
+    for artefact in x_list_raw[1:]:
+        tmp_path.joinpath(artefact['path']).write_text(artefact['id'])
+        artefact['checksum']['sha1'] = nexus_util.calculate_hash(
+            'sha1', tmp_path.joinpath(artefact['path']))
+
+    r = Repository(name='dummy')
+    mocker.patch.object(r, 'list_raw', return_value=x_list_raw)
+    mocker.patch.object(r, 'download_file')
+
+    count = r.download(faker.uri_path(), str(tmp_path) + '/')
+
+    assert count == len(x_artefacts)
+    r.download_file.assert_called_once_with(
+        stale['downloadUrl'], tmp_path.joinpath(stale['path']))
+
+
+def test_locate(mocker):
+    """Ensure the checksum is searched for by the Nexus service"""
+    r = Repository(name='dummy', recipe='raw')
+    mocker.patch.object(r, '_get_paginated', return_value=iter([{'path': 'foo.jar'}]))
+
+    assert list(r.locate('abc')) == [{'path': 'foo.jar'}]
+    r._get_paginated.assert_called_once_with(
+        'search/assets', params={'repository': 'dummy', 'sha1': 'abc'})
+
+
+def test_latest(mocker):
+    """Ensure components are searched newest first and no further pages are read"""
+    read = []
+
+    def _components():
+        for v in itertools.count(99, -1):
+            read.append(v)
+            yield {'id': f'c{v}', 'name': 'foo', 'version': None if v == 98 else f'1.{v}'}
+
+    r = Repository(name='dummy', recipe='maven')
+    mocker.patch.object(r, '_get_paginated', return_value=_components())
+
+    components = r.latest('org/foo/', 2, filters={'name': 'foo'})
+
+    assert [x['version'] for x in components] == ['1.99', '1.97']
+    assert read == [99, 98, 97]
+    r._get_paginated.assert_called_once_with('search/components', params={
+        'repository': 'dummy', 'keyword': '"org/foo/"', 'name': 'foo',
+        'sort': 'version', 'direction': 'desc'})
+    with pytest.raises(ValueError):
+        r.latest(filters={'nope': 'x'})
+
+
+def test_download_latest(tmp_path, mocker):
+    """Ensure only the assets of the newest components under the source are downloaded"""
+    r = Repository(name='dummy', recipe='maven')
+    mocker.patch.object(r, 'latest', return_value=[{'version': '1.1', 'assets': [
+        {'path': 'org/foo/1.1/foo-1.1.jar', 'downloadUrl': 'url/jar', 'checksum': {}},
+        {'path': 'elsewhere/foo-1.1.jar', 'downloadUrl': 'url/other', 'checksum': {}}]}])
+    mocker.patch.object(r, 'list_raw')
+    mocker.patch.object(r, 'download_file')
+
+    count = r.download('org/foo/', str(tmp_path) + '/', latest=1)
+
+    assert count == 1
+    r.latest.assert_called_once_with('org/foo/', 1, None)
+    r.list_raw.assert_not_called()
+    r.download_file.assert_called_once_with(
+        'url/jar', tmp_path.joinpath('org/foo/1.1/foo-1.1.jar'))
+
+
+def test_prune(nexus_mock_http, response_mock, mocker):
+    """Ensure pruning deletes each selected component with one request"""
+    components = [
+        {'id': f'c{v}', 'group': 'org', 'name': 'foo', 'version': f'1.{v}',
+         'assets': [{'path': f'org/foo/1.{v}/foo.jar'}, {'path': f'org/foo/1.{v}/foo.pom'}]}
+        for v in range(5)]
+    nexus_mock_http.delete = mocker.Mock(return_value=response_mock(204, 'All OK'))
+
+    r = Repository(nexus_http=nexus_mock_http, name='dummy', recipe='maven')
+    mocker.patch.object(r, '_get_paginated', side_effect=lambda *a, **kw: iter(components))
+
+    candidates, result = r.prune(keep_last=2, workers=2)
+
+    assert [c.version for c in candidates] == ['1.0', '1.1', '1.2']
+    assert result == (6, 0, 0)
+    assert sorted(c[0][0] for c in nexus_mock_http.delete.call_args_list) == [
+        'components/c0', 'components/c1', 'components/c2']
+    assert r._get_paginated.call_args[1]['params'] == {'repository': 'dummy'}
+
+
+@pytest.mark.parametrize('workers, exact_search', itertools.product([1, 4], [True, False]))
+def test_copy_to(workers, exact_search, mocker):
+    """Ensure artefacts are streamed to the destination, skipping the ones already there"""
+    def _artefact(path, sha1):
+        return {'path': path, 'checksum': {'sha1': sha1}, 'fileSize': 4,
+                'downloadUrl': f'http://nexus/repository/src/{path}'}
+
+    def _download_response(download_url):
+        if download_url.endswith('c.txt'):
+            raise exception.DownloadError('gone')
+        return mocker.Mock(iter_content=mocker.Mock(return_value=iter([b'data'])))
+
+    source = RawHostedRepository(name='src')
+    mocker.patch.object(source, 'list_raw', return_value=iter([
+        _artefact('dir/a.txt', 'a'), _artefact('/dir/sub/b.txt', 'b'),
+        _artefact('dir/c.txt', 'c'), _artefact('other/dir/d.txt', 'd')]))
+    mocker.patch.object(source, '_download_response', side_effect=_download_response)
+    destination = RawHostedRepository(name='dst')
+    existing = [_artefact('copy/a.txt', 'a'), _artefact('copy/sub/b.txt', 'outdated')]
+    mocker.patch.object(destination, 'list_raw', return_value=iter(existing))
+    mocker.patch.object(
+        destination, '_get_paginated',
+        side_effect=lambda endpoint, params: iter(
+            [x for x in existing if x['path'].startswith(params['name'])]))
+    if not exact_search:
+        mocker.patch.object(
+            RawHostedRepository, '_path_search_filters', Repository._path_search_filters)
+    uploaded = {}
+    mocker.patch.object(
+        destination, '_upload_chunks',
+        side_effect=lambda chunks, dst_path, size: uploaded.update({dst_path: list(chunks)}))
+
+    result = source.copy_to(destination, 'dir/', 'copy', workers=workers)
+
+    assert (result.copied, result.skipped) == (1, 1)
+    assert list(result.errors) == ['dir/c.txt']
+    assert uploaded == {'copy/sub/b.txt': [b'data']}
+    source.list_raw.assert_called_once_with('dir/')
+    if exact_search:
+        destination.list_raw.assert_not_called()
+        assert sorted(c[1]['params']['name'] for c in destination._get_paginated.call_args_list) \
+            == ['copy/a.txt', 'copy/c.txt', 'copy/sub/b.txt']
+    else:
+        destination.list_raw.assert_called_once_with('copy')
+        destination._get_paginated.assert_not_called()
+
+
+@pytest.mark.parametrize('destination_path, x_dst_path', [
+    ('copy/', 'copy/a.txt'), ('copy/renamed.txt', 'copy/renamed.txt')])
+def test_copy_to_file(destination_path, x_dst_path, mocker):
+    """Ensure a single file is copied into a directory or to a new file name"""
+    source = RawHostedRepository(name='src')
+    mocker.patch.object(source, 'list_raw', return_value=iter([
+        {'path': 'dir/a.txt', 'downloadUrl': 'url', 'checksum': {'sha1': 'a'}},
+        {'path': 'dir/a.txt.sha1'}]))
+    mocker.patch.object(source, '_download_response')
+    destination = RawHostedRepository(name='dst')
+    mocker.patch.object(destination, '_get_paginated', return_value=iter([]))
+    mocker.patch.object(destination, '_upload_chunks')
+
+    result = source.copy_to(destination, 'dir/a.txt', destination_path)
+
+    assert result == (1, 0, {})
+    assert destination._upload_chunks.call_args[0][1] == x_dst_path
+    destination._get_paginated.assert_called_once_with(
+        'search/assets', params={'repository': 'dst', 'name': x_dst_path})
+
+
+def test_copy_to_unsupported():
+    """Ensure recipes that can't upload a stream are rejected before copying"""
+    with pytest.raises(exception.FeatureNotImplemented):
+        RawHostedRepository(name='src').copy_to(Repository(name='dst', recipe='maven'))
+
+
+def test_server_copy(nexus_mock_http, mocker):
+    """Ensure batches are copied inside Nexus, each starting after the last one"""
+    mocker.patch('nexuscli.api.script.ScriptCollection.create_if_missing')
+    results = iter([
+        {'copied': 2, 'skipped': 0, 'more': True, 'after': 'dir/b'},
+        {'copied': 0, 'skipped': 1, 'more': False, 'after': 'dir/c'}])
+    run_script = mocker.patch(
+        'nexuscli.api.script.ScriptCollection.run_script',
+        side_effect=lambda name, data: {'result': json.dumps(next(results))})
+
+    source = Repository(nexus_http=nexus_mock_http, name='src', recipe='raw')
+    destination = Repository(nexus_http=nexus_mock_http, name='dst', recipe='raw')
+    result = source.server_copy(destination, 'dir/', 'copy', move=True, batch_size=2)
+
+    assert result == (2, 1, {})
+    assert [json.loads(c[1]['data']) for c in run_script.call_args_list] == [
+        {'source': 'src', 'destination': 'dst', 'path': 'dir/', 'destinationPath': 'copy',
+         'move': True, 'batchSize': 2},
+        {'source': 'src', 'destination': 'dst', 'path': 'dir/', 'destinationPath': 'copy',
+         'move': True, 'batchSize': 2, 'after': 'dir/b'}]
+
+    with pytest.raises(ValueError):
+        source.server_copy(source, 'dir/', 'dir/sub/')
+
+
+def test_list_raw_filters(mocker):
+    """Ensure search filters are sent with the keyword and unsupported ones are rejected"""
+    r = Repository(name='dummy', recipe='npm')
+    mocker.patch.object(r, '_get_paginated', return_value=iter([]))
+
+    list(r.list_raw('dir/', filters={'npm.scope': 'example', 'version': '1.0'}))
+
+    r._get_paginated.assert_called_once_with('search/assets', params={
+        'repository': 'dummy', 'keyword': '"dir/"', 'npm.scope': 'example', 'version': '1.0'})
+    with pytest.raises(ValueError):
+        list(r.list_raw('dir/', filters={'nope': 'x'}))
+    with pytest.raises(exception.FeatureNotImplemented):
+        list(r.list_raw('dir/', index=mocker.Mock(), filters={'version': '1.0'}))
+
+
+def test_list_raw_match(mocker):
+    """Ensure the listing only has the paths selected by the matcher"""
+    r = Repository(name='dummy', recipe='npm')
+    mocker.patch.object(r, '_get_paginated', return_value=iter(
+        [{'path': '/a/foo.tgz'}, {'path': '/a/bar.tgz'}]))
+
+    result = list(r.list_raw('a/', match=nexus_util.path_matcher(exclude=['*/bar.*'])))
+
+    assert result == [{'path': '/a/foo.tgz'}]
+
+
+@pytest.mark.parametrize('depth', [1, 2, 3])
+def test_browse(depth, nexus_mock_http, mocker):
+    """Ensure directories are listed one level at a time, down to the given depth"""
+    tree = {
+        'org': [{'id': 'org/foo', 'leaf': False}, {'id': 'org/a.txt', 'leaf': True,
+                                                   'assetId': 'a'}],
+        'org/foo': [{'id': 'org/foo/1.0', 'leaf': False}],
+        'org/foo/1.0': [{'id': 'org/foo/1.0/foo.jar', 'leaf': True, 'assetId': 'b'}],
+    }
+
+    def _post(endpoint, service_url, json):
+        response = mocker.Mock(status_code=200)
+        response.json.return_value = {'result': {
+            'success': True, 'data': tree[json['data'][0]['node']]}}
+        return response
+
+    nexus_mock_http.post = mocker.Mock(side_effect=_post)
+    r = Repository(nexus_http=nexus_mock_http, name='dummy', recipe='maven')
+
+    result = list(r.browse('org/', depth=depth, workers=2))
+
+    assert [x.path for x in result] == [
+        'org/a.txt', 'org/foo/', 'org/foo/1.0/', 'org/foo/1.0/foo.jar'][:depth + 1]
+    assert result[0].asset_id == 'a'
+    assert nexus_mock_http.post.call_count == min(depth, 3)
+
+
+def test_browse_error(nexus_mock_http, mocker):
+    """Ensure a failed browse request raises an error"""
+    nexus_mock_http.post = mocker.Mock(return_value=mocker.Mock(status_code=200))
+    nexus_mock_http.post.return_value.json.return_value = {
+        'result': {'success': False, 'message': 'Repository not found'}}
+
+    with pytest.raises(exception.NexusClientAPIError):
+        list(Repository(nexus_http=nexus_mock_http, name='dummy', recipe='raw').browse())
@@ -23,3 +23,24 @@ def upload_file_ensure_raises_api_error(tmpdir, faker, nexus_mock_client):
             repository.upload_file(src_file, faker.file_path())
 
     return fixture
+
+
+@pytest.fixture
+def upload_stream_request(nexus_mock_client, mocker):
+    """
+    Makes the mocked request consume the request body, as sending it would, and record it.
+    Returns the request mock and a list with the recorded bodies.
+    """
+    bodies = []
+    request = nexus_mock_client.http.request
+
+    def _request(method, endpoint, **kwargs):
+        data = kwargs['data']
+        if isinstance(data, memoryview):
+            bodies.append(data.tobytes())
+        else:
+            bodies.append(b''.join(data))
+        return mocker.DEFAULT
+
+    request.side_effect = _request
+    return request, bodies
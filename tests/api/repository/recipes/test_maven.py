@@ -1,9 +1,172 @@
+import zipfile
+
 import pytest
 
+from nexuscli import exception
 from nexuscli.api.repository.model import MavenHostedRepository
+from nexuscli.api.repository.recipes.maven import MavenAsset, maven_asset
+
 
+@pytest.mark.parametrize('path, x_asset', [
+    ('org/example/foo/1.0/foo-1.0.jar', MavenAsset('org.example', 'foo', '1.0', 'jar')),
+    ('org/example/foo/1.0/foo-1.0.pom', MavenAsset('org.example', 'foo', '1.0', 'pom')),
+    ('org/example/foo/1.0/foo-1.0-sources.jar',
+     MavenAsset('org.example', 'foo', '1.0', 'jar', 'sources')),
+    ('org/foo/1.0/foo-1.0-bin.tar.gz', MavenAsset('org', 'foo', '1.0', 'tar.gz', 'bin')),
+    ('org/foo/1.0/foo-1.0.jar.asc', MavenAsset('org', 'foo', '1.0', 'jar.asc')),
+    ('org/foo/1.0-SNAPSHOT/foo-1.0-SNAPSHOT.jar', MavenAsset('org', 'foo', '1.0-SNAPSHOT', 'jar')),
+    ('org/foo/1.0-SNAPSHOT/foo-1.0-20200101.123456-3-javadoc.jar',
+     MavenAsset('org', 'foo', '1.0-SNAPSHOT', 'jar', 'javadoc', '20200101.123456-3')),
+    ('org/foo/1.0/foo-1.0.jar.sha1', None),
+    ('org/foo/1.0/maven-metadata.xml', None),
+    ('org/foo/1.0/_remote.repositories', None),
+    ('org/foo/1.0/bar-1.0.jar', None),
+    ('foo/1.0/foo-1.0.jar', None),
+])
+def test_maven_asset(path, x_asset):
+    """Ensure paths in the Maven layout are parsed into coordinates and others are ignored"""
+    assert maven_asset(path) == x_asset
 
-@pytest.mark.xfail(reason='Not implemented', strict=True)
-def test_upload_error(upload_file_ensure_raises_api_error):
+
+def test_upload_error(tmpdir, nexus_mock_client):
     """Ensure the method raises an exception when the API response is wrong"""
-    upload_file_ensure_raises_api_error(MavenHostedRepository)
+    repository = MavenHostedRepository(nexus_mock_client.http, name='dummy')
+    nexus_mock_client.http.request.return_value.status_code = 500
+    src_file = tmpdir.join('foo-1.0.jar').ensure()
+
+    with pytest.raises(exception.NexusClientAPIError):
+        repository.upload_file(src_file, 'org/example/foo/1.0/')
+
+
+def test_upload_file_invalid_path(tmpdir, nexus_mock_client, faker):
+    """Ensure the method refuses destinations outside of the Maven repository layout"""
+    repository = MavenHostedRepository(nexus_mock_client.http, name='dummy')
+    src_file = tmpdir.join(faker.file_name()).ensure()
+
+    with pytest.raises(exception.NexusClientInvalidRepositoryPath):
+        repository.upload_file(src_file, faker.file_name())
+
+    nexus_mock_client.http.request.assert_not_called()
+
+
+def test_upload_component(tmp_path, nexus_mock_client, mocker):
+    """Ensure all assets are sent in one request and a pom is generated when missing"""
+    repository = MavenHostedRepository(nexus_mock_client.http, name='dummy')
+    post_component = mocker.patch.object(repository, '_post_component')
+    assets = []
+    for name, classifier in [('foo-1.0.jar', None), ('foo-1.0-sources.jar', 'sources')]:
+        tmp_path.joinpath(name).touch()
+        assets.append((MavenAsset('org', 'foo', '1.0', 'jar', classifier), tmp_path / name))
+
+    repository.upload_component(assets)
+
+    post_component.assert_called_once()
+    fields = dict(post_component.call_args[0][0])
+    assert fields['maven2.generate-pom'] == (None, 'true')
+    assert fields['maven2.packaging'] == (None, 'jar')
+    assert fields['maven2.asset1'][0] == 'foo-1.0.jar'
+    assert fields['maven2.asset2.classifier'] == (None, 'sources')
+    assert 'maven2.asset1.classifier' not in fields
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_upload_directory(workers, tmp_path, nexus_mock_client, mocker):
+    """Ensure files are grouped into one upload per component and other files are skipped"""
+    files = [
+        'org/example/foo/1.0/foo-1.0.pom',
+        'org/example/foo/1.0/foo-1.0.jar',
+        'org/example/foo/1.0/foo-1.0-javadoc.jar',
+        'org/example/foo/1.0/foo-1.0.jar.sha1',
+        'org/example/foo/2.0/foo-2.0.jar',
+        'org/example/foo/maven-metadata-local.xml',
+    ]
+    for name in files:
+        tmp_path.joinpath(name).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.joinpath(name).touch()
+
+    repository = MavenHostedRepository(nexus_mock_client.http, name='dummy')
+    upload_component = mocker.patch.object(repository, 'upload_component')
+
+    count = repository.upload_directory(tmp_path, workers=workers)
+
+    assert count == 4
+    assert upload_component.call_count == 2
+    uploaded = sorted(
+        sorted((a.version, a.classifier or '') for a, _ in call[0][0])
+        for call in upload_component.call_args_list)
+    assert uploaded == [[('1.0', ''), ('1.0', ''), ('1.0', 'javadoc')], [('2.0', '')]]
+
+
+def test_upload_directory_snapshots(tmp_path, nexus_mock_client, mocker):
+    """Ensure each timestamped snapshot build is uploaded as its own component"""
+    files = [
+        'org/foo/1.0-SNAPSHOT/foo-1.0-20200101.123456-1.jar',
+        'org/foo/1.0-SNAPSHOT/foo-1.0-20200101.123456-1.pom',
+        'org/foo/1.0-SNAPSHOT/foo-1.0-20200102.123456-2.jar',
+        'org/foo/1.0-SNAPSHOT/foo-1.0-20200102.123456-2.pom',
+        'org/foo/1.0-SNAPSHOT/maven-metadata.xml',
+    ]
+    for name in files:
+        tmp_path.joinpath(name).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.joinpath(name).touch()
+
+    repository = MavenHostedRepository(nexus_mock_client.http, name='dummy')
+    upload_component = mocker.patch.object(repository, 'upload_component')
+
+    count = repository.upload_directory(tmp_path)
+
+    assert count == 4
+    uploaded = sorted(
+        sorted(source.name for _, source in call[0][0])
+        for call in upload_component.call_args_list)
+    assert uploaded == [
+        ['foo-1.0-20200101.123456-1.jar', 'foo-1.0-20200101.123456-1.pom'],
+        ['foo-1.0-20200102.123456-2.jar', 'foo-1.0-20200102.123456-2.pom']]
+
+
+def test_upload_directory_archive(tmp_path, nexus_mock_client, mocker):
+    """Ensure an archive with the Maven layout is extracted and uploaded by component"""
+    path = tmp_path / 'repository.zip'
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name in ['org/example/foo/1.0/foo-1.0.pom', 'org/example/foo/1.0/foo-1.0.jar',
+                     'org/example/foo/2.0/foo-2.0.jar', '../outside/foo/1.0/foo-1.0.jar']:
+            archive.writestr(name, name)
+
+    repository = MavenHostedRepository(nexus_mock_client.http, name='dummy')
+    uploaded = []
+    mocker.patch.object(
+        repository, 'upload_component',
+        side_effect=lambda assets: uploaded.append(sorted(f.read_text() for _, f in assets)))
+
+    count = repository.upload(str(path), '', extract=True, workers=2)
+
+    assert count == 3
+    assert sorted(uploaded) == [
+        ['org/example/foo/1.0/foo-1.0.jar', 'org/example/foo/1.0/foo-1.0.pom'],
+        ['org/example/foo/2.0/foo-2.0.jar']]
+
+
+@pytest.mark.parametrize('path, x_paths, x_searches', [
+    # a file is found by its coordinates, without the other classifiers
+    ('org/foo/1.0/foo-1.0.jar', ['org/foo/1.0/foo-1.0.jar'], 1),
+    # not a file after all: falls back to a keyword search
+    ('org/foo/1.0/foo-1.0.zip', ['org/foo/1.0/foo-1.0.zip.d/x'], 2),
+])
+def test_list_raw_coordinates(path, x_paths, x_searches, mocker):
+    """Ensure file paths are searched by Maven coordinates rather than by keyword"""
+    def _search(endpoint, params):
+        if 'keyword' in params:
+            return iter([{'path': 'org/foo/1.0/foo-1.0.zip.d/x'}])
+        return iter([{'path': 'org/foo/1.0/foo-1.0.jar'},
+                     {'path': 'org/foo/1.0/foo-1.0-sources.jar'}])
+
+    repository = MavenHostedRepository(name='maven')
+    mocker.patch.object(repository, '_get_paginated', side_effect=_search)
+
+    result = list(repository.list_raw(path, filters={'sha1': 'x'}))
+
+    assert [a['path'] for a in result] == x_paths
+    assert repository._get_paginated.call_count == x_searches
+    assert repository._get_paginated.call_args_list[0][1]['params'] == {
+        'repository': 'maven', 'maven.groupId': 'org', 'maven.artifactId': 'foo',
+        'maven.baseVersion': '1.0', 'maven.extension': path.split('.')[-1], 'sha1': 'x'}
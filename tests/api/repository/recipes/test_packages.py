@@ -0,0 +1,32 @@
+import pytest
+
+from nexuscli.api.repository import collection
+
+PACKAGE_EXTENSIONS = {'apt': 'deb', 'nuget': 'nupkg', 'rubygems': 'gem'}
+
+
+def _repository_class(recipe):
+    return collection.get_repository_class({'recipeName': f'{recipe}-hosted'})
+
+
+@pytest.mark.parametrize('recipe', ['apt', 'nuget', 'rubygems'])
+def test_upload_error(recipe, upload_file_ensure_raises_api_error):
+    """Ensure the method raises an exception when the API response is wrong"""
+    upload_file_ensure_raises_api_error(_repository_class(recipe))
+
+
+@pytest.mark.parametrize('recipe', ['apt', 'nuget', 'rubygems'])
+def test_upload_file(recipe, tmp_path, faker, nexus_mock_client, upload_stream_request):
+    """Ensure the file is sent as the recipe's asset to the components API"""
+    request, bodies = upload_stream_request
+    request.return_value.status_code = 204
+    repository = _repository_class(recipe)(nexus_mock_client.http, name=faker.word())
+    src_file = tmp_path / f'{faker.word()}.{PACKAGE_EXTENSIONS[recipe]}'
+    src_file.write_bytes(faker.binary(length=faker.random_int(1, 999)))
+
+    repository.upload_file(src_file)
+
+    method, endpoint = request.call_args[0]
+    assert (method, endpoint) == ('post', 'components')
+    assert f'name="{recipe}.asset"; filename="{src_file.name}"'.encode() in bodies[0]
+    assert src_file.read_bytes() in bodies[0]
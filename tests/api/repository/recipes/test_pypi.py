@@ -1,3 +1,5 @@
+import concurrent.futures
+import tarfile
 import pytest
 
 from nexuscli.api.repository.model import PypiHostedRepository
@@ -8,6 +10,48 @@ def test_upload_error(upload_file_ensure_raises_api_error):
     upload_file_ensure_raises_api_error(PypiHostedRepository)
 
 
+@pytest.mark.parametrize('workers', [1, 4])
+def test_upload_directory(workers, deep_file_tree, nexus_mock_http, mocker):
+    """
+    Ensure the method validates every file and uploads them all through a single twine
+    repository instance.
+    """
+    src_dir, x_file_set = deep_file_tree
+    # the mocked _package_file can't be pickled, so run "processes" as threads
+    mocker.patch('concurrent.futures.ProcessPoolExecutor', concurrent.futures.ThreadPoolExecutor)
+    package_file = mocker.patch('nexuscli.api.repository.recipes.pypi._package_file')
+    twine_repository = mocker.patch('twine.repository.Repository')
+    twine_repository.return_value.upload.return_value.status_code = 200
+
+    repository = PypiHostedRepository(nexus_mock_http, name='dummy')
+    count = repository.upload_directory(src_dir, workers=workers)
+
+    assert count == len(x_file_set)
+    assert package_file.call_count == len(x_file_set)
+    twine_repository.assert_called_once()
+    assert twine_repository.return_value.upload.call_count == len(x_file_set)
+    twine_repository.return_value.close.assert_called_once()
+
+
+def test_upload_directory_archive(tmp_path, nexus_mock_http, mocker):
+    """Ensure an archive of distributions is extracted and each one uploaded"""
+    path = tmp_path / 'dist.tar'
+    with tarfile.open(path, 'w') as archive:
+        for name in ['dist/example-0.0.0.tar.gz', 'example-0.0.0-py3-none-any.whl']:
+            archive.add('tests/fixtures/pypi/example-0.0.0.tar.gz', arcname=name)
+    package_file = mocker.patch(
+        'nexuscli.api.repository.recipes.pypi._package_file', side_effect=lambda x: x.name)
+    repository = PypiHostedRepository(nexus_mock_http, name='dummy')
+    upload_package = mocker.patch.object(repository, '_upload_package')
+
+    count = repository.upload_directory(path)
+
+    assert count == 2
+    assert package_file.call_count == 2
+    assert sorted(c[0][0] for c in upload_package.call_args_list) == [
+        'example-0.0.0-py3-none-any.whl', 'example-0.0.0.tar.gz']
+
+
 @pytest.mark.integration
 @pytest.mark.incremental
 class TestPypiHostedRepository:
@@ -1,6 +1,70 @@
+import hashlib
+import io
+
+import pytest
+
+from nexuscli import exception
 from nexuscli.api.repository.model import RawHostedRepository
 
 
 def test_upload(upload_file_ensure_raises_api_error):
     """Ensure the method raises an exception when the API response is wrong"""
     upload_file_ensure_raises_api_error(RawHostedRepository)
+
+
+def test_upload_file(tmp_path, nexus_mock_client, upload_stream_request, faker):
+    """Ensure the file is sent to the given directory and file name"""
+    request, bodies = upload_stream_request
+    request.return_value.status_code = 204
+    repository = RawHostedRepository(nexus_mock_client.http, name='dummy')
+    src_file = tmp_path / faker.file_name()
+    src_file.write_bytes(faker.binary(length=faker.random_int(1, 9999)))
+
+    repository.upload_file(src_file, 'some/dir/file.bin')
+
+    body = bodies[0]
+    assert len(request.call_args[1]['data']) == len(body)
+    assert src_file.read_bytes() in body
+    assert b'name="raw.directory"\r\n\r\nsome/dir\r\n' in body
+    assert b'name="raw.asset1.filename"\r\n\r\nfile.bin\r\n' in body
+
+
+@pytest.mark.parametrize('known_size', [True, False])
+def test_upload_stream(known_size, nexus_mock_client, upload_stream_request, faker):
+    """Ensure the stream is sent as a multipart component upload and its hashes returned"""
+    request, bodies = upload_stream_request
+    request.return_value.status_code = 204
+    repository = RawHostedRepository(nexus_mock_client.http, name='dummy')
+    data = faker.binary(length=faker.random_int(1, 9999))
+    size = len(data) if known_size else None
+
+    checksums = repository.upload_stream(io.BytesIO(data), 'some/dir/file.bin', size=size)
+
+    assert checksums['sha1'] == hashlib.sha1(data).hexdigest()
+    body = bodies[0]
+    assert data in body
+    assert b'name="raw.asset1"; filename="file.bin"' in body
+    assert b'name="raw.directory"\r\n\r\nsome/dir\r\n' in body
+    assert len(request.call_args[1]['data']) == (len(body) if known_size else 0)
+
+
+def test_upload_stream_no_file_name(nexus_mock_client):
+    """Ensure a destination without a file name is refused"""
+    repository = RawHostedRepository(nexus_mock_client.http, name='dummy')
+
+    with pytest.raises(exception.NexusClientInvalidRepositoryPath):
+        repository.upload_stream(io.BytesIO(b''), '/')
+
+
+@pytest.mark.parametrize('path, x_params', [
+    ('some/dir/file.txt', {'repository': 'raw', 'name': 'some/dir/file.txt'}),
+    ('some/dir/', {'repository': 'raw', 'keyword': '"some/dir/"'}),
+])
+def test_list_raw_name(path, x_params, mocker):
+    """Ensure a file is searched by component name and a directory by keyword"""
+    repository = RawHostedRepository(name='raw')
+    mocker.patch.object(
+        repository, '_get_paginated', return_value=iter([{'path': 'some/dir/file.txt'}]))
+
+    assert [a['path'] for a in repository.list_raw(path)] == ['some/dir/file.txt']
+    repository._get_paginated.assert_called_once_with('search/assets', params=x_params)
@@ -1,3 +1,6 @@
+import hashlib
+import io
+
 import pytest
 from nexuscli.api.repository.model import YumHostedRepository, YumProxyRepository
 
@@ -7,6 +10,32 @@ def test_upload_error(upload_file_ensure_raises_api_error):
     upload_file_ensure_raises_api_error(YumHostedRepository)
 
 
+def test_upload_file(tmp_path, nexus_mock_client, upload_stream_request, faker):
+    """Ensure the file is sent as the body of a PUT to the file's path"""
+    request, bodies = upload_stream_request
+    repository = YumHostedRepository(nexus_mock_client.http, name='dummy')
+    src_file = tmp_path / 'foo.rpm'
+    src_file.write_bytes(faker.binary(length=faker.random_int(1, 9999)))
+
+    repository.upload_file(src_file, 'somedest/foo.rpm')
+
+    assert bodies == [src_file.read_bytes()]
+    assert request.call_args[0] == ('put', 'repository/dummy/somedest/foo.rpm')
+
+
+def test_upload_stream(nexus_mock_client, upload_stream_request, faker):
+    """Ensure the stream is sent as the body of a PUT to the file's path"""
+    request, bodies = upload_stream_request
+    repository = YumHostedRepository(nexus_mock_client.http, name='dummy')
+    data = faker.binary(length=faker.random_int(1, 9999))
+
+    checksums = repository.upload_stream(io.BytesIO(data), 'somedest/foo.rpm')
+
+    assert checksums['md5'] == hashlib.md5(data).hexdigest()
+    assert bodies == [data]
+    assert request.call_args[0] == ('put', 'repository/dummy/somedest/foo.rpm')
+
+
 @pytest.mark.parametrize('class_', [YumHostedRepository, YumProxyRepository])
 def test_configuration(class_, faker):
     x_depth = faker.pyint()
@@ -0,0 +1,63 @@
+import pytest
+
+from nexuscli import exception
+from nexuscli.api.repository import batches
+from nexuscli.api.repository.model import RawHostedRepository
+
+RECORDS = [
+    {'path': '/org/foo.jar', 'fileSize': 100, 'checksum': {'sha1': 'a' * 40},
+     'lastModified': '2021-06-01T10:00:00.000+00:00',
+     'lastDownloaded': '2021-06-02T12:00:00.000+02:00'},
+    {'path': 'org/foo.pom', 'fileSize': 1, 'checksum': {'sha1': 'b' * 40},
+     'lastModified': '2021-06-01T10:00:00.000+00:00'},
+    {'path': 'org/copy.jar', 'checksum': {'sha1': 'a' * 40}},
+]
+
+
+def test_asset_batches():
+    """Ensure listings are split into structured arrays, with missing values marked"""
+    numpy = pytest.importorskip('numpy')
+
+    result = list(batches.asset_batches(iter(RECORDS), batch_size=2))
+
+    assert [len(x) for x in result] == [2, 1]
+    first, last = result
+    assert list(first['path']) == ['org/foo.jar', 'org/foo.pom']
+    assert list(first['size']) == [100, 1]
+    assert first['last_downloaded'][0] == numpy.datetime64('2021-06-02T10:00:00', 'ms')
+    assert numpy.isnat(first['last_downloaded'][1])
+    assert last['size'][0] == -1
+    assert numpy.isnat(last['last_modified'][0])
+    _, counts = numpy.unique(numpy.concatenate(result)['sha1'], return_counts=True)
+    assert list(counts) == [2, 1]
+
+
+def test_iter_asset_batches(mocker):
+    """Ensure a repository listing is read in batches"""
+    pytest.importorskip('numpy')
+    repository = RawHostedRepository(name='repo')
+    mocker.patch.object(repository, 'list_raw', return_value=iter(RECORDS))
+
+    result = list(repository.iter_asset_batches(10, 'org/'))
+
+    assert [len(x) for x in result] == [3]
+    repository.list_raw.assert_called_once_with('org/', None, None)
+
+
+def test_asset_batches_without_numpy(monkeypatch):
+    """Ensure a missing numpy package is reported"""
+    monkeypatch.setattr(batches, 'numpy', None)
+
+    with pytest.raises(exception.FeatureNotImplemented):
+        next(batches.asset_batches(iter(RECORDS)))
+
+
+def test_iter_asset_batches_without_numpy(monkeypatch, mocker):
+    """Ensure a missing numpy package is reported before the listing is requested"""
+    monkeypatch.setattr(batches, 'numpy', None)
+    repository = RawHostedRepository(name='repo')
+    mocker.patch.object(repository, 'list_raw')
+
+    with pytest.raises(exception.FeatureNotImplemented):
+        repository.iter_asset_batches()
+    repository.list_raw.assert_not_called()
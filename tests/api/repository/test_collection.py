@@ -2,7 +2,7 @@ import itertools
 import pytest
 from pprint import pformat
 
-from nexuscli import exception
+from nexuscli import exception, nexus_util
 from nexuscli.api import repository
 from nexuscli.api.repository.model import RawHostedRepository
 
@@ -123,3 +123,83 @@ def test_raw_list(nexus_client):
     assert all(r.get('format') for r in repositories)
     assert all(r.get('type') for r in repositories)
     assert all(r.get('url') for r in repositories)
+
+
+@pytest.mark.parametrize('limit', [None, 1])
+def test_search_all(limit, repository_collection, mocker):
+    """Ensure matching repositories are searched, groups are skipped and matches are tagged"""
+    repositories = [
+        {'name': 'maven-a', 'type': 'hosted'}, {'name': 'maven-b', 'type': 'proxy'},
+        {'name': 'maven-group', 'type': 'group'}, {'name': 'npm-a', 'type': 'hosted'},
+        {'name': 'maven-broken', 'type': 'hosted'}]
+    assets = {
+        'maven-a': ['org/foo/1.0/foo-1.0.jar', 'org/foo/1.0/foo-1.0.pom'],
+        'maven-b': ['com/foo/1.0/foo-1.0.jar', 'com/foo-1.0.jar.sha1'],
+    }
+    mocker.patch.object(repository_collection, 'raw_list', return_value=repositories)
+    searched = {}
+
+    def _list_raw_search(self, keyword):
+        searched[self.name] = keyword
+        if self.name == 'maven-broken':
+            raise exception.NexusClientAPIError('broken')
+        return iter([{'path': path} for path in assets[self.name]])
+
+    mocker.patch.object(repository.Repository, '_list_raw_search', _list_raw_search)
+
+    result = list(repository_collection.search_all(
+        '/*/foo-1.0.jar', 'maven-*', workers=2, limit=limit))
+
+    assert set(searched) <= {'maven-a', 'maven-b', 'maven-broken'}
+    assert set(searched.values()) == {'foo-1.0.jar'}
+    if limit is None:
+        assert sorted(result) == [
+            ('maven-a', {'path': 'org/foo/1.0/foo-1.0.jar'}),
+            ('maven-b', {'path': 'com/foo/1.0/foo-1.0.jar'})]
+    else:
+        assert len(result) == limit
+
+
+def test_locate(repository_collection, tmp_path, mocker):
+    """Ensure a local file is found by its checksum in the matching repositories"""
+    local = tmp_path / 'foo.jar'
+    local.write_bytes(b'foo')
+    x_sha1 = nexus_util.calculate_hash('sha1', local)
+    mocker.patch.object(repository_collection, 'raw_list', return_value=[
+        {'name': 'maven-a', 'type': 'hosted'}, {'name': 'maven-group', 'type': 'group'},
+        {'name': 'maven-broken', 'type': 'hosted'}, {'name': 'npm-a', 'type': 'hosted'}])
+    searched = {}
+
+    def _locate(self, sha1):
+        searched[self.name] = sha1
+        if self.name == 'maven-broken':
+            raise exception.NexusClientAPIError('broken')
+        return iter([{'path': 'org/foo/1.0/foo-1.0.jar'}])
+
+    mocker.patch.object(repository.Repository, 'locate', _locate)
+
+    result = list(repository_collection.locate(local_path=local, repositories='maven-*'))
+
+    assert result == [('maven-a', {'path': 'org/foo/1.0/foo-1.0.jar'})]
+    assert searched == {'maven-a': x_sha1, 'maven-broken': x_sha1}
+    with pytest.raises(ValueError):
+        list(repository_collection.locate())
+    with pytest.raises(ValueError):
+        list(repository_collection.locate(x_sha1, local))
+
+
+def test_locate_all(repository_collection, mocker):
+    """Ensure searching every repository takes a single request, without listing them"""
+    mocker.patch.object(repository_collection, 'raw_list')
+    x_assets = [{'repository': 'maven-a', 'path': 'foo.jar'},
+                {'repository': 'npm-a', 'path': 'foo.tgz'}]
+    response = mocker.Mock(status_code=200)
+    response.json.return_value = {'items': x_assets, 'continuationToken': None}
+    repository_collection._http.request = mocker.Mock(return_value=response)
+
+    result = list(repository_collection.locate('a' * 40, limit=1))
+
+    assert result == [('maven-a', x_assets[0])]
+    repository_collection.raw_list.assert_not_called()
+    repository_collection._http.request.assert_called_once_with(
+        'get', 'search/assets', params={'sha1': 'a' * 40})
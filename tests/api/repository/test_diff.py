@@ -0,0 +1,73 @@
+import hashlib
+
+import pytest
+
+from nexuscli.api.repository import diff
+from nexuscli.api.repository.diff import Difference, Entry
+from nexuscli.api.repository.index import AssetIndex
+from nexuscli.api.repository.model import RawHostedRepository
+
+
+def _sha1(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+@pytest.mark.parametrize('threshold', [None, 2, 3])
+def test_sorted_entries(threshold):
+    """Ensure entries are sorted, whether in memory or in temporary files, without repeats"""
+    entries = [Entry(path, 1, None) for path in 'dbfaecba']
+
+    result = diff.sorted_entries(entries, threshold)
+
+    assert [x.path for x in result] == ['a', 'b', 'c', 'd', 'e', 'f']
+    assert list(diff.sorted_entries([], threshold)) == []
+
+
+def test_remote_entries(mocker):
+    """Ensure remote paths are relative to the directory, with the listed checksums"""
+    repository = RawHostedRepository(name='repo')
+    mocker.patch.object(repository, 'list_raw', return_value=iter([
+        {'path': '/org/a.jar', 'fileSize': 1, 'checksum': {'sha1': 'x'}},
+        {'path': 'org/b/c.jar', 'fileSize': 2},
+        {'path': 'other/org/d.jar', 'fileSize': 3}]))
+
+    result = list(diff.remote_entries(repository, 'org'))
+
+    assert result == [Entry('a.jar', 1, 'x'), Entry('b/c.jar', 2, None)]
+    repository.list_raw.assert_called_once_with('org/', None)
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_diff(workers, tmp_path, mocker):
+    """Ensure local files are only hashed when their size matches the other side's"""
+    for path, data in [('same', b'a'), ('changed', b'b'), ('resized', b'cc'), ('sub/only', b'')]:
+        tmp_path.joinpath(path).parent.mkdir(exist_ok=True)
+        tmp_path.joinpath(path).write_bytes(data)
+    remote = [
+        Entry('same', 1, _sha1(b'a')), Entry('changed', 1, _sha1(b'x')),
+        Entry('resized', 1, _sha1(b'c')), Entry('remote-only', 1, _sha1(b'r'))]
+    local_sha1 = mocker.Mock(side_effect=lambda p: _sha1(open(p, 'rb').read()))
+
+    result = diff.diff(remote, diff.local_entries(tmp_path), workers, local_sha1, 2)
+
+    assert sorted(result) == [
+        Difference(diff.ADDED, 'sub/only'), Difference(diff.CHANGED, 'changed'),
+        Difference(diff.CHANGED, 'resized'), Difference(diff.REMOVED, 'remote-only')]
+    assert sorted(x.args[0] for x in local_sha1.call_args_list) == [
+        str(tmp_path / 'changed'), str(tmp_path / 'same')]
+
+
+def test_local_sha1(tmp_path, mocker):
+    """Ensure local checksums are reused until the file changes"""
+    local_file = tmp_path / 'file'
+    local_file.write_bytes(b'a')
+    calculate_hash = mocker.spy(diff.nexus_util, 'calculate_hash')
+
+    with AssetIndex(tmp_path / 'index.sqlite3') as index:
+        assert index.local_sha1(local_file) == _sha1(b'a')
+        assert index.local_sha1(local_file) == _sha1(b'a')
+        assert calculate_hash.call_count == 1
+
+        local_file.write_bytes(b'bb')
+        assert index.local_sha1(local_file) == _sha1(b'bb')
+        assert calculate_hash.call_count == 2
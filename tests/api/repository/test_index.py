@@ -0,0 +1,114 @@
+import pytest
+
+from nexuscli import exception
+from nexuscli.api.repository.index import AssetIndex
+from nexuscli.api.repository.model import RawHostedRepository
+
+
+def _record(path, sha1='0' * 40):
+    return {'id': f'id-{path}', 'path': path, 'checksum': {'sha1': sha1}, 'fileSize': 1,
+            'downloadUrl': f'http://nexus/repository/repo/{path}'}
+
+
+@pytest.fixture
+def indexed_repository(nexus_mock_client, tmp_path, mocker):
+    """A raw repository listing the records in its `assets` attribute and an empty index"""
+    repository = RawHostedRepository(nexus_mock_client.http, name='repo')
+    repository.assets = [
+        _record('org/foo/1.0/foo-1.0.jar'), _record('org/foo/1.0/foo-1.0.pom'),
+        _record('org/foo/2.0/foo-2.0.jar'), _record('org/bar_x/1.0/bar.jar'),
+        _record('/org/leading-slash.txt')]
+    mocker.patch.object(
+        repository, '_list_raw_search', side_effect=lambda _: iter(repository.assets))
+
+    with AssetIndex(tmp_path / 'index.sqlite3') as index:
+        yield repository, index
+
+
+def _paths(records):
+    return [r['path'] for r in records]
+
+
+def test_build_query(indexed_repository):
+    """Ensure prefixes and globs are answered from the index, with the original records"""
+    repository, index = indexed_repository
+
+    assert index.build(repository) == 5
+    repository._list_raw_search.reset_mock()
+
+    assert list(index.query(repository, 'org/foo/1.0/')) == repository.assets[:2]
+    assert _paths(index.query(repository, '/org/*/1.0/*.jar')) == [
+        'org/bar_x/1.0/bar.jar', 'org/foo/1.0/foo-1.0.jar']
+    # _ isn't a wildcard
+    assert _paths(index.query(repository, 'org/bar?x/')) == []
+    assert _paths(index.query(repository, 'org/bar_')) == ['org/bar_x/1.0/bar.jar']
+    assert _paths(index.query(repository, 'org/leading')) == ['/org/leading-slash.txt']
+    assert len(list(index.query(repository))) == 5
+    repository._list_raw_search.assert_not_called()
+
+
+def test_refresh(indexed_repository):
+    """Ensure only the changes under the given path are written to the index"""
+    repository, index = indexed_repository
+    index.build(repository)
+    repository.assets = [
+        _record('org/foo/1.0/foo-1.0.jar', sha1='1' * 40),  # updated
+        _record('org/foo/2.0/foo-2.0.jar'),  # unchanged
+        _record('org/foo/3.0/foo-3.0.jar'),  # added
+        _record('org/foo/3.0/foo-3.0.jar'),  # listed twice, as pages shift
+        _record('org/bar_x/2.0/bar.jar'),  # outside the refreshed path
+    ]
+
+    result = index.refresh(repository, 'org/foo/')
+
+    assert result == (1, 1, 1)
+    assert _paths(index.query(repository)) == [
+        'org/bar_x/1.0/bar.jar', 'org/foo/1.0/foo-1.0.jar', 'org/foo/2.0/foo-2.0.jar',
+        'org/foo/3.0/foo-3.0.jar', '/org/leading-slash.txt']
+    assert next(index.query(repository, 'org/foo/1.0/'))['checksum']['sha1'] == '1' * 40
+
+
+def test_refresh_batches(indexed_repository, mocker):
+    """Ensure a whole repository is refreshed across batches, and can be refreshed again"""
+    mocker.patch('nexuscli.api.repository.index.INDEX_BATCH_SIZE', 2)
+    repository, index = indexed_repository
+    index.build(repository)
+    repository.assets = [
+        _record('a/new.txt'), _record('org/bar_x/1.0/bar.jar', sha1='1' * 40),
+        _record('org/foo/2.0/foo-2.0.jar'), _record('z/new.txt')]
+
+    assert index.refresh(repository) == (2, 1, 3)
+    assert _paths(index.query(repository)) == [
+        'a/new.txt', 'org/bar_x/1.0/bar.jar', 'org/foo/2.0/foo-2.0.jar', 'z/new.txt']
+    assert index.refresh(repository) == (0, 0, 0)
+
+
+def test_refresh_not_indexed(indexed_repository):
+    """Ensure refreshing a path doesn't make a repository that was never built look indexed"""
+    repository, index = indexed_repository
+
+    with pytest.raises(exception.NotFound):
+        index.refresh(repository, 'org/foo/')
+    with pytest.raises(exception.NotFound):
+        list(index.query(repository))
+
+    assert index.refresh(repository) == (5, 0, 0)
+    assert len(list(index.query(repository))) == 5
+
+
+def test_query_not_indexed(indexed_repository):
+    """Ensure listing a repository that was never indexed fails instead of listing nothing"""
+    repository, index = indexed_repository
+
+    with pytest.raises(exception.NotFound):
+        list(index.query(repository))
+
+
+def test_list_raw_use_index(indexed_repository):
+    """Ensure Repository.list_raw answers from the given index"""
+    repository, index = indexed_repository
+    index.build(repository)
+    repository._list_raw_search.reset_mock()
+
+    assert list(repository.list('org/foo/2.0/', index)) == ['org/foo/2.0/foo-2.0.jar']
+    repository._list_raw_search.assert_not_called()
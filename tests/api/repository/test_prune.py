@@ -0,0 +1,84 @@
+import datetime
+
+import pytest
+
+from nexuscli.api.repository import prune
+
+NOW = datetime.datetime(2026, 1, 31, tzinfo=datetime.timezone.utc)
+
+
+def _component(name, version, days_old=0, group='org.foo', size=10):
+    last_modified = (NOW - datetime.timedelta(days=days_old)).isoformat()
+    return {
+        'id': f'{name}-{version}', 'group': group, 'name': name, 'version': version,
+        'assets': [
+            {'path': f'{name}/{version}/{name}-{version}.jar', 'fileSize': size,
+             'lastModified': last_modified},
+            {'path': f'{name}/{version}/{name}-{version}.pom', 'fileSize': 1,
+             'lastModified': last_modified},
+        ],
+    }
+
+
+def _ids(candidates):
+    return [c.component_id for c in candidates]
+
+
+def test_plan_keep_last():
+    """Ensure all but the newest versions of each group and name are selected"""
+    components = [
+        _component('foo', '1.10'), _component('foo', '1.9'), _component('foo', '1.0-SNAPSHOT'),
+        _component('foo', '1.0'), _component('bar', '2.0'), _component('bar', '1.0'),
+        _component('foo', '1.0', group='org.other'),
+    ]
+
+    candidates = prune.plan(components, keep_last=2, now=NOW)
+
+    assert _ids(candidates) == ['foo-1.0-SNAPSHOT', 'foo-1.0']
+    assert candidates[1].asset_paths == ['foo/1.0/foo-1.0.jar', 'foo/1.0/foo-1.0.pom']
+    assert candidates[1].size == 11
+    assert candidates[1].coordinates == 'org.foo:foo:1.0'
+
+
+def test_plan_timestamped_snapshots():
+    """Ensure the builds of the newest base versions of a snapshot repository are kept"""
+    components = [
+        _component('foo', '1.0.1-20200101.000000-1'), _component('foo', '1.0-20200102.000000-2'),
+        _component('foo', '1.1-20191231.000000-3'), _component('foo', '1.0-20200101.000000-1'),
+    ]
+
+    candidates = prune.plan(components, keep_last=2, now=NOW)
+
+    assert _ids(candidates) == ['foo-1.0-20200101.000000-1', 'foo-1.0-20200102.000000-2']
+
+
+def test_plan_older_than():
+    """Ensure only versions older than the given age are selected, together with keep_last"""
+    components = [
+        _component('foo', '1', days_old=100), _component('foo', '2', days_old=40),
+        _component('foo', '3', days_old=5), _component('foo', '4', days_old=1),
+    ]
+    older_than = datetime.timedelta(days=30)
+
+    assert _ids(prune.plan(components, older_than=older_than, now=NOW)) == ['foo-1', 'foo-2']
+    assert _ids(prune.plan(
+        components, keep_last=3, older_than=older_than, now=NOW)) == ['foo-1']
+
+
+def test_plan_match():
+    """Ensure only versions matching the expression are selected; versionless are ignored"""
+    components = [
+        _component('foo', '1.0-SNAPSHOT'), _component('foo', '1.1-SNAPSHOT'),
+        _component('foo', '1.0'), _component('foo', '0.9'),
+        {'id': 'raw', 'name': 'raw/file', 'version': None, 'assets': []},
+    ]
+
+    candidates = prune.plan(components, keep_last=1, match='SNAPSHOT$', now=NOW)
+
+    assert _ids(candidates) == ['foo-1.0-SNAPSHOT']
+
+
+def test_plan_no_rules():
+    """Ensure a plan without rules, which would delete everything, is refused"""
+    with pytest.raises(ValueError):
+        prune.plan([_component('foo', '1.0')], match='foo')
@@ -0,0 +1,95 @@
+import io
+import threading
+
+import pytest
+
+from nexuscli import exception, nexus_util
+from nexuscli.api.repository import publish
+from nexuscli.api.repository.model import (
+    MavenHostedRepository, NpmHostedRepository, RawHostedRepository)
+
+
+@pytest.fixture
+def recording_repository(nexus_mock_client, mocker):
+    """A raw repository recording the contents uploaded to each path"""
+    def fixture(name, fail=False):
+        repository = RawHostedRepository(nexus_mock_client.http, name=name)
+        repository.uploads = {}
+
+        def _upload_chunks(chunks, destination, size=None):
+            data = b''.join(chunks)
+            if fail:
+                raise exception.NexusClientAPIError(name)
+            assert size is None or size == len(data)
+            repository.uploads[destination] = data
+
+        mocker.patch.object(repository, '_upload_chunks', side_effect=_upload_chunks)
+        return repository
+
+    return fixture
+
+
+@pytest.mark.parametrize('flatten', [True, False])
+def test_publish(flatten, recording_repository, deep_file_tree):
+    """Ensure every file is uploaded to every destination and failures are reported apart"""
+    src_dir, x_file_set = deep_file_tree
+    ok, failing = recording_repository('ok'), recording_repository('failing', fail=True)
+
+    results = publish.publish(src_dir, [(ok, 'dst'), (failing, 'other')], flatten=flatten)
+
+    assert [r.repository for r in results] == [ok, failing]
+    assert results[0].upload_count == len(ok.uploads)
+    assert not results[0].errors
+    assert results[1].upload_count == 0
+    assert len(results[1].errors) == len(x_file_set)
+    if not flatten:
+        assert set(ok.uploads) == {f'dst/{x}' for x in x_file_set}
+
+
+def test_publish_file(recording_repository, tmp_path, faker):
+    """Ensure a single file goes to the same path as with Repository.upload_file"""
+    src_file = tmp_path / faker.file_name()
+    src_file.write_bytes(faker.binary(length=faker.random_int(1, 9999)))
+    first, second = recording_repository('first'), recording_repository('second')
+
+    results = publish.publish(src_file, [(first, 'a/b'), (second, '/')])
+
+    assert [r.upload_count for r in results] == [1, 1]
+    assert first.uploads == {'a/b': src_file.read_bytes()}
+    assert second.uploads == {f'/{src_file.name}': src_file.read_bytes()}
+
+
+def test_publish_stream(recording_repository, nexus_mock_client, faker):
+    """Ensure recipes that can't upload a stream fail without affecting the others"""
+    data = faker.binary(length=faker.random_int(1, 9999))
+    raw = recording_repository('raw')
+    npm = NpmHostedRepository(nexus_mock_client.http, name='npm')
+
+    errors = publish.publish_stream(io.BytesIO(data), [(raw, 'some/file'), (npm, 'some/file')])
+
+    assert errors[0] is None
+    assert isinstance(errors[1], exception.FeatureNotImplemented)
+    assert raw.uploads == {'some/file': data}
+
+
+def test_publish_mixed(recording_repository, nexus_mock_client, tmp_path, faker, monkeypatch):
+    """Ensure a recipe uploading the file on its own doesn't hold back the streamed uploads"""
+    monkeypatch.setattr(nexus_util, 'HASH_CHUNK_SIZE', 16)
+    src_file = tmp_path / 'foo-1.0.jar'
+    src_file.write_bytes(faker.binary(length=16 * nexus_util.TEE_READ_AHEAD * 4))
+    raw = recording_repository('raw')
+    maven = MavenHostedRepository(nexus_mock_client.http, name='maven')
+    raw_done = threading.Event()
+    raw._upload_chunks.side_effect = lambda chunks, *args: (
+        raw.uploads.update(done=b''.join(chunks)), raw_done.set())
+
+    def _upload_file(source, destination):
+        # the raw upload must finish while this one is still running
+        assert raw_done.wait(timeout=5)
+
+    monkeypatch.setattr(maven, 'upload_file', _upload_file)
+
+    results = publish.publish(src_file, [(maven, 'org/'), (raw, 'dst/')])
+
+    assert [r.upload_count for r in results] == [1, 1]
+    assert raw.uploads == {'done': src_file.read_bytes()}
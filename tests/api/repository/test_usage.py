@@ -0,0 +1,40 @@
+from nexuscli.api.repository import usage
+from nexuscli.api.repository.model import RawHostedRepository
+
+RECORDS = [
+    {'path': 'org/foo/1.0/foo.jar', 'fileSize': 100},
+    {'path': 'org/foo/1.0/foo.pom', 'fileSize': 1},
+    {'path': 'org/foo/2.0/foo.jar', 'fileSize': 200},
+    {'path': 'org/bar/bar.jar', 'fileSize': 50},
+    {'path': '/org/top.txt', 'fileSize': 5},
+    {'path': 'other/x.bin', 'fileSize': 1000},
+]
+
+
+def test_directory_usage():
+    """Ensure sizes are added up to each directory, up to the given depth under the base"""
+    result = usage.directory_usage(RECORDS, 'org/', depth=1)
+
+    assert result == [
+        ('org/', 356, 5), ('org/bar/', 50, 1), ('org/foo/', 301, 3)]
+    assert usage.directory_usage(RECORDS, depth=0) == [('', 1356, 6)]
+    assert usage.directory_usage(RECORDS, depth=3)[-2:] == [
+        ('org/foo/2.0/', 200, 1), ('other/', 1000, 1)]
+
+
+def test_heaviest():
+    """Ensure the directories using the most storage come first"""
+    result = usage.heaviest(usage.directory_usage(RECORDS, depth=2), 3)
+
+    assert [x.path for x in result] == ['', 'other/', 'org/']
+
+
+def test_disk_usage(mocker):
+    """Ensure a path is taken as a directory"""
+    repository = RawHostedRepository(name='repo')
+    mocker.patch.object(repository, 'list_raw', return_value=iter(RECORDS))
+
+    result = repository.disk_usage('org/foo', depth=1)
+
+    assert result == [('org/foo/', 301, 3), ('org/foo/1.0/', 101, 2), ('org/foo/2.0/', 200, 1)]
+    repository.list_raw.assert_called_once_with('org/foo/', None)
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from nexuscli.api.repository.versions import Version
+
+
+def test_ordering():
+    """Ensure Maven, semver and PEP 440 style versions sort as expected"""
+    x_versions = [
+        '1.0.dev1', '1.0-alpha-1', '1.0a2', '1.0-beta', '1.0-M1', '1.0-rc1', '1.0-SNAPSHOT',
+        '1.0', '1.0-sp1', '1.0.post2', '1.0.1', '1.1', '1.9', '1.10', '2.0.0-beta.2',
+        '2.0.0-rc.1+build.5', '2.0.0', '10.0',
+    ]
+    versions = list(x_versions)
+    random.shuffle(versions)
+
+    assert sorted(versions, key=Version) == x_versions
+
+
+@pytest.mark.parametrize('a, b', [
+    ('1', '1.0.0'), ('1.0', '1-ga'), ('1.0-FINAL', '1.0'), ('2.0.0+build.1', '2.0.0+build.2'),
+    ('1.0-b1', '1.0-beta-1'),
+])
+def test_equal(a, b):
+    """Ensure versions differing only in trailing zeros, release qualifiers or build metadata
+    are equal"""
+    assert Version(a) == Version(b)
+    assert hash(Version(a)) == hash(Version(b))
+
+
+def test_unknown_qualifier():
+    """Ensure unknown qualifiers sort after the known ones but below the next number"""
+    assert Version('1.0-sp1') < Version('1.0-foo') < Version('1.0-zoo') < Version('1.0.1')
+
+
+def test_timestamped_snapshots():
+    """Ensure timestamped snapshots are ordered by base version first, then by timestamp"""
+    x_versions = [
+        '1.0-20200101.000000-1', '1.0-20200102.000000-2', '1.0.1-20200101.000000-1',
+        '1.1-20191231.000000-5',
+    ]
+    versions = list(reversed(x_versions))
+
+    assert sorted(versions, key=Version) == x_versions
+    assert Version('1.0-20200102.000000-1') < Version('1.0.1-20200101.000000-1')
+
+
+@pytest.mark.parametrize('a, b', [
+    ('1.0.0-alpha', '1.0-SNAPSHOT'), ('1-alpha', '1.0-SNAPSHOT'), ('1.0-SNAPSHOT', '1.0.0'),
+    ('1.0-SNAPSHOT', '1.0.1-alpha'),
+])
+def test_snapshot_qualifiers(a, b):
+    """Ensure qualifiers are compared within their list, whatever the trailing zeros"""
+    assert Version(a) < Version(b)
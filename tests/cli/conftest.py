@@ -78,9 +78,11 @@ def upload_args_factory(faker):
         args = f'{cmd} {src} {dst} {flatten} {recurse}'
         xargs = {
             'src': src,
-            'dst': dst,
+            'dst': (dst,),
             'flatten': _as_bool(flatten),
             'recurse': _as_bool(recurse),
+            'workers': 1,
+            'extract': False,
         }
         return args, xargs
 
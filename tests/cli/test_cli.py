@@ -1,8 +1,14 @@
+import datetime
+import json
 from time import sleep
 import pytest
 
 from nexuscli.cli import nexus_cli
 from nexuscli import exception
+from nexuscli.api.repository.model import (
+    BrowseNode, CopyResult, DeleteResult, MavenHostedRepository)
+from nexuscli.api.repository.prune import PruneCandidate
+from nexuscli.api.repository.usage import DirectoryUsage
 
 
 def test_login(cli_runner, mocker, login_env, tmp_path, faker):
@@ -53,7 +59,8 @@ def test_list_aliases(aliases, cli_runner, mocker, nexus_mock_client):
     cli_runner.invoke(nexus_cli, f'{aliases} {xrepo}', catch_exceptions=False)
 
     root_commands.cmd_list.assert_called_once()
-    root_commands.cmd_list.assert_called_with(AnyArg(), xrepo)
+    root_commands.cmd_list.assert_called_with(
+        AnyArg(), xrepo, use_index=False, filters=None, depth=None, match=None)
 
 
 # TODO: upload to all repository types
@@ -105,3 +112,306 @@ def test_delete(cli_runner, upload_repo, tmpdir):
 
     assert result.exit_code == 0
     assert f'Deleted {xcount} file' in result.output
+
+
+@pytest.mark.parametrize('errors, x_exit_code', [
+    (0, exception.CliReturnCode.SUCCESS.value),
+    (1, exception.CliReturnCode.API_ERROR.value)])
+def test_delete_counts(errors, x_exit_code, cli_runner, nexus_mock_client, mocker):
+    """Ensure `nexus3 delete` reports each count and fails when any file wasn't deleted"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    repository = MavenHostedRepository(nexus_mock_client.http, name='repo')
+    mocker.patch.object(repository, 'bulk_delete', return_value=DeleteResult(3, 2, errors))
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    result = cli_runner.invoke(nexus_cli, 'delete -w 8 repo/path')
+
+    assert result.exit_code == x_exit_code
+    assert f'Deleted 3 files; 2 not found; {errors} errors' in result.output
+    repository.bulk_delete.assert_called_once_with(
+        'path', workers=8, filters=None, match=None)
+
+
+def test_delete_components(cli_runner, nexus_mock_client, mocker):
+    """Ensure `nexus3 delete --components` deletes by component and rejects file selections"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    repository = MavenHostedRepository(nexus_mock_client.http, name='repo')
+    mocker.spy(repository, 'delete_components')
+    mocker.patch.object(repository, '_bulk_delete', return_value=DeleteResult(10, 0, 0))
+    mocker.patch.object(repository, 'bulk_delete')
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    result = cli_runner.invoke(nexus_cli, 'delete --components repo/org/foo/')
+
+    assert result.exit_code == exception.CliReturnCode.SUCCESS.value
+    repository.delete_components.assert_called_once_with('org/foo/', workers=1, filters=None)
+    repository.bulk_delete.assert_not_called()
+
+    for args in ['--maven-classifier sources', '--server-side', '--include-regex foo']:
+        result = cli_runner.invoke(nexus_cli, f'delete --components {args} repo/')
+
+        assert result.exit_code == 2
+        assert 'Error: ' in result.output
+    repository._bulk_delete.assert_called_once()
+
+
+def test_delete_server_side(cli_runner, nexus_mock_client, mocker):
+    """Ensure `nexus3 delete --server-side` deletes with the groovy script"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    repository = MavenHostedRepository(nexus_mock_client.http, name='repo')
+    mocker.patch.object(repository, 'server_delete', return_value=DeleteResult(5000, 0, 0))
+    mocker.patch.object(repository, 'bulk_delete')
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    result = cli_runner.invoke(nexus_cli, 'delete --server-side repo/path/')
+
+    assert result.exit_code == exception.CliReturnCode.SUCCESS.value
+    assert 'Deleted 5000 files' in result.output
+    repository.server_delete.assert_called_once_with('path/')
+    repository.bulk_delete.assert_not_called()
+
+
+def test_prune_dry_run(cli_runner, nexus_mock_client, mocker):
+    """Ensure `nexus3 prune --dry-run` prints the plan without deleting anything"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    repository = mocker.Mock()
+    repository.prune_plan.return_value = [
+        PruneCandidate('c1', 'org', 'foo', '1.0', ['a.jar', 'a.pom'], 100, None),
+        PruneCandidate('c2', 'org', 'foo', '1.1', ['b.jar'], 50, None)]
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    result = cli_runner.invoke(
+        nexus_cli, 'prune repo --keep-last 3 --older-than 30 --match SNAPSHOT --dry-run')
+
+    assert result.exit_code == exception.CliReturnCode.SUCCESS.value
+    assert 'org:foo:1.0\t2 assets\t100 bytes' in result.output
+    assert 'Would delete 2 components (150 bytes)' in result.output
+    repository.prune_plan.assert_called_once_with(
+        3, datetime.timedelta(days=30), 'SNAPSHOT')
+    repository.prune.assert_not_called()
+
+
+@pytest.mark.parametrize('errors, x_exit_code', [
+    (0, exception.CliReturnCode.SUCCESS.value), (1, exception.CliReturnCode.API_ERROR.value)])
+def test_prune(errors, x_exit_code, cli_runner, nexus_mock_client, mocker):
+    """Ensure `nexus3 prune` deletes the plan and reports the counts"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    repository = mocker.Mock()
+    repository.prune.return_value = (
+        [PruneCandidate('c1', 'org', 'foo', '1.0', ['a.jar'], 100, None)],
+        DeleteResult(1, 0, errors))
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    result = cli_runner.invoke(nexus_cli, 'prune -w 4 --keep-last 1 repo')
+
+    assert result.exit_code == x_exit_code
+    assert f'Deleted 1 file from 1 component (100 bytes); 0 not found; {errors} errors' \
+        in result.output
+    repository.prune.assert_called_once_with(1, None, None, workers=4)
+
+
+def test_prune_no_rules(cli_runner, nexus_mock_client, mocker):
+    """Ensure `nexus3 prune` refuses to run without a retention rule"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+
+    result = cli_runner.invoke(nexus_cli, 'prune --match foo repo')
+
+    assert result.exit_code == 2
+    assert '--keep-last' in result.output
+
+
+def test_du(cli_runner, nexus_mock_client, mocker):
+    """Ensure `nexus3 du` prints the heaviest directories, with the repository name"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    repository = mocker.Mock()
+    repository.disk_usage.return_value = [
+        DirectoryUsage('org/', 30, 3), DirectoryUsage('org/a/', 10, 1),
+        DirectoryUsage('org/b/', 20, 2)]
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    result = cli_runner.invoke(nexus_cli, 'du --depth 2 --top 2 --json repo/org/')
+
+    assert result.exit_code == exception.CliReturnCode.SUCCESS.value
+    assert json.loads(result.output) == [
+        {'path': 'repo/org/', 'size': 30, 'files': 3},
+        {'path': 'repo/org/b/', 'size': 20, 'files': 2}]
+    repository.disk_usage.assert_called_once_with('org/', 2)
+
+
+def test_find(cli_runner, nexus_mock_client, mocker):
+    """Ensure `nexus3 find` prints each match with its repository name"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    search_all = mocker.patch.object(
+        nexus_mock_client.repositories, 'search_all',
+        return_value=iter([('repo-a', {'path': 'x/foo.jar'}), ('repo-b', {'path': 'foo.jar'})]))
+
+    result = cli_runner.invoke(nexus_cli, 'find --repos repo-* --limit 5 *foo.jar')
+
+    assert result.exit_code == exception.CliReturnCode.SUCCESS.value
+    assert result.output == 'repo-a/x/foo.jar\nrepo-b/foo.jar\n'
+    search_all.assert_called_once_with('*foo.jar', 'repo-*', workers=8, limit=5)
+
+    search_all.return_value = iter([])
+    result = cli_runner.invoke(nexus_cli, 'find *bar.jar')
+
+    assert result.exit_code == exception.CliReturnCode.NOT_FOUND.value
+    assert result.output == ''
+
+
+def test_locate(cli_runner, nexus_mock_client, tmp_path, mocker):
+    """Ensure `nexus3 locate` takes a local file or a checksum, but not both"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    locate = mocker.patch.object(
+        nexus_mock_client.repositories, 'locate',
+        return_value=iter([('repo-a', {'path': 'x/foo.jar'})]))
+    local = tmp_path / 'foo.jar'
+    local.write_text('foo')
+
+    result = cli_runner.invoke(nexus_cli, f'locate --repos repo-* {local}')
+
+    assert result.exit_code == exception.CliReturnCode.SUCCESS.value
+    assert result.output == 'repo-a/x/foo.jar\n'
+    locate.assert_called_once_with(None, str(local), 'repo-*', workers=8, limit=None)
+
+    locate.return_value = iter([])
+    result = cli_runner.invoke(nexus_cli, 'locate --sha1 abc')
+
+    assert result.exit_code == exception.CliReturnCode.NOT_FOUND.value
+    assert result.output == ''
+
+    for args in ['', f'--sha1 abc {local}']:
+        result = cli_runner.invoke(nexus_cli, f'locate {args}')
+        assert result.exit_code == 2
+        assert 'Give exactly one of FILE or --sha1' in result.output
+
+
+def test_diff(cli_runner, nexus_mock_client, tmp_path, mocker):
+    """Ensure `nexus3 diff` compares a repository path with a local directory"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    mocker.patch('nexuscli.api.repository.index.DEFAULT_INDEX', str(tmp_path / 'index.sqlite3'))
+    local = tmp_path / 'local'
+    local.mkdir()
+    local.joinpath('new.txt').write_text('new')
+    repository = mocker.Mock()
+    repository._path_filter.return_value = 'org/'
+    repository.list_raw.return_value = iter([{'path': 'org/old.txt', 'fileSize': 1}])
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    result = cli_runner.invoke(nexus_cli, f'diff repo/org/ {local}')
+
+    assert result.exit_code == exception.CliReturnCode.SUCCESS.value
+    assert result.output == '+ new.txt\n- old.txt\n'
+    repository.list_raw.assert_called_once_with('org/', None)
+
+
+def test_copy(cli_runner, nexus_mock_client, mocker):
+    """Ensure `nexus3 copy` copies between repositories and fails on errors"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    repository = mocker.Mock()
+    repository.copy_to.return_value = CopyResult(2, 1, {})
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    result = cli_runner.invoke(nexus_cli, 'copy -w 2 staging/org/ releases/org/')
+
+    assert result.exit_code == exception.CliReturnCode.SUCCESS.value
+    assert 'Copied 2 files to releases/org/; 1 already up-to-date' in result.output
+    repository.copy_to.assert_called_once_with(repository, 'org/', 'org/', workers=2)
+
+    repository.copy_to.return_value = CopyResult(0, 0, {'org/a.jar': Exception('boom')})
+    result = cli_runner.invoke(nexus_cli, 'copy staging/org/ releases/org/')
+
+    assert result.exit_code == exception.CliReturnCode.API_ERROR.value
+    assert 'ERROR copying org/a.jar: boom' in result.output
+
+
+@pytest.mark.parametrize('command', ['copy --server-side', 'move'])
+def test_copy_server_side(command, cli_runner, nexus_mock_client, mocker):
+    """Ensure `nexus3 move` and `nexus3 copy --server-side` copy inside Nexus"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    repository = mocker.Mock()
+    repository.server_copy.return_value = CopyResult(3, 0, {})
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    result = cli_runner.invoke(nexus_cli, f'{command} staging/org/ releases/')
+
+    assert result.exit_code == exception.CliReturnCode.SUCCESS.value
+    assert '3 files to releases/' in result.output
+    if command == 'move':
+        repository.server_copy.assert_called_once_with(repository, 'org/', '', move=True)
+    else:
+        repository.server_copy.assert_called_once_with(repository, 'org/', '')
+    repository.copy_to.assert_not_called()
+
+
+def test_list_filters(cli_runner, nexus_mock_client, mocker):
+    """Ensure search filter options are sent as Nexus search parameters"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    repository = mocker.Mock()
+    repository.list.return_value = iter(['org/foo/1.0/foo-1.0.jar'])
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    result = cli_runner.invoke(
+        nexus_cli, 'ls --maven-group-id org --maven-extension jar --version 1.0 repo/')
+
+    assert result.exit_code == exception.CliReturnCode.SUCCESS.value
+    assert result.output == 'org/foo/1.0/foo-1.0.jar\n'
+    repository.list.assert_called_once_with('', filters={
+        'version': '1.0', 'maven.groupId': 'org', 'maven.extension': 'jar'}, match=None)
+
+
+@pytest.mark.parametrize('args,x_latest', [
+    ('--latest 3 repo/org/foo/ out/', 3),
+    ('repo/org/foo/ out/ --latest', 1),
+    ('repo/org/foo/ out/', None),
+])
+def test_download_latest(args, x_latest, cli_runner, nexus_mock_client, mocker):
+    """Ensure `nexus3 download --latest` takes an optional number of versions"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    repository = mocker.Mock()
+    repository.download.return_value = 2
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    result = cli_runner.invoke(nexus_cli, f'download --name foo {args}')
+
+    assert result.exit_code == exception.CliReturnCode.SUCCESS.value
+    repository.download.assert_called_once_with(
+        'org/foo/', 'out/', flatten=False, nocache=False, filters={'name': 'foo'},
+        latest=x_latest, match=None)
+
+
+def test_list_include_exclude(cli_runner, nexus_mock_client, mocker):
+    """Ensure --include and --exclude patterns are combined into one matcher"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    repository = mocker.Mock()
+    repository.list.return_value = iter([])
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    result = cli_runner.invoke(
+        nexus_cli, 'ls -i *.jar -i *.pom --exclude-regex -sources repo/')
+
+    assert result.exit_code == exception.CliReturnCode.SUCCESS.value
+    match = repository.list.call_args.kwargs['match']
+    assert [x for x in ['a.jar', 'a.pom', 'a-sources.jar', 'a.txt'] if match(x)] == [
+        'a.jar', 'a.pom']
+
+    result = cli_runner.invoke(nexus_cli, 'ls --include-regex ( repo/')
+    assert result.exit_code == 2
+    assert 'Invalid regular expression' in result.output
+
+
+def test_list_depth(cli_runner, nexus_mock_client, mocker):
+    """Ensure `nexus3 list --depth` lists directory levels instead of the whole subtree"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    repository = mocker.Mock()
+    repository.browse.return_value = iter([BrowseNode('org/', False, None)])
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    result = cli_runner.invoke(nexus_cli, 'ls --depth 2 repo/')
+
+    assert result.exit_code == exception.CliReturnCode.SUCCESS.value
+    assert result.output == 'org/\n'
+    repository.browse.assert_called_once_with('', 2)
+    repository.list.assert_not_called()
+
+    result = cli_runner.invoke(nexus_cli, 'ls --depth 2 --use-index repo/')
+    assert result.exit_code == 2
@@ -1,6 +1,8 @@
 import json
 import pytest
 
+from nexuscli import exception
+from nexuscli.api.cleanup_policy import CleanupPolicy
 from nexuscli.cli import nexus_cli
 
 
@@ -34,3 +36,47 @@ def test_cleanup_policy(cli_runner, faker):
     assert x_downloaded == policy['criteria']['lastDownloaded']
     assert x_updated == policy['criteria']['lastBlobUpdated']
     assert 'ALL_FORMATS' == policy['format']
+
+
+def test_cleanup_policy_simulate(cli_runner, nexus_mock_client, mocker):
+    """Ensure the command evaluates the policy over the repository listing"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    policy = CleanupPolicy(None, name='policy', format='all', criteria={'regex': '.*jar'})
+    mocker.patch.object(nexus_mock_client.cleanup_policies, 'get_by_name', return_value=policy)
+    repository = mocker.Mock(recipe_name='raw')
+    repository.list_raw.return_value = iter([
+        {'path': 'a.jar', 'fileSize': 10}, {'path': 'b.pom', 'fileSize': 20},
+        {'path': 'c.jar', 'fileSize': 30}])
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    result = cli_runner.invoke(nexus_cli, 'cleanup-policy simulate --samples 1 policy repo')
+
+    assert result.exit_code == 0
+    assert 'a.jar' in result.output
+    assert 'c.jar' not in result.output
+    assert '2 of 3 files match; 40 bytes reclaimable' in result.output
+    nexus_mock_client.cleanup_policies.get_by_name.assert_called_once_with('policy')
+    repository.list_raw.assert_called_once_with('')
+
+
+def test_cleanup_policy_simulate_format(cli_runner, nexus_mock_client, mocker):
+    """Ensure a policy for another format is refused and unsimulated criteria are reported"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    policy = CleanupPolicy(
+        None, name='policy', format='maven2', criteria={'isPrerelease': True, 'regex': '.*'})
+    mocker.patch.object(nexus_mock_client.cleanup_policies, 'get_by_name', return_value=policy)
+    repository = mocker.Mock(recipe_name='raw')
+    repository.list_raw.return_value = iter([{'path': 'a.jar', 'fileSize': 10}])
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    result = cli_runner.invoke(nexus_cli, 'cleanup-policy simulate policy repo')
+
+    assert result.exit_code == exception.CliReturnCode.CONFIG_ERROR.value
+    assert 'is for maven2 repositories, not raw' in result.output
+
+    repository.recipe_name = 'maven'
+    result = cli_runner.invoke(nexus_cli, 'cleanup-policy simulate policy repo')
+
+    assert result.exit_code == 0
+    assert '1 of 1 files match' in result.output
+    assert 'WARNING: criteria not simulated: isPrerelease' in result.output
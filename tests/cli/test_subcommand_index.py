@@ -0,0 +1,25 @@
+from nexuscli.api.repository import index
+from nexuscli.api.repository.model import RawHostedRepository
+from nexuscli.cli import nexus_cli
+
+
+def test_index(cli_runner, nexus_mock_client, tmp_path, mocker):
+    """Ensure the index is built, refreshed and used by `nexus3 list --use-index`"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    mocker.patch.object(index, 'DEFAULT_INDEX', str(tmp_path / 'index.sqlite3'))
+    repository = RawHostedRepository(nexus_mock_client.http, name='repo')
+    assets = [{'id': path, 'path': path} for path in ['a/1.jar', 'a/2.txt', 'b/3.jar']]
+    mocker.patch.object(repository, '_list_raw_search', side_effect=lambda _: iter(assets))
+    mocker.patch.object(nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+
+    build = cli_runner.invoke(nexus_cli, 'index build repo')
+    assets.pop()
+    refresh = cli_runner.invoke(nexus_cli, 'index refresh repo/')
+    query = cli_runner.invoke(nexus_cli, 'index query repo/*.jar')
+    list_ = cli_runner.invoke(nexus_cli, 'list --use-index repo/a/')
+
+    assert build.output == 'Indexed 3 files in repo\n'
+    assert refresh.output == '0 added, 0 updated, 1 removed\n'
+    assert query.output == 'a/1.jar\n'
+    assert list_.output == 'a/1.jar\na/2.txt\n'
+    assert repository._list_raw_search.call_count == 2
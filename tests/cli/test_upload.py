@@ -2,7 +2,9 @@ import itertools
 import os
 import pytest
 
-from nexuscli.cli import nexus_cli
+from nexuscli import exception
+from nexuscli.api.repository.model import NpmHostedRepository
+from nexuscli.cli import nexus_cli, root_commands
 
 
 @pytest.mark.integration
@@ -68,3 +70,50 @@ def test_upload(
 
     assert result.exit_code == 0
     mock_cmd_upload.assert_called_with(nexus_mock_client, **xargs)
+
+
+def test_upload_stdin(nexus_mock_client, mocker, faker):
+    """Ensure a `-` source uploads standard input to the given file path"""
+    repository = mocker.Mock()
+    repository.upload_stream.return_value = {'sha1': faker.sha1()}
+    mocker.patch.object(
+        nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+    stdin = mocker.patch('sys.stdin')
+
+    result = root_commands.cmd_upload(nexus_mock_client, '-', ('repo/some/file',))
+
+    assert result == 0
+    repository.upload_stream.assert_called_once_with(stdin.buffer, 'some/file')
+    repository.upload.assert_not_called()
+
+
+def test_upload_stdin_unsupported(cli_runner, nexus_mock_client, mocker):
+    """Ensure uploading standard input to a recipe that can't stream is reported cleanly"""
+    mocker.patch('nexuscli.cli.util.get_client', return_value=nexus_mock_client)
+    mocker.patch.object(
+        nexus_mock_client.repositories, 'get_by_name',
+        return_value=NpmHostedRepository(nexus_mock_client.http, name='repo'))
+
+    result = cli_runner.invoke(nexus_cli, 'upload - repo/some/file', input='data')
+
+    assert result.exit_code == exception.CliReturnCode.NOT_IMPLEMENTED.value
+    assert 'Error: Uploading a stream to a npm repository' in result.output
+    assert 'Traceback' not in result.output
+
+
+def test_upload_many(nexus_mock_client, mocker, faker):
+    """Ensure more than one destination uploads through publish and reports errors"""
+    repository = mocker.Mock()
+    mocker.patch.object(
+        nexus_mock_client.repositories, 'get_by_name', return_value=repository)
+    mock_publish = mocker.patch('nexuscli.api.repository.publish.publish', return_value=[
+        root_commands.publish.PublishResult(repository, 'a', 1, {}),
+        root_commands.publish.PublishResult(repository, 'b', 0, {'x': Exception()}),
+    ])
+
+    with pytest.raises(SystemExit):
+        root_commands.cmd_upload(nexus_mock_client, 'x', ('repo1/a', 'repo2/b'))
+
+    mock_publish.assert_called_once_with(
+        'x', [(repository, 'a'), (repository, 'b')], recurse=None, flatten=None)
+    repository.upload.assert_not_called()
@@ -0,0 +1,61 @@
+import email.parser
+import os
+
+import pytest
+import requests
+
+from nexuscli import nexus_http
+from nexuscli.nexus_http import NexusHttp
+
+
+@pytest.mark.parametrize('file_size', [None, 'known'])
+def test_multipart_body(file_size, faker):
+    """Ensure the body is valid multipart form data with the fields followed by the file"""
+    x_fields = [(faker.word(), faker.word()) for _ in range(faker.random_int(0, 3))]
+    x_contents = faker.binary(length=faker.random_int(0, 9999))
+    chunks = [x_contents[:10], x_contents[10:]]
+    if file_size:
+        file_size = len(x_contents)
+
+    body, content_type = nexus_http.multipart_body(x_fields, 'file', 'f.bin', chunks, file_size)
+    data = b''.join(body)
+
+    assert len(body) == (len(data) if file_size else 0)
+    message = email.parser.BytesParser().parsebytes(
+        f'Content-Type: {content_type}\r\n\r\n'.encode() + data)
+    parts = message.get_payload()
+    assert [(p.get_param('name', header='content-disposition'), p.get_payload())
+            for p in parts[:-1]] == x_fields
+    assert parts[-1].get_filename() == 'f.bin'
+    assert parts[-1].get_payload(decode=True) == x_contents
+
+
+@pytest.mark.parametrize('size', [0, 1, 9999])
+def test_mapped_file(size, tmp_path):
+    """Ensure the view has the file contents, including for empty files"""
+    x_contents = os.urandom(size)
+    path = tmp_path / 'file'
+    path.write_bytes(x_contents)
+
+    with nexus_http.mapped_file(path) as contents:
+        assert contents == x_contents
+
+    with pytest.raises(ValueError):
+        contents.tobytes()  # released
+
+
+def test_pooled_session(mocker):
+    """Ensure requests in the context share one session, and only those"""
+    mocker.patch('requests.request')
+    session_request = mocker.patch('requests.Session.request')
+    http = NexusHttp()
+
+    with http.pooled_session(4):
+        with http.pooled_session():
+            http.delete('foo')
+        http.delete('bar')
+    http.delete('baz')
+
+    assert [c[1]['url'].split('/')[-1] for c in session_request.call_args_list] == [
+        'foo', 'bar']
+    assert requests.request.call_args[1]['url'].endswith('baz')
@@ -1,3 +1,5 @@
+import hashlib
+import io
 import itertools
 import os
 
@@ -28,6 +30,42 @@ def test__calculate_hash(hash_name, x_hash, nexus_mock_client):
     assert sha1_fh == x_hash
 
 
+def test_calculate_hashes(tmp_path, faker):
+    """Ensure all hashes from a single pass match the ones calculated one at a time"""
+    fixture = tmp_path / faker.file_name()
+    # make sure the file spans more than one chunk
+    fixture.write_bytes(faker.binary(length=nexus_util.HASH_CHUNK_SIZE + faker.random_int(1, 999)))
+
+    hashes = nexus_util.calculate_hashes(nexus_util.HASH_NAMES, fixture)
+
+    assert hashes == {x: calculate_hash(x, fixture) for x in nexus_util.HASH_NAMES}
+
+
+def test_hashing_reader(faker):
+    """Ensure the reader yields the whole stream in chunks and hashes it as it goes"""
+    data = faker.binary(length=faker.random_int(1, 9999))
+    reader = nexus_util.HashingReader(io.BytesIO(data), chunk_size=faker.random_int(1, 999))
+
+    assert b''.join(reader) == data
+    assert reader.bytes_read == len(data)
+    assert reader.hexdigests == {
+        'sha1': hashlib.sha1(data).hexdigest(), 'md5': hashlib.md5(data).hexdigest()}
+
+
+def test_calculate_hashes_batch(deep_file_tree):
+    """Ensure the method yields the hashes for every given file and skips missing ones"""
+    src_dir, x_file_set = deep_file_tree
+    file_paths = [os.path.join(src_dir, x) for x in x_file_set]
+
+    hashes = dict(nexus_util.calculate_hashes_batch(
+        file_paths + [os.path.join(src_dir, 'missing')], ['sha1', 'md5'], workers=4))
+
+    assert sorted(hashes.keys()) == sorted(file_paths)
+    for file_path, file_hashes in hashes.items():
+        assert file_hashes == {
+            'sha1': calculate_hash('sha1', file_path), 'md5': calculate_hash('md5', file_path)}
+
+
 @pytest.mark.parametrize('hash_name, match',
                          itertools.product(['sha1', 'md5'], [True, False]))
 def test_has_same_hash(hash_name, match, mocker, faker):
@@ -46,11 +84,123 @@ def test_has_same_hash(hash_name, match, mocker, faker):
     nexus_util.calculate_hash.assert_called_with(hash_name, file_path)
 
 
+def test_has_same_hash_local_hashes(mocker, faker):
+    """Ensure method uses the given local hashes instead of calculating them again"""
+    remote_hash = faker.sha1()
+    mocker.patch('nexuscli.nexus_util.calculate_hash')
+    artefact = {'checksum': {'sha1': remote_hash}}
+
+    assert nexus_util.has_same_hash(artefact, faker.file_path(), {'sha1': remote_hash})
+    nexus_util.calculate_hash.assert_not_called()
+
+
 def test_has_same_hash_empty():
     """Ensure method returns false when artefact has no checksum entries"""
     assert not nexus_util.has_same_hash({}, 'any')
 
 
+@pytest.mark.parametrize('workers', [1, 4])
+def test_concurrent_map(workers, faker):
+    """Ensure the method yields one result per element, regardless of the number of workers"""
+    x_items = faker.pylist(nb_elements=faker.random_int(1, 50), value_types=[int])
+
+    results = list(nexus_util.concurrent_map(lambda x: x * 2, iter(x_items), workers))
+
+    assert sorted(results) == sorted(x * 2 for x in x_items)
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_concurrent_map_error(workers):
+    """Ensure an exception raised by the function is raised to the caller"""
+    def _func(item):
+        if item == 3:
+            raise ValueError(item)
+        return item
+
+    with pytest.raises(ValueError):
+        list(nexus_util.concurrent_map(_func, range(10), workers))
+
+
+def test_tee(faker):
+    """Ensure every consumer gets all chunks, even when another one stops early or fails"""
+    x_chunks = [faker.binary(length=10) for _ in range(nexus_util.TEE_READ_AHEAD * 3)]
+
+    def _fail(chunks):
+        next(chunks)
+        raise ValueError
+
+    futures = nexus_util.tee(iter(x_chunks), [list, lambda _: 'done', _fail, list])
+
+    assert futures[0].result() == x_chunks
+    assert futures[1].result() == 'done'
+    assert isinstance(futures[2].exception(), ValueError)
+    assert futures[3].result() == x_chunks
+
+
+def test_tee_error():
+    """Ensure consumers get the error when reading the chunks fails"""
+    def _chunks():
+        yield b'partial'
+        raise OSError
+
+    futures = nexus_util.tee(_chunks(), [list, list])
+
+    assert all(isinstance(future.exception(), OSError) for future in futures)
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_concurrent_chain(workers):
+    """Ensure every item of every source is yielded with its key"""
+    sources = [(key, lambda key=key: (f'{key}{i}' for i in range(20))) for key in 'abcd']
+
+    result = list(nexus_util.concurrent_chain(sources, workers, read_ahead=2))
+
+    assert sorted(result) == sorted((key, f'{key}{i}') for key in 'abcd' for i in range(20))
+    # each source's items keep their order
+    assert [item for key, item in result if key == 'c'] == [f'c{i}' for i in range(20)]
+
+
+def test_concurrent_chain_close():
+    """Ensure closing the generator stops endless sources and errors are raised"""
+    def _endless():
+        return itertools.count()
+
+    def _fail():
+        yield 1
+        raise ValueError
+
+    results = nexus_util.concurrent_chain([('a', _endless), ('b', _endless)], workers=2)
+    assert len(list(itertools.islice(results, 100))) == 100
+    results.close()
+
+    with pytest.raises(ValueError):
+        list(nexus_util.concurrent_chain([('a', _fail)], workers=2))
+
+
+PATHS = ['org/foo.jar', 'org/foo-sources.jar', 'org/foo.pom', 'com/org/bar.jar']
+
+
+@pytest.mark.parametrize('patterns, x_paths', [
+    ({'include': ['*.jar']}, ['org/foo.jar', 'org/foo-sources.jar', 'com/org/bar.jar']),
+    ({'include': ['*.jar'], 'exclude': ['*-sources.jar']}, ['org/foo.jar', 'com/org/bar.jar']),
+    ({'include': ['*.pom', 'com/*']}, ['org/foo.pom', 'com/org/bar.jar']),
+    ({'include_regex': ['^org/'], 'exclude_regex': [r'-\w+\.jar$']},
+     ['org/foo.jar', 'org/foo.pom']),
+    ({'include_regex': ['org/'], 'exclude': ['*.pom']},
+     ['org/foo.jar', 'org/foo-sources.jar', 'com/org/bar.jar']),
+])
+def test_path_matcher(patterns, x_paths):
+    """Ensure paths are selected by any inclusion and no exclusion, glob or regex"""
+    match = nexus_util.path_matcher(**patterns)
+
+    assert [x for x in PATHS if match(x)] == x_paths
+
+
+def test_path_matcher_none():
+    """Ensure there's no matcher without patterns"""
+    assert nexus_util.path_matcher() is None
+
+
 @pytest.mark.parametrize('is_dir', [True, False])
 def test_ensure_exists(is_dir, tmp_path, faker):
     """Ensure method calls the right combination of mkdir/touch"""